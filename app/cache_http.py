@@ -0,0 +1,64 @@
+import hashlib
+from typing import Optional
+from fastapi import HTTPException, Request, Response, status
+from domain.exceptions import ErrorEstadisticas
+from infra.config import get_settings
+from infra.data.stats_snapshot import StatsSnapshots, get_stats_snapshots
+
+
+def _coincide(if_none_match: str, etag: str) -> bool:
+    """Comparación débil de If-None-Match contra un ETag (RFC 9110)"""
+    for candidato in if_none_match.split(','):
+        candidato = candidato.strip()
+        if candidato == '*' or candidato.removeprefix('W/') == etag:
+            return True
+    return False
+
+
+class ValidadorCache:
+    """
+    Dependencia que agrega validadores HTTP a una respuesta de estadísticas.
+
+    Las estadísticas son deterministas para una versión de los datos: el ETag
+    se deriva del hash del contenido de los CSV de los que dependen, de la
+    ruta y de los parámetros. Si el `If-None-Match` de la petición coincide se
+    responde 304 desde la dependencia, antes de consultar o serializar la
+    estadística. Si no, el ETag y el `Cache-Control` configurado se agregan a
+    la respuesta.
+    """
+
+    def __init__(self, *tipos: str, snapshots: Optional[StatsSnapshots] = None):
+        """
+        Args:
+            tipos: Tipos de propiedad de cuyos datos depende la respuesta
+            snapshots: Snapshots de los que se toma el hash (los del proceso por defecto)
+        """
+        self.tipos = tipos
+        self._snapshots = snapshots
+
+    def etag(self, request: Request) -> str:
+        """
+        Raises:
+            ErrorEstadisticas: Si no se pueden cargar los datos
+        """
+        snapshots = self._snapshots or get_stats_snapshots()
+        sha = hashlib.sha256(request.url.path.encode('utf-8'))
+        sha.update(b'?' + '&'.join(sorted(request.url.query.split('&'))).encode('utf-8'))
+        for tipo in self.tipos:
+            sha.update(b'\0' + snapshots.get(tipo).hash.encode('ascii'))
+        return f'"{sha.hexdigest()[:32]}"'
+
+    def __call__(self, request: Request, response: Response) -> None:
+        try:
+            etag = self.etag(request)
+        except ErrorEstadisticas:
+            # Sin datos no hay validador; el endpoint reportará el error
+            return
+        headers = {'ETag': etag}
+        cache_control = get_settings().stats_cache_control
+        if cache_control:
+            headers['Cache-Control'] = cache_control
+        if_none_match = request.headers.get('if-none-match')
+        if if_none_match and _coincide(if_none_match, etag):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        response.headers.update(headers)
\ No newline at end of file
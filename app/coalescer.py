@@ -0,0 +1,120 @@
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.executor import get_executor
+from infra.config import get_settings
+from infra.data.model_registry import get_model_registry
+from infra.metrics import get_metrics
+
+
+# Cubetas para los histogramas de tamaño de lote y de espera en cola
+CUBETAS_TAMANO_LOTE = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+CUBETAS_ESPERA_MS = (0.1, 0.25, 0.5, 1, 2, 5, 10, 25, 50)
+
+
+def _predecir_lote(tipo: str, model_inputs: List[Dict[str, Any]]):
+    """Evalúa un lote con el modelo compartido (se ejecuta dentro del pool de predicción)"""
+    return get_model_registry().get(tipo).predict_batch(model_inputs)
+
+
+class PrediccionCoalescer:
+    """
+    Agrupa predicciones individuales concurrentes en un solo lote.
+
+    Cada petición se encola junto con un future; el lote se evalúa cuando se
+    cumple la ventana de tiempo o cuando alcanza el número máximo de filas, con
+    una sola llamada vectorizada al modelo, y cada future se resuelve con su
+    propio precio o su propio error.
+    """
+
+    def __init__(self, tipo: str, ventana_ms: float = 2.0, max_filas: int = 64):
+        self.tipo = tipo
+        self.ventana = ventana_ms / 1000
+        self.max_filas = max_filas
+        self._pendientes: List[Tuple[Dict[str, Any], asyncio.Future, float]] = []
+        self._temporizador: Optional[asyncio.TimerHandle] = None
+        self._tareas: Set[asyncio.Task] = set()
+
+        metrics = get_metrics()
+        self._tamano_lote = metrics.histogram(f'coalescer.{tipo}.tamano_lote', CUBETAS_TAMANO_LOTE)
+        self._espera_ms = metrics.histogram(f'coalescer.{tipo}.espera_ms', CUBETAS_ESPERA_MS)
+        self._lotes_fallidos = metrics.counter(f'coalescer.{tipo}.lotes_fallidos')
+
+    async def predict(self, model_input: Dict[str, Any]) -> float:
+        """
+        Encola una predicción y espera a que se evalúe su lote
+
+        Returns:
+            Precio predicho
+
+        Raises:
+            DomainException: El error de la fila (alcaldía no encontrada, valor fuera de rango)
+            ModeloNoDisponible: Si falla la evaluación del lote
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pendientes.append((model_input, future, time.perf_counter()))
+
+        if len(self._pendientes) >= self.max_filas:
+            self._despachar()
+        elif self._temporizador is None:
+            self._temporizador = loop.call_later(self.ventana, self._despachar)
+
+        return await future
+
+    def _despachar(self) -> None:
+        """Saca el lote pendiente de la cola y programa su evaluación"""
+        if self._temporizador is not None:
+            self._temporizador.cancel()
+            self._temporizador = None
+        lote, self._pendientes = self._pendientes, []
+        if lote:
+            # Guardar referencia a la tarea para que no la recolecte el GC antes de terminar
+            tarea = asyncio.ensure_future(self._evaluar(lote))
+            self._tareas.add(tarea)
+            tarea.add_done_callback(self._tareas.discard)
+
+    async def _evaluar(self, lote: List[Tuple[Dict[str, Any], asyncio.Future, float]]) -> None:
+        """Evalúa un lote y resuelve el future de cada petición"""
+        inicio = time.perf_counter()
+        self._tamano_lote.observe(len(lote))
+        for _, _, encolado in lote:
+            self._espera_ms.observe((inicio - encolado) * 1000)
+
+        try:
+            model_inputs = [model_input for model_input, _, _ in lote]
+            precios, errores = await get_executor().run(_predecir_lote, self.tipo, model_inputs)
+        except Exception as e:
+            self._lotes_fallidos.inc()
+            for _, future, _ in lote:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future, _), precio, error in zip(lote, precios, errores):
+            if future.done():
+                # El cliente canceló la petición mientras esperaba
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(float(precio))
+
+
+_coalescers: Dict[str, PrediccionCoalescer] = {}
+
+
+def get_coalescer(tipo: str) -> Optional[PrediccionCoalescer]:
+    """Devuelve el coalescer de un tipo de propiedad, o None si está desactivado"""
+    settings = get_settings()
+    if not settings.coalescer_activo:
+        return None
+    coalescer = _coalescers.get(tipo)
+    if coalescer is None:
+        coalescer = _coalescers.setdefault(tipo, PrediccionCoalescer(
+            tipo,
+            ventana_ms=settings.coalescer_ventana_ms,
+            max_filas=settings.coalescer_max_filas
+        ))
+    return coalescer
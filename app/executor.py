@@ -0,0 +1,136 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from domain.exceptions import ServicioSaturado, ModeloNoDisponible
+from infra.config import get_settings
+from infra.data.model_registry import get_model_registry
+from infra.data.model_watcher import start_model_watcher
+from infra.data.shadow import start_shadow_scorers
+from infra.logs import configure_logging
+from infra.metrics import get_metrics
+
+
+# Cubetas para los histogramas de espera en cola y de ejecución
+CUBETAS_MS = (0.1, 0.5, 1, 2, 5, 10, 25, 50, 100, 250, 1000)
+
+
+def _precargar_modelos() -> None:
+    """Inicializador de los procesos del pool: carga los modelos una sola vez por proceso"""
+    configure_logging()
+    try:
+        get_model_registry().load_missing()
+    except ModeloNoDisponible:
+        # Se reintentará la carga en la primera predicción
+        pass
+    # Cada proceso tiene su propia copia de los modelos, así que revisa las versiones por su cuenta
+    start_model_watcher()
+    start_shadow_scorers()
+
+
+def _ejecutar(fn: Callable, args: Tuple) -> Tuple[Any, float]:
+    """Ejecuta la función en el pool y devuelve el instante en que empezó a ejecutarse"""
+    inicio = time.monotonic()
+    return fn(*args), inicio
+
+
+class PrediccionExecutor:
+    """
+    Ejecuta las predicciones fuera del event loop en un pool dedicado.
+
+    El número de peticiones pendientes (en cola o en ejecución) está acotado:
+    al llenarse la cola se levanta ServicioSaturado en lugar de acumular
+    trabajo, de modo que /health y /stats siguen respondiendo bajo carga.
+    """
+
+    def __init__(self, tipo: str = 'thread', workers: int = 4, max_pendientes: int = 256):
+        if tipo not in ('thread', 'process', 'none'):
+            raise ValueError(f"Tipo de executor no soportado: {tipo}")
+        self.tipo = tipo
+        self.workers = workers
+        self.max_pendientes = max_pendientes
+        self._pool: Optional[Executor] = None
+        if tipo == 'thread':
+            self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='prediccion')
+        elif tipo == 'process':
+            self._pool = ProcessPoolExecutor(max_workers=workers, initializer=_precargar_modelos)
+        # Sólo se modifica desde el event loop, así que no necesita lock
+        self._pendientes = 0
+
+        metrics = get_metrics()
+        self._gauge_pendientes = metrics.gauge('executor.pendientes')
+        self._rechazadas = metrics.counter('executor.rechazadas')
+        self._espera_ms = metrics.histogram('executor.espera_ms', CUBETAS_MS)
+        self._ejecucion_ms = metrics.histogram('executor.ejecucion_ms', CUBETAS_MS)
+
+    @property
+    def pendientes(self) -> int:
+        """Peticiones en cola o en ejecución"""
+        return self._pendientes
+
+    async def run(self, fn: Callable, *args: Any) -> Any:
+        """
+        Ejecuta `fn(*args)` en el pool y espera su resultado
+
+        Raises:
+            ServicioSaturado: Si ya hay `max_pendientes` peticiones pendientes
+        """
+        if self._pool is None:
+            return fn(*args)
+
+        if self._pendientes >= self.max_pendientes:
+            self._rechazadas.inc()
+            raise ServicioSaturado(self._pendientes)
+
+        self._pendientes += 1
+        self._gauge_pendientes.set(self._pendientes)
+        encolado = time.monotonic()
+        try:
+            loop = asyncio.get_running_loop()
+            resultado, inicio = await loop.run_in_executor(self._pool, _ejecutar, fn, args)
+            fin = time.monotonic()
+            self._espera_ms.observe((inicio - encolado) * 1000)
+            self._ejecucion_ms.observe((fin - inicio) * 1000)
+            return resultado
+        finally:
+            self._pendientes -= 1
+            self._gauge_pendientes.set(self._pendientes)
+
+    def estado(self) -> Dict[str, Any]:
+        """Resumen de la saturación del pool"""
+        return {
+            'tipo': self.tipo,
+            'workers': self.workers,
+            'pendientes': self._pendientes,
+            'max_pendientes': self.max_pendientes
+        }
+
+    def shutdown(self) -> None:
+        """Detiene el pool sin esperar a las tareas pendientes"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+_executor: Optional[PrediccionExecutor] = None
+
+
+def get_executor() -> PrediccionExecutor:
+    """Devuelve el executor de predicciones del proceso, creándolo la primera vez"""
+    global _executor
+    if _executor is None:
+        settings = get_settings()
+        _executor = PrediccionExecutor(
+            tipo=settings.executor_tipo,
+            workers=settings.executor_workers,
+            max_pendientes=settings.executor_max_pendientes
+        )
+    return _executor
+
+
+def shutdown_executor() -> None:
+    """Detiene el executor del proceso; el siguiente get_executor() crea uno nuevo"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
@@ -1,9 +1,20 @@
+import logging
 from fastapi import FastAPI, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
 from app.routers.casas import router as casas_router
 from app.routers.departamentos import router as departamentos_router
 from app.routers.stats import router as stats_router
 from app.routers.fibras import router as fibras_router
+from app.routers.modelos import router as modelos_router
+from app.routers.metricas import router as metricas_router
+from domain.exceptions import ModeloNoDisponible
+from infra.data.model_registry import get_model_registry
+from infra.data.model_watcher import start_model_watcher, stop_model_watcher
+from infra.data.shadow import start_shadow_scorers, stop_shadow_scorers
+from app.executor import get_executor, shutdown_executor
+from infra.logs import configure_logging, shutdown_logging
+
+logger = logging.getLogger(__name__)
 
 # Crear la aplicación
 app = FastAPI(
@@ -26,6 +37,34 @@ app.include_router(casas_router)
 app.include_router(departamentos_router)
 app.include_router(stats_router)
 app.include_router(fibras_router)
+app.include_router(modelos_router)
+app.include_router(metricas_router)
+
+
+@app.on_event("startup")
+def cargar_modelos():
+    """Carga los modelos una sola vez al iniciar la aplicación"""
+    configure_logging()
+    try:
+        get_model_registry().load_missing()
+    except ModeloNoDisponible as e:
+        # Se reintentará la carga en la primera petición de predicción
+        logger.warning(str(e))
+    # Crear el pool de predicciones antes de la primera petición
+    get_executor()
+    # Recargar en segundo plano las versiones nuevas que se publiquen en modelos/
+    start_model_watcher()
+    # Evaluar en modo sombra los modelos candidatos publicados en modelos/<tipo>/CANDIDATO
+    start_shadow_scorers()
+
+
+@app.on_event("shutdown")
+def detener_executor():
+    """Detiene el pool de predicciones y vacía la cola de logs al apagar la aplicación"""
+    stop_model_watcher()
+    stop_shadow_scorers()
+    shutdown_executor()
+    shutdown_logging()
 
 
 @app.get("/", tags=["root"])
@@ -37,7 +76,9 @@ async def root():
             "casas": "/casas/predict",
             "departamentos": "/departamentos/predict",
             "estadisticas": "/stats",
-            "fibras": "/fibras"
+            "fibras": "/fibras",
+            "modelos": "/modelos",
+            "metricas": "/metricas"
         }
     }
 
@@ -45,4 +86,8 @@ async def root():
 @app.get("/health", tags=["health"])
 async def health_check():
     """Endpoint para verificar el estado de la API"""
-    return {"status": "OK", "message": "El servicio está funcionando correctamente"} 
\ No newline at end of file
+    return {
+        "status": "OK",
+        "message": "El servicio está funcionando correctamente",
+        "prediccion": get_executor().estado()
+    } 
\ No newline at end of file
@@ -2,10 +2,14 @@ from app.routers.casas import router as casas_router
 from app.routers.departamentos import router as departamentos_router
 from app.routers.stats import router as stats_router
 from app.routers.fibras import router as fibras_router
+from app.routers.modelos import router as modelos_router
+from app.routers.metricas import router as metricas_router
 
 __all__ = [
     'casas_router',
     'departamentos_router',
     'stats_router',
-    'fibras_router'
+    'fibras_router',
+    'modelos_router',
+    'metricas_router'
 ] 
\ No newline at end of file
@@ -0,0 +1,20 @@
+from fastapi import APIRouter
+from typing import Any, Dict
+from infra.metrics import get_metrics
+
+# Crear el router
+router = APIRouter(
+    prefix="/metricas",
+    tags=["metricas"]
+)
+
+
+@router.get("/", response_model=Dict[str, Any])
+async def obtener_metricas():
+    """
+    Obtiene el valor actual de las métricas internas del proceso
+    
+    Returns:
+        Diccionario con contadores e histogramas indexados por nombre
+    """
+    return get_metrics().snapshot()
@@ -0,0 +1,32 @@
+from fastapi import APIRouter
+from typing import List
+from domain.models import ModeloInfo, ShadowInfo
+from usecases.get_modelos import get_modelos_info, get_shadow_info
+
+# Crear el router
+router = APIRouter(
+    prefix="/modelos",
+    tags=["modelos"]
+)
+
+
+@router.get("/", response_model=List[ModeloInfo])
+async def obtener_modelos():
+    """
+    Obtiene la información de los modelos cargados en el registro
+    
+    Returns:
+        Lista con la versión del artefacto y el tiempo de carga de cada modelo
+    """
+    return get_modelos_info()
+
+
+@router.get("/shadow", response_model=List[ShadowInfo])
+async def obtener_shadow():
+    """
+    Obtiene las estadísticas de los modelos candidatos evaluados en modo sombra
+    
+    Returns:
+        Lista con las muestras evaluadas y la diferencia contra el modelo primario de cada candidato
+    """
+    return get_shadow_info()
\ No newline at end of file
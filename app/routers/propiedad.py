@@ -0,0 +1,375 @@
+import asyncio
+import shutil
+import tempfile
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from typing import BinaryIO, Callable, Dict, List, Optional, Type
+from pydantic import BaseModel
+from domain.models import Prediccion, PrediccionLote, CurvaInputData, CurvaPrecios, CaracteristicasInputData, ComparativoAlcaldias
+from domain.exceptions import AlcaldiaNoEncontrada, ModeloNoDisponible, FeatureNoValida, ErrorPrediccion, ServicioSaturado
+from app.coalescer import get_coalescer
+from app.executor import get_executor
+from app.validacion import ValidadorLote
+from infra.config import get_settings
+from infra.json_rapido import RespuestaJSON
+from usecases.predict_archivo import predict_archivo, detectar_formato, FORMATOS
+from usecases.predict_propiedad import (
+    predict_propiedad, predict_propiedad_json, predict_propiedad_coalescida, predict_propiedad_coalescida_json,
+    predict_propiedades_lote, predict_propiedades_lote_json
+)
+from usecases.predict_curva import predict_curva
+from usecases.predict_alcaldias import predict_alcaldias
+
+
+# Número máximo de filas aceptadas en una sola petición por lotes
+MAX_FILAS_LOTE = 10000
+
+# Cómo se nombra cada tipo de propiedad en la documentación de sus endpoints
+NOMBRES = {
+    'casas': {'singular': 'casa', 'plural': 'casas', 'un': 'una casa', 'del': 'de la casa', 'los': 'las casas'},
+    'departamentos': {'singular': 'departamento', 'plural': 'departamentos', 'un': 'un departamento',
+                      'del': 'del departamento', 'los': 'los departamentos'}
+}
+
+
+def _con_nombres(nombres: Dict[str, str]) -> Callable:
+    """Completa el docstring del endpoint (su descripción en OpenAPI) con el nombre del tipo de propiedad"""
+    def documentar(endpoint: Callable) -> Callable:
+        endpoint.__doc__ = endpoint.__doc__.format(**nombres)
+        return endpoint
+    return documentar
+
+
+def _copiar_archivo(origen: BinaryIO) -> BinaryIO:
+    """Copia un archivo subido a uno temporal, que se borra al cerrarlo"""
+    copia = tempfile.TemporaryFile()
+    try:
+        shutil.copyfileobj(origen, copia)
+        copia.seek(0)
+    except BaseException:
+        copia.close()
+        raise
+    return copia
+
+
+def crear_router(tipo: str, modelo_entrada: Type[BaseModel]) -> APIRouter:
+    """
+    Crea el router de predicciones de un tipo de propiedad
+
+    Casas y departamentos exponen los mismos endpoints; sólo cambian el modelo
+    de entrada, el tipo que se pasa a los casos de uso y la documentación.
+
+    Args:
+        tipo: Tipo de propiedad ('casas' o 'departamentos')
+        modelo_entrada: Modelo pydantic de los datos de entrada
+    """
+    nombres = NOMBRES[tipo]
+    singular, plural = nombres['singular'], nombres['plural']
+
+    router = APIRouter(
+        prefix=f"/{tipo}",
+        tags=[tipo],
+        responses={
+            404: {"description": "No encontrado"},
+            500: {"description": "Error interno del servidor"}
+        }
+    )
+
+    # Validador precompilado del cuerpo de /predict/batch
+    validador_lote = ValidadorLote(modelo_entrada)
+
+    @router.post("/predict", response_model=Prediccion, status_code=status.HTTP_200_OK, name=f"predecir_{singular}")
+    @_con_nombres(nombres)
+    async def predecir(
+        input_data: modelo_entrada,
+        nivel: float = Query(0.9, ge=0.5, le=0.99, description="Nivel de confianza del intervalo de precio")
+    ):
+        """
+        Predice el precio de {un} en la Ciudad de México.
+        
+        Args:
+            input_data: Características {del} (alcaldía, metros cuadrados, recámaras, baños, estacionamientos)
+            nivel: Nivel de confianza del intervalo de precio (0.5 a 0.99)
+        
+        Returns:
+            Predicción con el precio estimado, su intervalo (si el modelo lo tiene) y metadatos
+        
+        Raises:
+            HTTPException: Si hay un error en la predicción
+        """
+        try:
+            # Con el coalescer activo, la predicción se agrupa con otras peticiones concurrentes
+            coalescer = get_coalescer(tipo)
+            # En modo JSON rápido el caso de uso devuelve la respuesta ya codificada
+            json_rapido = get_settings().json_rapido
+            if coalescer is not None:
+                if json_rapido:
+                    return RespuestaJSON(await predict_propiedad_coalescida_json(tipo, input_data, coalescer, nivel))
+                return await predict_propiedad_coalescida(tipo, input_data, coalescer, nivel)
+            
+            # La predicción se ejecuta en el pool dedicado para no bloquear el event loop
+            if json_rapido:
+                return RespuestaJSON(await get_executor().run(predict_propiedad_json, tipo, input_data, nivel))
+            result = await get_executor().run(predict_propiedad, tipo, input_data, nivel)
+            return result
+        
+        except AlcaldiaNoEncontrada as e:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Alcaldía no encontrada: {str(e)}"
+            )
+        
+        except FeatureNoValida as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=str(e)
+            )
+        
+        except ModeloNoDisponible as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error al cargar el modelo: {str(e)}"
+            )
+        
+        except ServicioSaturado as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(e),
+                headers={"Retry-After": "1"}
+            )
+        
+        except ErrorPrediccion as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error en la predicción: {str(e)}"
+            )
+        
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error inesperado: {str(e)}"
+            )
+
+    @router.post("/predict/batch", response_model=PrediccionLote, status_code=status.HTTP_200_OK,
+                 openapi_extra=validador_lote.openapi, name=f"predecir_{plural}_lote")
+    @_con_nombres(nombres)
+    async def predecir_lote(input_data: List[modelo_entrada] = Depends(validador_lote)):
+        """
+        Predice el precio de un lote de {plural} en una sola llamada al modelo.
+        
+        Cada fila recibe su propia predicción o su propio error (alcaldía no
+        encontrada, valores fuera de rango), de modo que una fila inválida no
+        hace fallar todo el lote.
+        
+        Args:
+            input_data: Lista con las características de cada {singular}
+        
+        Returns:
+            Resultados por fila, en el mismo orden de entrada
+        
+        Raises:
+            HTTPException: Si el lote es demasiado grande o falla el modelo
+        """
+        if len(input_data) > MAX_FILAS_LOTE:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"El lote tiene {len(input_data)} filas; el máximo es {MAX_FILAS_LOTE}"
+            )
+        
+        try:
+            if get_settings().json_rapido:
+                return RespuestaJSON(await get_executor().run(predict_propiedades_lote_json, tipo, input_data))
+            return await get_executor().run(predict_propiedades_lote, tipo, input_data)
+        
+        except ModeloNoDisponible as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error al cargar el modelo: {str(e)}"
+            )
+        
+        except ServicioSaturado as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(e),
+                headers={"Retry-After": "1"}
+            )
+        
+        except ErrorPrediccion as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error en la predicción: {str(e)}"
+            )
+        
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error inesperado: {str(e)}"
+            )
+
+    @router.post("/predict/curva", response_model=CurvaPrecios, status_code=status.HTTP_200_OK,
+                 name=f"predecir_curva_{plural}")
+    @_con_nombres(nombres)
+    async def predecir_curva(input_data: CurvaInputData):
+        """
+        Calcula la curva de precio contra metros cuadrados de {un}.
+        
+        Toda la curva (y el barrido opcional de recámaras y baños) se evalúa en
+        una sola llamada al modelo, en lugar de una petición por punto.
+        
+        Args:
+            input_data: Propiedad base, rango de metros cuadrados (metros_min, metros_max, paso)
+                y, opcionalmente, los valores de recámaras y baños a barrer
+        
+        Returns:
+            Los metros cuadrados de la curva y los precios de cada combinación de recámaras y baños
+        
+        Raises:
+            HTTPException: Si hay un error en la predicción
+        """
+        try:
+            return await get_executor().run(predict_curva, tipo, input_data)
+        
+        except AlcaldiaNoEncontrada as e:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Alcaldía no encontrada: {str(e)}"
+            )
+        
+        except FeatureNoValida as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=str(e)
+            )
+        
+        except ModeloNoDisponible as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error al cargar el modelo: {str(e)}"
+            )
+        
+        except ServicioSaturado as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(e),
+                headers={"Retry-After": "1"}
+            )
+        
+        except ErrorPrediccion as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error en la predicción: {str(e)}"
+            )
+
+    @router.post("/predict/alcaldias", response_model=ComparativoAlcaldias, status_code=status.HTTP_200_OK,
+                 name=f"predecir_{plural}_por_alcaldia")
+    @_con_nombres(nombres)
+    async def predecir_por_alcaldia(
+        input_data: CaracteristicasInputData,
+        descendente: bool = Query(False, description="Ordenar de la alcaldía más cara a la más barata")
+    ):
+        """
+        Estima el precio de {un} con las mismas características en cada alcaldía.
+        
+        Todas las alcaldías se evalúan juntas en una sola llamada al modelo.
+        
+        Args:
+            input_data: Características (metros cuadrados, recámaras, baños, estacionamientos)
+            descendente: Orden de los resultados
+        
+        Returns:
+            El precio estimado en cada alcaldía, ordenado por precio
+        
+        Raises:
+            HTTPException: Si hay un error en la predicción
+        """
+        try:
+            return await get_executor().run(predict_alcaldias, tipo, input_data, descendente)
+        
+        except FeatureNoValida as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=str(e)
+            )
+        
+        except ModeloNoDisponible as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error al cargar el modelo: {str(e)}"
+            )
+        
+        except ServicioSaturado as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(e),
+                headers={"Retry-After": "1"}
+            )
+        
+        except ErrorPrediccion as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error en la predicción: {str(e)}"
+            )
+
+    @router.post("/predict/upload", response_class=StreamingResponse, status_code=status.HTTP_200_OK,
+                 name=f"predecir_{plural}_archivo")
+    @_con_nombres(nombres)
+    async def predecir_archivo(
+        archivo: UploadFile = File(..., description=f"Archivo CSV o NDJSON con {nombres['los']} a evaluar"),
+        formato: Optional[str] = Query(None, description="Formato del archivo (csv o ndjson); se detecta si se omite"),
+        formato_salida: Optional[str] = Query(None, description="Formato de la respuesta (csv o ndjson); por defecto el de entrada"),
+        tamano_bloque: int = Query(5000, ge=100, le=100000, description="Filas evaluadas por bloque")
+    ):
+        """
+        Evalúa un archivo CSV o NDJSON de {plural} por bloques y transmite los resultados.
+        
+        El archivo se lee en bloques de tamaño fijo y cada bloque se evalúa con
+        una sola llamada al modelo, por lo que la memoria usada no crece con el
+        número de filas del archivo.
+        
+        Args:
+            archivo: Archivo con las columnas alcaldia, metros_cuadrados, recamaras, banos y estacionamientos
+            formato: Formato del archivo de entrada
+            formato_salida: Formato de los resultados
+            tamano_bloque: Número de filas por bloque
+        
+        Returns:
+            Las filas del archivo con las columnas precio_estimado y error agregadas
+        
+        Raises:
+            HTTPException: Si el archivo no es válido, falla el modelo o el pool de predicciones está saturado
+        """
+        try:
+            formato = formato or detectar_formato(archivo.filename, archivo.content_type)
+            formato_salida = formato_salida or formato
+            
+            # FastAPI cierra el UploadFile al terminar el handler, antes de que la respuesta
+            # termine de transmitirse: la respuesta se queda con una copia propia del archivo
+            copia = await asyncio.to_thread(_copiar_archivo, archivo.file)
+            # Cada bloque se evalúa en el pool acotado de predicciones
+            contenido = await predict_archivo(tipo, copia, formato, formato_salida, tamano_bloque,
+                                              get_executor().run)
+            # La tarea de fondo cierra la copia aunque el cliente se desconecte a la mitad
+            return StreamingResponse(contenido, media_type=FORMATOS[formato_salida],
+                                     background=BackgroundTask(copia.close))
+        
+        except ModeloNoDisponible as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error al cargar el modelo: {str(e)}"
+            )
+        
+        except ServicioSaturado as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(e),
+                headers={"Retry-After": "1"}
+            )
+        
+        except ErrorPrediccion as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+
+    return router
\ No newline at end of file
@@ -1,12 +1,17 @@
-from fastapi import APIRouter, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
 from domain.models import (
     PrecioM2Response, 
     EstadisticasPrecios, 
     TotalResponse, 
     PreciosAlcaldiaResponse,
-    PrecioM2AlcaldiaResponse
+    PrecioM2AlcaldiaResponse,
+    ResumenEstadisticas,
+    StatsDebugInfo
 )
-from domain.exceptions import ErrorEstadisticas
+from domain.exceptions import CampoNoValido, ErrorEstadisticas
+from app.cache_http import ValidadorCache
+from infra.json_rapido import RespuestaJSON
 from usecases.get_stats import (
     get_precio_m2_casas,
     get_precio_m2_departamentos,
@@ -20,13 +25,22 @@ from usecases.get_stats import (
     get_precios_por_alcaldia_total,
     get_precio_m2_por_alcaldia_casas,
     get_precio_m2_por_alcaldia_departamentos,
-    get_precio_m2_por_alcaldia_total
+    get_precio_m2_por_alcaldia_total,
+    get_stats_resumen,
+    get_stats_debug,
+    recalcular_stats
 )
 
-router = APIRouter(prefix="/stats", tags=["Estadísticas"])
+# Las respuestas se codifican con orjson si está instalado
+router = APIRouter(prefix="/stats", tags=["Estadísticas"], default_response_class=RespuestaJSON)
 
+# ETag y Cache-Control según los datos de los que depende cada endpoint
+CACHE_CASAS = Depends(ValidadorCache('casas'))
+CACHE_DEPARTAMENTOS = Depends(ValidadorCache('departamentos'))
+CACHE_TOTAL = Depends(ValidadorCache('casas', 'departamentos'))
 
-@router.get("/casas/precio-m2", response_model=PrecioM2Response)
+
+@router.get("/casas/precio-m2", response_model=PrecioM2Response, dependencies=[CACHE_CASAS])
 def precio_m2_casas():
     """Obtiene el precio promedio por metro cuadrado de casas"""
     try:
@@ -35,7 +49,7 @@ def precio_m2_casas():
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/departamentos/precio-m2", response_model=PrecioM2Response)
+@router.get("/departamentos/precio-m2", response_model=PrecioM2Response, dependencies=[CACHE_DEPARTAMENTOS])
 def precio_m2_departamentos():
     """Obtiene el precio promedio por metro cuadrado de departamentos"""
     try:
@@ -44,7 +58,7 @@ def precio_m2_departamentos():
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/casas/stats", response_model=EstadisticasPrecios)
+@router.get("/casas/stats", response_model=EstadisticasPrecios, dependencies=[CACHE_CASAS])
 def stats_casas():
     """Obtiene estadísticas detalladas de precios de casas"""
     try:
@@ -53,7 +67,7 @@ def stats_casas():
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/departamentos/stats", response_model=EstadisticasPrecios)
+@router.get("/departamentos/stats", response_model=EstadisticasPrecios, dependencies=[CACHE_DEPARTAMENTOS])
 def stats_departamentos():
     """Obtiene estadísticas detalladas de precios de departamentos"""
     try:
@@ -62,7 +76,7 @@ def stats_departamentos():
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/casas/total", response_model=TotalResponse)
+@router.get("/casas/total", response_model=TotalResponse, dependencies=[CACHE_CASAS])
 def total_casas():
     """Obtiene el total de casas"""
     try:
@@ -71,7 +85,7 @@ def total_casas():
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/departamentos/total", response_model=TotalResponse)
+@router.get("/departamentos/total", response_model=TotalResponse, dependencies=[CACHE_DEPARTAMENTOS])
 def total_departamentos():
     """Obtiene el total de departamentos"""
     try:
@@ -80,7 +94,7 @@ def total_departamentos():
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/total", response_model=TotalResponse)
+@router.get("/total", response_model=TotalResponse, dependencies=[CACHE_TOTAL])
 def total_propiedades():
     """Obtiene el total de todas las propiedades"""
     try:
@@ -89,7 +103,7 @@ def total_propiedades():
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/casas/precios-por-alcaldia", response_model=PreciosAlcaldiaResponse)
+@router.get("/casas/precios-por-alcaldia", response_model=PreciosAlcaldiaResponse, dependencies=[CACHE_CASAS])
 def precios_por_alcaldia_casas():
     """Obtiene los precios promedio por alcaldía para casas"""
     try:
@@ -98,7 +112,7 @@ def precios_por_alcaldia_casas():
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/departamentos/precios-por-alcaldia", response_model=PreciosAlcaldiaResponse)
+@router.get("/departamentos/precios-por-alcaldia", response_model=PreciosAlcaldiaResponse, dependencies=[CACHE_DEPARTAMENTOS])
 def precios_por_alcaldia_departamentos():
     """Obtiene los precios promedio por alcaldía para departamentos"""
     try:
@@ -107,7 +121,7 @@ def precios_por_alcaldia_departamentos():
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/precios-por-alcaldia", response_model=PreciosAlcaldiaResponse)
+@router.get("/precios-por-alcaldia", response_model=PreciosAlcaldiaResponse, dependencies=[CACHE_TOTAL])
 def precios_por_alcaldia_total():
     """Obtiene los precios promedio por alcaldía para todas las propiedades"""
     try:
@@ -116,7 +130,7 @@ def precios_por_alcaldia_total():
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/casas/precio-m2-por-alcaldia", response_model=PrecioM2AlcaldiaResponse)
+@router.get("/casas/precio-m2-por-alcaldia", response_model=PrecioM2AlcaldiaResponse, dependencies=[CACHE_CASAS])
 def precio_m2_por_alcaldia_casas():
     """Obtiene los precios promedio por metro cuadrado por alcaldía para casas"""
     try:
@@ -125,7 +139,7 @@ def precio_m2_por_alcaldia_casas():
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/departamentos/precio-m2-por-alcaldia", response_model=PrecioM2AlcaldiaResponse)
+@router.get("/departamentos/precio-m2-por-alcaldia", response_model=PrecioM2AlcaldiaResponse, dependencies=[CACHE_DEPARTAMENTOS])
 def precio_m2_por_alcaldia_departamentos():
     """Obtiene los precios promedio por metro cuadrado por alcaldía para departamentos"""
     try:
@@ -134,10 +148,44 @@ def precio_m2_por_alcaldia_departamentos():
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/precio-m2-por-alcaldia", response_model=PrecioM2AlcaldiaResponse)
+@router.get("/precio-m2-por-alcaldia", response_model=PrecioM2AlcaldiaResponse, dependencies=[CACHE_TOTAL])
 def precio_m2_por_alcaldia_total():
     """Obtiene los precios promedio por metro cuadrado por alcaldía para todas las propiedades"""
     try:
         return get_precio_m2_por_alcaldia_total()
     except ErrorEstadisticas as e:
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/summary", response_model=ResumenEstadisticas, response_model_exclude_none=True, dependencies=[CACHE_TOTAL])
+def stats_resumen(
+    fields: Optional[str] = Query(
+        None,
+        description="Campos separados por comas: secciones (casas, departamentos, propiedades), "
+                    "campos de todas las secciones (total, precio_m2, stats, precios_por_alcaldia, "
+                    "precio_m2_por_alcaldia) o campos de una sección (casas.precio_m2); todos si se omite"
+    )
+):
+    """Obtiene en una sola respuesta las estadísticas globales y por alcaldía de casas, departamentos y todas las propiedades"""
+    try:
+        campos = [campo.strip() for campo in fields.split(',') if campo.strip()] if fields else None
+        return get_stats_resumen(campos)
+    except CampoNoValido as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ErrorEstadisticas as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/debug", response_model=StatsDebugInfo)
+def stats_debug():
+    """Obtiene los snapshots cargados y el tiempo de la última materialización de las estadísticas"""
+    return get_stats_debug()
+
+
+@router.post("/debug/recalcular", response_model=StatsDebugInfo)
+def stats_recalcular():
+    """Recarga los datos que cambiaron y vuelve a calcular todas las estadísticas"""
+    try:
+        return recalcular_stats()
+    except ErrorEstadisticas as e:
+        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -0,0 +1,271 @@
+"""
+Servidor con pre-fork: carga los modelos una sola vez y después crea los workers.
+
+Con `uvicorn --workers N` cada worker importa pandas y scikit-learn y carga los
+modelos por su cuenta, así que la memoria y el tiempo de arranque crecen con N.
+Aquí el proceso padre importa la aplicación, carga el registro de modelos y
+los snapshots de estadísticas, congela el recolector de basura (`gc.freeze`) y
+abre el socket; después hace fork de los workers, que comparten esas páginas
+copy-on-write y sólo arrancan uvicorn sobre el socket heredado.
+
+Cada worker reporta al padre su tiempo de arranque y su memoria (RSS, PSS y
+páginas compartidas, de /proc/self/smaps_rollup); el padre registra el
+resumen y vuelve a crear los workers que terminen inesperadamente.
+
+Uso:
+    python -m app.server [--host 0.0.0.0] [--port 8000] [--workers N]
+"""
+import argparse
+import gc
+import json
+import logging
+import os
+import resource
+import select
+import signal
+import socket
+import sys
+import time
+from typing import Dict, Optional
+
+from domain.exceptions import ErrorEstadisticas, ModeloNoDisponible
+from infra.config import get_settings
+from infra.logs import configure_logging, shutdown_logging
+
+# Con `python -m app.server` el módulo se llama __main__; el logger conserva el nombre del paquete
+logger = logging.getLogger("app.server")
+
+
+# Campos de /proc/self/smaps_rollup que se reportan (en kB)
+CAMPOS_MEMORIA = ('Rss', 'Pss', 'Shared_Clean', 'Shared_Dirty', 'Private_Clean', 'Private_Dirty')
+
+# Segundos que el padre espera a que un worker termine después de SIGTERM
+ESPERA_APAGADO = 30
+
+
+def memoria_proceso() -> Dict[str, float]:
+    """
+    Memoria del proceso actual en MB
+
+    Usa /proc/self/smaps_rollup (Linux) para separar las páginas compartidas de
+    las privadas; en otros sistemas sólo se reporta el RSS máximo.
+    """
+    try:
+        memoria = {}
+        with open('/proc/self/smaps_rollup') as f:
+            for linea in f:
+                campo, _, valor = linea.partition(':')
+                if campo in CAMPOS_MEMORIA:
+                    memoria[campo] = int(valor.split()[0]) / 1024
+        return {
+            'rss_mb': round(memoria['Rss'], 1),
+            'pss_mb': round(memoria['Pss'], 1),
+            'compartida_mb': round(memoria['Shared_Clean'] + memoria['Shared_Dirty'], 1),
+            'privada_mb': round(memoria['Private_Clean'] + memoria['Private_Dirty'], 1)
+        }
+    except (OSError, KeyError, ValueError):
+        # ru_maxrss está en kB en Linux y en bytes en macOS
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return {'rss_mb': round(maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)}
+
+
+def precargar():
+    """
+    Importa la aplicación y carga en el proceso padre todo lo que los workers comparten
+
+    No debe crear hilos: un fork sólo copia el hilo que lo llama.
+
+    Returns:
+        La aplicación FastAPI
+    """
+    from app.main import app
+    from infra.data.model_registry import get_model_registry
+    from infra.data.stats_materializadas import get_stats_materializadas
+    try:
+        get_model_registry().load_all()
+    except ModeloNoDisponible as e:
+        # Cada worker reintentará la carga en su primera predicción
+        logger.warning(str(e))
+    try:
+        # Cargar los snapshots también materializa todas las estadísticas
+        get_stats_materializadas().snapshots.load_all()
+    except ErrorEstadisticas as e:
+        # Cada worker reintentará la carga en su primera estadística
+        logger.warning(str(e))
+    return app
+
+
+def abrir_socket(host: str, puerto: int) -> socket.socket:
+    """Abre el socket de escucha que heredan todos los workers"""
+    familia = socket.AF_INET6 if ':' in host else socket.AF_INET
+    sock = socket.socket(familia, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, puerto))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _worker(app, sock: socket.socket, reporte: int, numero: int, inicio: float) -> None:
+    """Cuerpo de un worker: arranca uvicorn sobre el socket heredado y no regresa"""
+    import uvicorn
+
+    # El padre congeló los objetos precargados; los nuevos sí se recolectan
+    gc.enable()
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+    async def reportar_arranque():
+        # Se ejecuta después de los demás eventos de arranque de la aplicación
+        datos = {
+            'worker': numero,
+            'pid': os.getpid(),
+            'tiempo_arranque_ms': round((time.perf_counter() - inicio) * 1000, 1),
+            **memoria_proceso()
+        }
+        os.write(reporte, (json.dumps(datos) + '\n').encode('utf-8'))
+
+    app.router.on_startup.append(reportar_arranque)
+    codigo = 0
+    try:
+        config = uvicorn.Config(app, log_config=None, access_log=False, lifespan='on')
+        uvicorn.Server(config).run(sockets=[sock])
+    except BaseException:
+        logger.exception("worker_fallo", extra={'worker': numero})
+        codigo = 1
+    finally:
+        shutdown_logging()
+        # Sin os._exit el hijo ejecutaría el resto del código del padre
+        os._exit(codigo)
+
+
+class Servidor:
+    """Proceso padre: crea los workers con fork, recibe sus reportes y los vigila"""
+
+    def __init__(self, app, sock: socket.socket, workers: int):
+        self.app = app
+        self.sock = sock
+        self.workers = workers
+        self._pids: Dict[int, int] = {}
+        self._reportes: Dict[int, dict] = {}
+        self._apagando = False
+        self._lectura, self._escritura = os.pipe()
+        self._pendiente = b''
+
+    def _crear_worker(self, numero: int) -> None:
+        inicio = time.perf_counter()
+        # Vaciar la cola de logs antes del fork: el hilo que la escribe no pasa al hijo
+        shutdown_logging()
+        pid = os.fork()
+        if pid == 0:
+            os.close(self._lectura)
+            configure_logging()
+            _worker(self.app, self.sock, self._escritura, numero, inicio)
+        configure_logging()
+        self._pids[pid] = numero
+
+    def _detener(self, signum, frame) -> None:
+        self._apagando = True
+        for pid in list(self._pids):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def _leer_reportes(self, timeout: float) -> None:
+        """Lee los reportes de arranque que escriben los workers en el pipe"""
+        listos, _, _ = select.select([self._lectura], [], [], timeout)
+        if not listos:
+            return
+        self._pendiente += os.read(self._lectura, 65536)
+        *lineas, self._pendiente = self._pendiente.split(b'\n')
+        for linea in lineas:
+            datos = json.loads(linea)
+            logger.info("worker_listo", extra=datos)
+            primer_resumen = len(self._reportes) < self.workers
+            self._reportes[datos['worker']] = datos
+            if primer_resumen and len(self._reportes) == self.workers:
+                self._resumen()
+
+    def _resumen(self) -> None:
+        """Registra la memoria total de los workers: la suma del PSS es la memoria realmente usada"""
+        reportes = list(self._reportes.values())
+        resumen = {
+            'workers': len(reportes),
+            'tiempo_arranque_max_ms': max(r['tiempo_arranque_ms'] for r in reportes)
+        }
+        for campo in ('rss_mb', 'pss_mb', 'compartida_mb', 'privada_mb'):
+            if all(campo in r for r in reportes):
+                resumen[f'{campo}_total'] = round(sum(r[campo] for r in reportes), 1)
+        logger.info("workers_listos", extra=resumen)
+
+    def _recolectar(self) -> None:
+        """Recoge los workers que terminaron y, si no se está apagando, los vuelve a crear"""
+        while self._pids:
+            pid, estado = os.waitpid(-1, os.WNOHANG)
+            if pid == 0:
+                return
+            numero = self._pids.pop(pid, None)
+            if numero is None or self._apagando:
+                continue
+            logger.warning("worker_terminado", extra={'worker': numero, 'pid': pid, 'estado': estado})
+            self._crear_worker(numero)
+
+    def run(self) -> None:
+        signal.signal(signal.SIGINT, self._detener)
+        signal.signal(signal.SIGTERM, self._detener)
+        for numero in range(self.workers):
+            self._crear_worker(numero)
+
+        while self._pids and not self._apagando:
+            self._leer_reportes(timeout=1.0)
+            self._recolectar()
+
+        limite = time.monotonic() + ESPERA_APAGADO
+        while self._pids and time.monotonic() < limite:
+            self._recolectar()
+            time.sleep(0.1)
+        for pid in list(self._pids):
+            # El worker pudo terminar entre la última recolección y el SIGKILL
+            try:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+        self.sock.close()
+
+
+def main(argv: Optional[list] = None) -> None:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default=settings.servidor_host)
+    parser.add_argument('--port', type=int, default=settings.servidor_puerto)
+    parser.add_argument('--workers', type=int, default=settings.servidor_workers)
+    args = parser.parse_args(argv)
+
+    # Sin recolecciones durante la precarga; al terminar se congela todo lo cargado para que
+    # el recolector de los workers no escriba en esas páginas (y no se copien)
+    gc.disable()
+    configure_logging()
+    inicio = time.perf_counter()
+    app = precargar()
+    gc.collect()
+    gc.freeze()
+    logger.info("precarga_lista", extra={
+        'tiempo_ms': round((time.perf_counter() - inicio) * 1000, 1),
+        'objetos_congelados': gc.get_freeze_count(),
+        **memoria_proceso()
+    })
+
+    sock = abrir_socket(args.host, args.port)
+    # Con --port 0 el sistema elige el puerto; se registra el que quedó abierto
+    puerto = sock.getsockname()[1]
+    logger.info("servidor_iniciado", extra={'host': args.host, 'puerto': puerto, 'workers': args.workers})
+    try:
+        Servidor(app, sock, args.workers).run()
+    finally:
+        shutdown_logging()
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
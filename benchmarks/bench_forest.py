@@ -0,0 +1,69 @@
+"""
+Compara la latencia del bosque aplanado contra `model.predict` de scikit-learn.
+
+Uso:
+    python -m benchmarks.bench_forest [--arboles 100] [--repeticiones 20]
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.preprocessing import StandardScaler
+from infra.inference.forest import FlattenedForest
+from infra.inference.encoder import NUMERIC_FEATURES
+
+
+def _medir(fn, repeticiones: int) -> float:
+    """Mediana del tiempo de ejecución en milisegundos"""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        fn()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return float(np.median(tiempos))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--arboles', type=int, default=100, help="Número de árboles del bosque")
+    parser.add_argument('--repeticiones', type=int, default=20, help="Repeticiones por tamaño de lote")
+    args = parser.parse_args()
+
+    # Entrenar un bosque con los datos de casas
+    df = pd.read_csv('new_casas.csv')
+    columns = list(NUMERIC_FEATURES) + [c for c in df.columns if c.startswith('alcaldia_')]
+    scaler = StandardScaler().fit(df[columns])
+    model = RandomForestRegressor(n_estimators=args.arboles, random_state=0)
+    model.fit(scaler.transform(df[columns]), df['log_precio'])
+    forest = FlattenedForest.from_sklearn(model, scaler, columns)
+    print(f"Bosque: {forest.n_arboles} árboles, {len(forest.value)} nodos, profundidad {forest.profundidad}")
+
+    rng = np.random.default_rng(0)
+    alcaldias = len(forest.alcaldias)
+    print(f"{'filas':>8} {'sklearn (ms)':>14} {'aplanado (ms)':>14} {'aceleración':>12}")
+    for n in (1, 8, 64, 512, 4096):
+        X_num = np.column_stack([
+            rng.uniform(20, 2000, n),
+            rng.integers(1, 7, n),
+            rng.integers(1, 6, n),
+            rng.integers(0, 5, n)
+        ]).astype(np.float64)
+        alcaldia_idx = rng.integers(0, alcaldias, n)
+
+        # scikit-learn: armar la matriz completa, escalar y predecir (lo que hace el repositorio)
+        def con_sklearn():
+            X = forest.encoder.encode(X_num, alcaldia_idx)
+            return model.predict(scaler.transform(pd.DataFrame(X, columns=columns)))
+
+        def con_bosque():
+            return forest.predict_log_batch(X_num, alcaldia_idx)
+
+        np.testing.assert_allclose(con_bosque(), con_sklearn(), rtol=1e-12)
+        t_sklearn = _medir(con_sklearn, args.repeticiones)
+        t_bosque = _medir(con_bosque, args.repeticiones)
+        print(f"{n:>8} {t_sklearn:>14.3f} {t_bosque:>14.3f} {t_sklearn / t_bosque:>11.1f}x")
+
+
+if __name__ == "__main__":
+    main()
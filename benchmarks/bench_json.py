@@ -0,0 +1,91 @@
+"""
+Compara el camino normal de las respuestas de predicción por lotes contra el modo JSON rápido.
+
+El camino normal decodifica el cuerpo con `json.loads`, valida la lista con
+FastAPI, construye un `PrediccionLote` de pydantic y FastAPI lo vuelve a
+validar y serializar antes de `json.dumps`. El modo rápido valida los bytes
+con el `TypeAdapter` precompilado y escribe la respuesta con fragmentos
+precodificados. Los precios se calculan una sola vez: sólo se mide la
+validación y la serialización.
+
+Uso:
+    python -m benchmarks.bench_json [--repeticiones 20]
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import time
+from typing import List
+import numpy as np
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from app.validacion import ValidadorLote
+from domain.models import CasaInputData, PrediccionLote, ResultadoLote
+from infra.data.model_registry import get_model_registry
+from infra.json_rapido import orjson
+from usecases.predict_casas import CODIFICADOR, _construir_prediccion, _model_input
+
+
+def _medir(fn, repeticiones: int) -> float:
+    """Mediana del tiempo de ejecución en milisegundos"""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        fn()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return float(np.median(tiempos))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeticiones', type=int, default=20, help="Repeticiones por tamaño de lote")
+    args = parser.parse_args()
+
+    repo = get_model_registry().get('casas')
+    campo_entrada = create_response_field(name='body', type_=List[CasaInputData])
+    campo_respuesta = create_response_field(name='respuesta', type_=PrediccionLote)
+    validador = ValidadorLote(CasaInputData)
+    rng = np.random.default_rng(0)
+    loop = asyncio.new_event_loop()
+    print(f"Codificador JSON: {'orjson' if orjson is not None else 'json (biblioteca estándar)'}")
+
+    print(f"{'filas':>8} {'normal (ms)':>12} {'rápido (ms)':>12} {'aceleración':>12}")
+    for n in (1, 10, 100, 1000, 10000):
+        cuerpo = json.dumps([{
+            'alcaldia': str(rng.choice(repo.alcaldias)),
+            'metros_cuadrados': float(rng.uniform(40, 500)),
+            'recamaras': int(rng.integers(1, 7)),
+            'banos': int(rng.integers(1, 6)),
+            'estacionamientos': int(rng.integers(0, 5))
+        } for _ in range(n)]).encode('utf-8')
+        filas = validador.adapter.validate_json(cuerpo)
+        precios, errores = repo.predict_batch([_model_input(fila) for fila in filas])
+        fecha = datetime.datetime.now().isoformat()
+
+        def normal():
+            # Lo que hacen FastAPI y el caso de uso sin el modo rápido
+            entrada, _ = campo_entrada.validate(json.loads(cuerpo), {}, loc=('body',))
+            resultados = [
+                ResultadoLote(indice=i, error=str(error)) if error is not None
+                else ResultadoLote(indice=i, prediccion=_construir_prediccion(fila, float(precio), fecha))
+                for i, (fila, precio, error) in enumerate(zip(entrada, precios, errores))
+            ]
+            lote = PrediccionLote(tipo_propiedad="casa", total=len(resultados),
+                                  exitosas=sum(1 for r in resultados if r.error is None), resultados=resultados)
+            contenido = loop.run_until_complete(serialize_response(field=campo_respuesta, response_content=lote))
+            return JSONResponse(contenido).body
+
+        def rapido():
+            return CODIFICADOR.lote(validador.adapter.validate_json(cuerpo), precios, errores, fecha)
+
+        assert json.loads(rapido()) == json.loads(normal())
+        t_normal = _medir(normal, args.repeticiones)
+        t_rapido = _medir(rapido, args.repeticiones)
+        print(f"{n:>8} {t_normal:>12.3f} {t_rapido:>12.3f} {t_normal / t_rapido:>11.1f}x")
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,90 @@
+"""
+Compara el cálculo anterior de los promedios por alcaldía contra la agrupación en una sola pasada.
+
+El cálculo anterior recorre las alcaldías: por cada una arma la máscara con
+su columna one-hot, copia el sub-DataFrame, calcula los cuartiles y, para
+las estadísticas totales, concatena casas y departamentos. La agrupación
+decodifica las alcaldías una sola vez (al cargar el snapshot, fuera de la
+medición) y calcula cuartiles, filtro y promedios de todos los grupos y de
+las dos columnas juntos.
+Los datos se amplían remuestreando las publicaciones de los CSV.
+
+Uso:
+    python -m benchmarks.bench_stats [--repeticiones 20]
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from infra.data.stats_repo import promedios_por_alcaldia, remove_outliers
+from infra.data.stats_snapshot import ARCHIVOS_STATS, COLUMNAS_STATS, decodificar_alcaldias
+
+
+def _medir(fn, repeticiones: int) -> float:
+    """Mediana del tiempo de ejecución en milisegundos"""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        fn()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return float(np.median(tiempos))
+
+
+def _por_alcaldia_filtrando(frames, column: str):
+    """Cálculo anterior: una máscara, una copia y unos cuartiles por alcaldía"""
+    alcaldias = list(dict.fromkeys(
+        col.replace('alcaldia_', '') for df in frames for col in df.columns if col.startswith('alcaldia_')
+    ))
+    resultado = {}
+    for alcaldia in alcaldias:
+        df_combined = pd.concat([
+            df.loc[df[f'alcaldia_{alcaldia}'] == 1, [column]] for df in frames if f'alcaldia_{alcaldia}' in df
+        ])
+        if len(df_combined) > 0:
+            resultado[alcaldia] = float(remove_outliers(df_combined, column)[column].mean())
+        else:
+            resultado[alcaldia] = 0.0
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeticiones', type=int, default=20, help="Repeticiones por tamaño de los datos")
+    args = parser.parse_args()
+
+    originales = {
+        tipo: pd.read_csv(archivo, usecols=lambda c: c in COLUMNAS_STATS or c.startswith('alcaldia_'))
+        for tipo, archivo in ARCHIVOS_STATS.items()
+    }
+
+    print(f"{'filas':>9} {'anterior (ms)':>14} {'agrupado (ms)':>14} {'aceleración':>12}")
+    for n in (1000, 10000, 100000, 1000000):
+        # n filas en total, repartidas como en los archivos originales
+        total = sum(len(df) for df in originales.values())
+        one_hot = [
+            df.sample(n=max(1, n * len(df) // total), replace=True, random_state=0).reset_index(drop=True)
+            for df in originales.values()
+        ]
+        decodificados = [decodificar_alcaldias(df)[0] for df in one_hot]
+
+        def anterior():
+            # Las seis estadísticas por alcaldía: casas, departamentos y total, precio y precio por m2
+            return [_por_alcaldia_filtrando(frames, column)
+                    for frames in ([one_hot[0]], [one_hot[1]], one_hot) for column in COLUMNAS_STATS]
+
+        def agrupado():
+            # Una agrupación por combinación de tipos calcula las dos columnas
+            promedios = [promedios_por_alcaldia(frames, COLUMNAS_STATS)
+                         for frames in ([decodificados[0]], [decodificados[1]], decodificados)]
+            return [por_columna[column] for por_columna in promedios for column in COLUMNAS_STATS]
+
+        for esperado, obtenido in zip(anterior(), agrupado()):
+            assert list(esperado) == list(obtenido)
+            assert np.allclose(list(esperado.values()), list(obtenido.values()), rtol=1e-9, equal_nan=True)
+        t_anterior = _medir(anterior, args.repeticiones)
+        t_agrupado = _medir(agrupado, args.repeticiones)
+        print(f"{n:>9} {t_anterior:>14.3f} {t_agrupado:>14.3f} {t_anterior / t_agrupado:>11.1f}x")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,29 @@
+import os
+import argparse
+from infra.data.base_repo import BASE_PATH
+from infra.data.model_registry import get_model_registry
+from infra.inference.lattice import PrediccionLattice, KNOTS_M2
+
+
+# Función principal para generar las mallas de predicción
+def build_lattices(directorio: str, tipos=None):
+    registry = get_model_registry()
+    for tipo in tipos or registry.tipos:
+        print(f"Generando malla para {tipo}...")
+        repo = registry.get(tipo)
+        lattice = PrediccionLattice.build(repo, os.path.join(directorio, tipo), KNOTS_M2)
+
+        tamano_mb = lattice.valores.nbytes / (1024 * 1024)
+        print(f"Forma de la malla: {lattice.valores.shape} ({tamano_mb:.2f} MB)")
+        print(f"Error máximo contra el modelo: {lattice.error_maximo['relativo']:.2e} (relativo), "
+              f"{lattice.error_maximo['log_precio']:.2e} (log precio)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precalcula las mallas de predicción de los modelos")
+    parser.add_argument('--dir', default=os.getenv('FENNEC_LATTICE_DIR') or os.path.join(BASE_PATH, 'lattice'),
+                        help="Directorio donde se guardan las mallas")
+    parser.add_argument('tipos', nargs='*', help="Tipos de propiedad (por defecto todos)")
+    args = parser.parse_args()
+    build_lattices(args.dir, args.tipos)
+    print("¡Mallas generadas exitosamente!")
@@ -2,53 +2,52 @@ import joblib
 import numpy as np
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.preprocessing import StandardScaler
+from infra.inference.encoder import FeatureEncoder
 
-# Crear columnas simuladas
-casas_columns = [
-    'metros_cuadrados', 'recamaras', 'banos', 'estacionamientos',
-    'alcaldia_Alvaro Obregón', 'alcaldia_Azcapotzalco', 'alcaldia_Benito Juárez',
-    'alcaldia_Coyoacán', 'alcaldia_Cuajimalpa de Morelos', 'alcaldia_Cuauhtémoc',
-    'alcaldia_Gustavo A. Madero', 'alcaldia_Iztacalco', 'alcaldia_Iztapalapa',
-    'alcaldia_La Magdalena Contreras', 'alcaldia_Miguel Hidalgo', 'alcaldia_Milpa Alta',
-    'alcaldia_Tláhuac', 'alcaldia_Tlalpan', 'alcaldia_Venustiano Carranza',
-    'alcaldia_Xochimilco'
-]
+# Codificador con las columnas simuladas (mismo orden y nombres que usa el servicio)
+encoder = FeatureEncoder.para_alcaldias([
+    'Alvaro Obregón', 'Azcapotzalco', 'Benito Juárez', 'Coyoacán', 'Cuajimalpa de Morelos',
+    'Cuauhtémoc', 'Gustavo A. Madero', 'Iztacalco', 'Iztapalapa', 'La Magdalena Contreras',
+    'Miguel Hidalgo', 'Milpa Alta', 'Tláhuac', 'Tlalpan', 'Venustiano Carranza', 'Xochimilco'
+])
+rng = np.random.default_rng(42)
 
-departamentos_columns = casas_columns.copy()
 
-# Crear modelos ficticios
-print("Creando modelo simulado para casas...")
-casas_model = RandomForestRegressor(n_estimators=10, random_state=42)
-X_dummy = np.random.rand(100, len(casas_columns))
-y_dummy = np.random.rand(100) * 10000000  # Precios en el rango de millones
+def datos_simulados(n, precio_m2):
+    """Entradas aleatorias con rangos razonables y el logaritmo del precio como objetivo"""
+    X_num = np.column_stack([
+        rng.uniform(40, 500, n),     # metros cuadrados
+        rng.integers(1, 7, n),       # recámaras
+        rng.integers(1, 6, n),       # baños
+        rng.integers(0, 5, n)        # estacionamientos
+    ]).astype(np.float64)
+    alcaldia_idx = rng.integers(0, len(encoder.alcaldias), n)
+    y = np.log(X_num[:, 0] * precio_m2 * rng.uniform(0.7, 1.3, n))
+    return encoder.encode(X_num, alcaldia_idx), y
 
-# Entrenar el modelo con datos aleatorios
-casas_model.fit(X_dummy, y_dummy)
 
-# Crear y guardar un scaler ficticio
-casas_scaler = StandardScaler()
-casas_scaler.fit(X_dummy)
+def crear_modelo(tipo, precio_m2):
+    X_dummy, y_dummy = datos_simulados(100, precio_m2)
 
-# Guardar los artefactos
-joblib.dump(casas_model, 'casas_model.joblib')
-joblib.dump(casas_scaler, 'casas_scaler.joblib')
-joblib.dump(casas_columns, 'casas_columns.joblib')
+    # Crear y guardar un scaler ficticio
+    scaler = StandardScaler()
+    X_scaled = scaler.fit_transform(X_dummy)
 
-print("Creando modelo simulado para departamentos...")
-departamentos_model = RandomForestRegressor(n_estimators=10, random_state=42)
-X_dummy = np.random.rand(100, len(departamentos_columns))
-y_dummy = np.random.rand(100) * 8000000  # Precios en el rango de millones
+    # Entrenar el modelo con datos aleatorios
+    model = RandomForestRegressor(n_estimators=10, random_state=42)
+    model.fit(X_scaled, y_dummy)
 
-# Entrenar el modelo con datos aleatorios
-departamentos_model.fit(X_dummy, y_dummy)
+    # Guardar los artefactos
+    joblib.dump(model, f'{tipo}_model.joblib')
+    joblib.dump(scaler, f'{tipo}_scaler.joblib')
+    joblib.dump(list(encoder.columns), f'{tipo}_columns.joblib')
 
-# Crear y guardar un scaler ficticio
-departamentos_scaler = StandardScaler()
-departamentos_scaler.fit(X_dummy)
 
-# Guardar los artefactos
-joblib.dump(departamentos_model, 'departamentos_model.joblib')
-joblib.dump(departamentos_scaler, 'departamentos_scaler.joblib')
-joblib.dump(departamentos_columns, 'departamentos_columns.joblib')
+# Crear modelos ficticios
+print("Creando modelo simulado para casas...")
+crear_modelo('casas', 40000)
+
+print("Creando modelo simulado para departamentos...")
+crear_modelo('departamentos', 50000)
 
-print("Modelos simulados guardados exitosamente.") 
\ No newline at end of file
+print("Modelos simulados guardados exitosamente.")
\ No newline at end of file
@@ -1,3 +1,6 @@
+from typing import Sequence
+
+
 class DomainException(Exception):
     """Excepción base para errores de dominio"""
     pass
@@ -5,9 +8,17 @@ class DomainException(Exception):
 
 class AlcaldiaNoEncontrada(DomainException):
     """Se levanta cuando no se encuentra información de una alcaldía"""
-    def __init__(self, alcaldia: str):
+    def __init__(self, alcaldia: str, sugerencias: Sequence[str] = ()):
         self.alcaldia = alcaldia
-        super().__init__(f"No se encontró información para la alcaldía: {alcaldia}")
+        self.sugerencias = list(sugerencias)
+        mensaje = f"No se encontró información para la alcaldía: {alcaldia}"
+        if self.sugerencias:
+            mensaje += f". ¿Quisiste decir: {', '.join(self.sugerencias)}?"
+        super().__init__(mensaje)
+
+    def __reduce__(self):
+        # Conservar los argumentos originales al serializar (ej: entre procesos)
+        return (type(self), (self.alcaldia, self.sugerencias))
 
 
 class ModeloNoDisponible(DomainException):
@@ -16,6 +27,9 @@ class ModeloNoDisponible(DomainException):
         self.tipo_modelo = tipo_modelo
         super().__init__(f"No se pudo cargar el modelo predictivo: {tipo_modelo}")
 
+    def __reduce__(self):
+        return (type(self), (self.tipo_modelo,))
+
 
 class FeatureNoValida(DomainException):
     """Se levanta cuando una característica no es válida para el modelo"""
@@ -24,18 +38,49 @@ class FeatureNoValida(DomainException):
         self.valor = valor
         super().__init__(f"La característica '{feature}' con valor '{valor}' no es válida para el modelo")
 
+    def __reduce__(self):
+        return (type(self), (self.feature, self.valor))
+
 
 class ErrorPrediccion(DomainException):
     """Se levanta cuando hay un error en la predicción"""
     def __init__(self, mensaje: str):
+        self.mensaje = mensaje
         super().__init__(f"Error en la predicción: {mensaje}")
 
+    def __reduce__(self):
+        return (type(self), (self.mensaje,))
+
+
+class ServicioSaturado(DomainException):
+    """Se levanta cuando la cola de predicciones está llena"""
+    def __init__(self, pendientes: int):
+        self.pendientes = pendientes
+        super().__init__(f"El servicio de predicción está saturado ({pendientes} peticiones pendientes)")
+
+    def __reduce__(self):
+        return (type(self), (self.pendientes,))
+
 
 class ErrorEstadisticas(DomainException):
     """Se lanza cuando hay un error al calcular estadísticas"""
     pass
 
 
+class CampoNoValido(DomainException):
+    """Se lanza cuando se pide un campo que no existe en una respuesta"""
+    def __init__(self, campo: str, disponibles: Sequence[str] = ()):
+        self.campo = campo
+        self.disponibles = list(disponibles)
+        mensaje = f"Campo no válido: {campo}"
+        if self.disponibles:
+            mensaje += f". Campos disponibles: {', '.join(self.disponibles)}"
+        super().__init__(mensaje)
+
+    def __reduce__(self):
+        return (type(self), (self.campo, self.disponibles))
+
+
 class FibraNoEncontrada(DomainException):
     """Se lanza cuando no se encuentra información para una FIBRA"""
     pass
@@ -28,6 +28,101 @@ class Prediccion(BaseModel):
     alcaldia: str
     caracteristicas: Dict[str, float]
     fecha_prediccion: str
+    precio_minimo: Optional[float] = None
+    precio_maximo: Optional[float] = None
+    nivel_confianza: Optional[float] = None
+
+
+class ResultadoLote(BaseModel):
+    """Resultado de una fila dentro de una predicción por lotes"""
+    indice: int
+    prediccion: Optional[Prediccion] = None
+    error: Optional[str] = None
+
+
+class PrediccionLote(BaseModel):
+    """Modelo con las predicciones de un lote de propiedades"""
+    tipo_propiedad: str
+    total: int
+    exitosas: int
+    resultados: List[ResultadoLote]
+
+
+class CurvaInputData(BaseModel):
+    """Propiedad base y rango de metros cuadrados para una curva de precio"""
+    alcaldia: str
+    recamaras: int = Field(..., ge=0)
+    banos: int = Field(..., ge=0)
+    estacionamientos: int = Field(..., ge=0)
+    metros_min: float = Field(..., gt=0)
+    metros_max: float = Field(..., gt=0)
+    paso: float = Field(10, gt=0)
+    recamaras_valores: Optional[List[int]] = None
+    banos_valores: Optional[List[int]] = None
+
+
+class SerieCurva(BaseModel):
+    """Precios de una combinación de recámaras y baños a lo largo de los metros cuadrados"""
+    recamaras: int
+    banos: int
+    precios: List[float]
+
+
+class CurvaPrecios(BaseModel):
+    """Modelo con la curva de precio contra metros cuadrados"""
+    tipo_propiedad: str
+    alcaldia: str
+    estacionamientos: int
+    metros_cuadrados: List[float]
+    series: List[SerieCurva]
+
+
+class CaracteristicasInputData(BaseModel):
+    """Características de una propiedad sin alcaldía, para compararla entre alcaldías"""
+    metros_cuadrados: float = Field(..., gt=0)
+    recamaras: int = Field(..., ge=0)
+    banos: int = Field(..., ge=0)
+    estacionamientos: int = Field(..., ge=0)
+
+
+class PrecioAlcaldia(BaseModel):
+    """Precio estimado de una propiedad en una alcaldía"""
+    alcaldia: str
+    precio_estimado: float
+
+
+class ComparativoAlcaldias(BaseModel):
+    """Modelo con el precio de una misma propiedad en cada alcaldía, ordenado por precio"""
+    tipo_propiedad: str
+    caracteristicas: Dict[str, float]
+    precios: List[PrecioAlcaldia]
+
+
+class ModeloInfo(BaseModel):
+    """Información de un modelo cargado en el registro"""
+    tipo_propiedad: str
+    version: str
+    tiempo_carga_ms: float
+    fecha_carga: str
+    alcaldias: int
+    version_publicada: Optional[str] = None
+    lattice_error_relativo: Optional[float] = None
+
+
+class ShadowInfo(BaseModel):
+    """Estadísticas de un modelo candidato evaluado en modo sombra"""
+    tipo_propiedad: str
+    version_candidata: str
+    artefactos: str
+    muestreo: float
+    enviadas: int
+    evaluadas: int
+    descartadas: int
+    errores: int
+    pendientes: int
+    precio_candidato: Dict[str, Optional[float]]
+    diferencia: Dict[str, Optional[float]]
+    diferencia_relativa: Dict[str, Optional[float]]
 
 
 class PrecioM2Response(BaseModel):
@@ -66,6 +161,47 @@ class PrecioM2AlcaldiaResponse(BaseModel):
     precios: Dict[str, float]
 
 
+class ResumenTipo(BaseModel):
+    """Estadísticas de un tipo de propiedad (o de todas) en el resumen; los campos no pedidos se omiten"""
+    total: Optional[int] = None
+    precio_m2: Optional[float] = None
+    stats: Optional[EstadisticasPrecios] = None
+    precios_por_alcaldia: Optional[Dict[str, float]] = None
+    precio_m2_por_alcaldia: Optional[Dict[str, float]] = None
+
+
+class ResumenEstadisticas(BaseModel):
+    """Resumen de estadísticas de casas, departamentos y todas las propiedades"""
+    casas: Optional[ResumenTipo] = None
+    departamentos: Optional[ResumenTipo] = None
+    propiedades: Optional[ResumenTipo] = None
+
+
+class SnapshotInfo(BaseModel):
+    """Datos de las publicaciones cargados en memoria para un tipo de propiedad"""
+    tipo_propiedad: str
+    filas: int
+    hash: str
+    fecha_carga: str
+    tiempo_carga_ms: float
+
+
+class MaterializacionInfo(BaseModel):
+    """Última materialización de las estadísticas que dependen de unos mismos snapshots"""
+    tipos: List[str]
+    hashes: List[str]
+    fecha: str
+    tiempo_ms: float
+    tiempos_ms: Dict[str, float]
+    errores: Dict[str, str]
+
+
+class StatsDebugInfo(BaseModel):
+    """Estado de los snapshots y de las estadísticas materializadas"""
+    snapshots: List[SnapshotInfo]
+    materializaciones: List[MaterializacionInfo]
+
+
 class FibraResponse(BaseModel):
     """Modelo de respuesta para datos de una fibra"""
     nombre: str
@@ -0,0 +1,112 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from infra.config import get_settings
+from infra.data.model_registry import get_model_registry
+from infra.metrics import get_metrics
+
+
+class PrediccionCache:
+    """
+    Caché LRU con expiración (TTL) para precios predichos.
+
+    Las claves incluyen el tipo de propiedad y la versión del modelo, así que
+    una predicción nunca se sirve con un modelo distinto al que la calculó;
+    además, al recargar un modelo se eliminan las entradas de su tipo.
+    """
+
+    def __init__(self, max_entradas: int = 10000, ttl_segundos: float = 3600):
+        self.max_entradas = max_entradas
+        self.ttl_segundos = ttl_segundos
+        self._entradas: "OrderedDict[Hashable, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        metrics = get_metrics()
+        self._aciertos = metrics.counter('cache.prediccion.aciertos')
+        self._fallos = metrics.counter('cache.prediccion.fallos')
+        self._desalojos = metrics.counter('cache.prediccion.desalojos')
+        self._expiraciones = metrics.counter('cache.prediccion.expiraciones')
+        self._tamano = metrics.gauge('cache.prediccion.entradas')
+
+    @property
+    def activa(self) -> bool:
+        return self.max_entradas > 0
+
+    @staticmethod
+    def clave(tipo: str, version: str, model_input: Dict[str, Any]) -> Tuple:
+        """Construye la clave normalizada de una predicción"""
+        return (
+            tipo,
+            version,
+            model_input['alcaldia'],
+            float(model_input['metros_cuadrados']),
+            int(model_input['recamaras']),
+            int(model_input['banos']),
+            int(model_input['estacionamientos'])
+        )
+
+    def get(self, clave: Hashable) -> Optional[float]:
+        """Devuelve el precio guardado para la clave, o None si no existe o expiró"""
+        if not self.activa:
+            return None
+        ahora = time.monotonic()
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                self._fallos.inc()
+                return None
+            precio, expira = entrada
+            if expira <= ahora:
+                del self._entradas[clave]
+                self._tamano.set(len(self._entradas))
+                self._expiraciones.inc()
+                self._fallos.inc()
+                return None
+            self._entradas.move_to_end(clave)
+        self._aciertos.inc()
+        return precio
+
+    def put(self, clave: Hashable, precio: float) -> None:
+        """Guarda un precio, desalojando las entradas menos usadas si se excede el tamaño"""
+        if not self.activa:
+            return
+        with self._lock:
+            self._entradas[clave] = (precio, time.monotonic() + self.ttl_segundos)
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+                self._desalojos.inc()
+            self._tamano.set(len(self._entradas))
+
+    def invalidate(self, tipo: Optional[str] = None) -> None:
+        """Elimina las entradas de un tipo de propiedad (o todas si no se indica)"""
+        with self._lock:
+            if tipo is None:
+                self._entradas.clear()
+            else:
+                for clave in [c for c in self._entradas if c[0] == tipo]:
+                    del self._entradas[clave]
+            self._tamano.set(len(self._entradas))
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+
+_cache: Optional[PrediccionCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_prediccion_cache() -> PrediccionCache:
+    """Devuelve la caché de predicciones del proceso, creándola la primera vez"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                settings = get_settings()
+                cache = PrediccionCache(settings.cache_max_entradas, settings.cache_ttl_segundos)
+                # Al recargar un modelo se descartan sus predicciones
+                get_model_registry().subscribe(lambda tipo, repo: cache.invalidate(tipo))
+                _cache = cache
+    return _cache
@@ -0,0 +1,88 @@
+import os
+from typing import Dict, Optional
+from dotenv import load_dotenv
+
+# Cargar variables del archivo .env (si existe) sin sobreescribir las del entorno
+load_dotenv()
+
+
+def _env_bool(nombre: str, defecto: bool = False) -> bool:
+    """Lee una variable de entorno booleana (1/true/si/on)"""
+    valor = os.getenv(nombre)
+    if valor is None:
+        return defecto
+    return valor.strip().lower() in ('1', 'true', 'si', 'sí', 'yes', 'on')
+
+
+def _env_niveles(nombre: str) -> Dict[str, str]:
+    """Lee niveles de log por logger con el formato logger=NIVEL,otro.logger=NIVEL"""
+    niveles = {}
+    for par in (os.getenv(nombre) or '').split(','):
+        if '=' in par:
+            logger, nivel = par.split('=', 1)
+            niveles[logger.strip()] = nivel.strip().upper()
+    return niveles
+
+
+class Settings:
+    """Configuración de la aplicación leída de variables de entorno"""
+
+    def __init__(self):
+        # Coalescer de predicciones individuales (opcional)
+        self.coalescer_activo = _env_bool('FENNEC_COALESCER', False)
+        self.coalescer_ventana_ms = float(os.getenv('FENNEC_COALESCER_VENTANA_MS', '2'))
+        self.coalescer_max_filas = int(os.getenv('FENNEC_COALESCER_MAX_FILAS', '64'))
+
+        # Pool donde se ejecutan las predicciones: 'thread', 'process' o 'none' (en el event loop)
+        self.executor_tipo = os.getenv('FENNEC_EXECUTOR', 'thread').strip().lower()
+        self.executor_workers = int(os.getenv('FENNEC_EXECUTOR_WORKERS', str(min(4, os.cpu_count() or 1))))
+        self.executor_max_pendientes = int(os.getenv('FENNEC_EXECUTOR_MAX_PENDIENTES', '256'))
+
+        # Caché de predicciones (0 entradas la desactiva)
+        self.cache_max_entradas = int(os.getenv('FENNEC_CACHE_MAX_ENTRADAS', '10000'))
+        self.cache_ttl_segundos = float(os.getenv('FENNEC_CACHE_TTL_SEGUNDOS', '3600'))
+
+        # Malla precalculada de predicciones (se genera con build_lattice.py)
+        self.lattice_activo = _env_bool('FENNEC_LATTICE', False)
+        self.lattice_dir = os.getenv('FENNEC_LATTICE_DIR') or None
+
+        # Modelos versionados (modelos/<tipo>/<version>/) y cada cuántos segundos se
+        # revisa si hay una versión nueva (0 desactiva la recarga)
+        self.modelos_dir = os.getenv('FENNEC_MODELOS_DIR') or None
+        self.modelos_recarga_segundos = float(os.getenv('FENNEC_MODELOS_RECARGA_SEGUNDOS', '30'))
+
+        # Modo sombra: fracción de las predicciones que se repiten con el modelo candidato
+        # (modelos/<tipo>/CANDIDATO) y tamaño máximo de su cola
+        self.shadow_muestreo = float(os.getenv('FENNEC_SHADOW_MUESTREO', '0.1'))
+        self.shadow_max_cola = int(os.getenv('FENNEC_SHADOW_MAX_COLA', '1000'))
+
+        # Cada cuántos segundos se revisa si cambiaron los CSV de las estadísticas (0 desactiva la recarga)
+        self.stats_recarga_segundos = float(os.getenv('FENNEC_STATS_RECARGA_SEGUNDOS', '30'))
+        # Cabecera Cache-Control de las respuestas de /stats (vacía para no enviarla); el ETag se envía siempre
+        self.stats_cache_control = os.getenv('FENNEC_STATS_CACHE_CONTROL', 'public, no-cache').strip()
+
+        # Respuestas de predicción codificadas directamente en JSON (orjson si está instalado)
+        self.json_rapido = _env_bool('FENNEC_JSON_RAPIDO', False)
+
+        # Servidor con pre-fork (app/server.py): dirección y número de workers
+        self.servidor_host = os.getenv('FENNEC_HOST', '0.0.0.0')
+        self.servidor_puerto = int(os.getenv('FENNEC_PUERTO', '8000'))
+        self.servidor_workers = int(os.getenv('FENNEC_WORKERS', str(os.cpu_count() or 1)))
+
+        # Logs: formato ('json' o 'texto'), nivel general, niveles por logger y
+        # fracción de registros de depuración que se conservan
+        self.log_formato = os.getenv('FENNEC_LOG_FORMATO', 'json').strip().lower()
+        self.log_nivel = os.getenv('FENNEC_LOG_NIVEL', 'INFO').strip().upper()
+        self.log_niveles = _env_niveles('FENNEC_LOG_NIVELES')
+        self.log_muestreo = float(os.getenv('FENNEC_LOG_MUESTREO', '0.01'))
+
+
+_settings: Optional[Settings] = None
+
+
+def get_settings() -> Settings:
+    """Devuelve la configuración del proceso, leyéndola la primera vez"""
+    global _settings
+    if _settings is None:
+        _settings = Settings()
+    return _settings
@@ -2,10 +2,17 @@ from infra.data.casas_repo import CasasRepository
 from infra.data.deptos_repo import DepartamentosRepository
 from infra.data.stats_repo import StatsRepository
 from infra.data.fibras_repo import FibrasRepository
+from infra.data.model_registry import ModelRegistry, get_model_registry
+from infra.data.model_watcher import ModelWatcher
+from infra.data.shadow import ShadowScorer
 
 __all__ = [
     'CasasRepository',
     'DepartamentosRepository',
     'StatsRepository',
-    'FibrasRepository'
+    'FibrasRepository',
+    'ModelRegistry',
+    'get_model_registry',
+    'ModelWatcher',
+    'ShadowScorer'
 ] 
\ No newline at end of file
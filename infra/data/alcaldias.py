@@ -0,0 +1,94 @@
+import re
+import unicodedata
+from types import MappingProxyType
+from typing import Dict, List, Optional, Sequence
+
+
+# Variantes conocidas de los nombres de alcaldía (las mismas que se corrigen al limpiar los datos)
+ALCALDIA_CORRECCIONES = MappingProxyType({
+    'Alvaro Obregon': 'Álvaro Obregón',
+    'Alvaro Obregón': 'Álvaro Obregón',
+    'Coyoacan': 'Coyoacán',
+    'Tlahuac': 'Tláhuac',
+    'Magdalena Contreras': 'La Magdalena Contreras',
+    'Azcapotzalco': 'Azcapotzalco',
+    'Gustavo A Madero': 'Gustavo A. Madero',
+    'Cuauhtemoc': 'Cuauhtémoc',
+    'Cuajimalpa': 'Cuajimalpa de Morelos',
+    'GAM': 'Gustavo A. Madero'
+})
+
+_NO_ALFANUMERICO = re.compile(r'[^0-9a-z]+')
+
+
+def normalizar_alcaldia(nombre: str) -> str:
+    """Normaliza un nombre: sin acentos, en minúsculas y sin puntuación ni espacios repetidos"""
+    sin_acentos = unicodedata.normalize('NFKD', nombre)
+    sin_acentos = ''.join(c for c in sin_acentos if not unicodedata.combining(c))
+    return _NO_ALFANUMERICO.sub(' ', sin_acentos.casefold()).strip()
+
+
+def _distancia(a: str, b: str, limite: int) -> int:
+    """Distancia de edición (Levenshtein) entre dos cadenas; devuelve limite + 1 si la excede"""
+    if abs(len(a) - len(b)) > limite:
+        return limite + 1
+    anterior = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        actual = [i]
+        for j, cb in enumerate(b, 1):
+            actual.append(min(anterior[j] + 1, actual[j - 1] + 1, anterior[j - 1] + (ca != cb)))
+        if min(actual) > limite:
+            return limite + 1
+        anterior = actual
+    return anterior[-1]
+
+
+class AlcaldiaResolver:
+    """
+    Resuelve el nombre de alcaldía recibido al nombre que conoce el modelo.
+
+    El índice se construye una sola vez: el nombre exacto y su forma
+    normalizada (sin acentos, mayúsculas ni puntuación) se buscan en un
+    diccionario. Sólo si ambos fallan se compara por distancia de edición
+    contra las alcaldías conocidas, que son pocas.
+    """
+
+    def __init__(self, alcaldias: Sequence[str], correcciones: Dict[str, str] = ALCALDIA_CORRECCIONES):
+        self.alcaldias = tuple(alcaldias)
+        indice = {normalizar_alcaldia(alcaldia): alcaldia for alcaldia in self.alcaldias}
+        for variante, alcaldia in correcciones.items():
+            if alcaldia in self.alcaldias:
+                indice.setdefault(normalizar_alcaldia(variante), alcaldia)
+        self._exactas = frozenset(self.alcaldias)
+        self._indice = MappingProxyType(indice)
+
+    def resolve(self, nombre: str) -> Optional[str]:
+        """
+        Devuelve el nombre canónico de la alcaldía, o None si no se reconoce
+
+        Un nombre con errores de captura se acepta cuando está a una distancia
+        de edición pequeña de una sola alcaldía conocida.
+        """
+        if nombre in self._exactas:
+            return nombre
+        clave = normalizar_alcaldia(nombre)
+        alcaldia = self._indice.get(clave)
+        if alcaldia is not None or not clave:
+            return alcaldia
+
+        # Tolerancia proporcional a la longitud: 1 error hasta 8 letras, 2 después
+        limite = 1 if len(clave) <= 8 else 2
+        candidatas = {self._indice[k] for k in self._indice if _distancia(clave, k, limite) <= limite}
+        return candidatas.pop() if len(candidatas) == 1 else None
+
+    def sugerencias(self, nombre: str, n: int = 3) -> List[str]:
+        """Alcaldías más parecidas al nombre recibido, de la más a la menos parecida"""
+        clave = normalizar_alcaldia(nombre)
+        distancias = {}
+        for variante, alcaldia in self._indice.items():
+            # Un nombre incompleto ("benito") se considera muy parecido a la alcaldía que lo contiene
+            distancia = 1 if clave and clave in variante else _distancia(clave, variante, len(clave) + len(variante))
+            distancias[alcaldia] = min(distancia, distancias.get(alcaldia, distancia))
+        # Sólo sugerir nombres que difieran en a lo más un tercio de las letras
+        ordenadas = sorted(distancias, key=lambda alcaldia: (distancias[alcaldia], alcaldia))
+        return [a for a in ordenadas if distancias[a] <= len(clave) // 3 + 1][:n]
@@ -0,0 +1,487 @@
+import os
+import time
+import hashlib
+import logging
+import joblib
+import numpy as np
+from datetime import datetime
+from types import MappingProxyType
+from typing import Dict, List, Any, Optional, Sequence, Tuple, Union
+from domain.exceptions import DomainException, ModeloNoDisponible, FeatureNoValida, AlcaldiaNoEncontrada
+from infra.config import get_settings
+from infra.data.alcaldias import AlcaldiaResolver
+from infra.data.bundle import ModeloBundle, guardar_bundle, ruta_bundle
+from infra.inference.encoder import FeatureEncoder, INPUT_FIELDS, escalar
+from infra.inference.linear import CompiledLinearPredictor
+from infra.inference.forest import FlattenedForest
+from infra.inference.intervals import TablaResiduos
+from infra.inference.lattice import PrediccionLattice
+
+logger = logging.getLogger(__name__)
+
+
+# Ruta base del proyecto, donde viven los artefactos *.joblib
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Límites para valores numéricos (basados en el análisis de datos); los bundles guardan los suyos
+LIMITES_POR_DEFECTO = MappingProxyType({
+    'recamaras': (1, 6),           # número de recámaras razonable
+    'banos': (1, 5),               # número de baños razonable
+    'estacionamientos': (0, 4)     # número de estacionamientos razonable
+})
+
+
+def _hash_artefactos(rutas: List[str]) -> str:
+    """Calcula una versión corta a partir del contenido de los artefactos del modelo"""
+    sha = hashlib.sha256()
+    for ruta in rutas:
+        with open(ruta, 'rb') as f:
+            for bloque in iter(lambda: f.read(1 << 20), b''):
+                sha.update(bloque)
+    return sha.hexdigest()[:12]
+
+
+class ModeloRepository:
+    """
+    Repositorio base para los modelos predictivos de propiedades.
+
+    Una instancia se carga una sola vez y después se trata como inmutable:
+    `predict` no modifica el estado del repositorio ni los datos de entrada,
+    por lo que la misma instancia puede compartirse entre peticiones e hilos.
+    """
+
+    # Prefijo de los artefactos (ej: 'casas' -> casas_model.joblib)
+    tipo: str = ''
+
+    def __init__(self, model_dir: Optional[str] = None):
+        model_dir = model_dir or BASE_PATH
+
+        inicio = time.perf_counter()
+        # Cargar el bundle si existe; si no, los artefactos joblib sueltos
+        self.bundle: Optional[ModeloBundle] = None
+        if os.path.isdir(ruta_bundle(model_dir, self.tipo)):
+            self._load_bundle(ruta_bundle(model_dir, self.tipo))
+        else:
+            self._load_joblib(model_dir)
+        self.tiempo_carga_ms = (time.perf_counter() - inicio) * 1000
+        self.fecha_carga = datetime.now().isoformat()
+
+        # Codificador compartido con el entrenamiento: el orden de columnas es todo su estado
+        try:
+            self.encoder = FeatureEncoder(self.columns)
+        except ValueError as e:
+            raise ModeloNoDisponible(f"{self.tipo}: {str(e)}")
+
+        # Lista de alcaldías conocidas por el modelo
+        self.alcaldias = self.encoder.alcaldias
+        self.alcaldia_index = MappingProxyType(self.encoder.alcaldia_index)
+        self.alcaldia_columns = self.encoder.alcaldia_columns
+        self.alcaldia_resolver = AlcaldiaResolver(self.alcaldias)
+
+        # Predictor compilado (None si el modelo no es lineal)
+        self.engine = self._compile_engine()
+
+        # Cuantiles de residuos para intervalos de predicción (sólo en bundles entrenados con calibración)
+        self.intervalos = TablaResiduos.from_arrays(self.bundle.arreglos) if self.bundle is not None else None
+
+        # Malla precalculada (None si está desactivada o no corresponde a estos artefactos)
+        self.lattice = self._load_lattice()
+
+    def _load_joblib(self, model_dir: str) -> None:
+        """Carga el modelo, el scaler y las columnas de sus archivos joblib"""
+        rutas = [
+            os.path.join(model_dir, f'{self.tipo}_{artefacto}.joblib')
+            for artefacto in ('model', 'scaler', 'columns')
+        ]
+        # Cargar el modelo y el scaler
+        try:
+            self.model = joblib.load(rutas[0])
+            self.scaler = joblib.load(rutas[1])
+            self.columns = tuple(joblib.load(rutas[2]))
+            self.version = _hash_artefactos(rutas)
+        except (FileNotFoundError, joblib.exceptions.JoblibException) as e:
+            raise ModeloNoDisponible(f"{self.tipo}: {str(e)}")
+        self.limits = LIMITES_POR_DEFECTO
+
+    def _load_bundle(self, ruta: str) -> None:
+        """Abre el bundle del modelo (arreglos en memoria mapeada, checksums verificados)"""
+        try:
+            self.bundle = ModeloBundle(ruta)
+        except (FileNotFoundError, ValueError, KeyError) as e:
+            raise ModeloNoDisponible(f"{self.tipo}: {str(e)}")
+        # El bundle no contiene objetos de scikit-learn: se evalúa sólo con el predictor compilado
+        self.model = None
+        self.scaler = None
+        self.columns = self.bundle.columns
+        self.version = self.bundle.checksum[:12]
+        self.limits = self.bundle.limites
+
+    def _validate_numeric_input(self, feature: str, value) -> None:
+        """Valida que un valor numérico esté dentro de los límites razonables (el error lleva el valor recibido)"""
+        if feature in self.limits:
+            min_val, max_val = self.limits[feature]
+            if float(value) < min_val or float(value) > max_val:
+                raise FeatureNoValida(feature, value)
+
+    def resolve_alcaldia(self, alcaldia: str) -> str:
+        """
+        Devuelve el nombre de la alcaldía tal como lo conoce el modelo
+
+        Acepta variantes sin acentos, con otra capitalización o con errores menores de captura.
+
+        Raises:
+            AlcaldiaNoEncontrada: Si el nombre no corresponde a ninguna alcaldía (incluye sugerencias)
+        """
+        canonica = self.alcaldia_resolver.resolve(alcaldia)
+        if canonica is None:
+            raise AlcaldiaNoEncontrada(alcaldia, self.alcaldia_resolver.sugerencias(alcaldia))
+        return canonica
+
+    def intervalo(self, alcaldia: str, precio: float, nivel: float) -> Optional[Tuple[float, float]]:
+        """
+        Intervalo de predicción de un precio ya calculado, con una búsqueda en la tabla de residuos
+
+        Args:
+            alcaldia: Nombre canónico de la alcaldía
+            precio: Precio predicho
+            nivel: Nivel de confianza (ej: 0.9)
+
+        Returns:
+            Precio mínimo y máximo, o None si el modelo no tiene tabla de residuos
+        """
+        if self.intervalos is None:
+            return None
+        return self.intervalos.intervalo(self.alcaldia_index[alcaldia], precio, nivel)
+
+    def _compile_engine(self) -> Optional[Union[CompiledLinearPredictor, FlattenedForest]]:
+        """Compila el predictor (lineal o bosque aplanado) y verifica que coincida con scikit-learn"""
+        if self.bundle is not None:
+            return self._bundle_engine()
+        for motor in (CompiledLinearPredictor, FlattenedForest):
+            try:
+                engine = motor.from_sklearn(self.model, self.scaler, self.columns)
+                engine.verify(self.model, self.scaler)
+                return engine
+            except (TypeError, ValueError):
+                continue
+        # Otros modelos o columnas no compatibles usan el camino de scikit-learn
+        return None
+
+    def _bundle_engine(self) -> Union[CompiledLinearPredictor, FlattenedForest]:
+        """Construye el predictor compilado a partir de los arreglos del bundle"""
+        arreglos = self.bundle.arreglos
+        try:
+            if self.bundle.tipo_modelo == 'lineal':
+                return CompiledLinearPredictor(
+                    self.columns,
+                    arreglos['coef'],
+                    arreglos['intercept'],
+                    arreglos.get('scaler_mean'),
+                    arreglos.get('scaler_scale')
+                )
+            if self.bundle.tipo_modelo == 'bosque':
+                return FlattenedForest(
+                    self.columns,
+                    arreglos['arbol_feature'],
+                    arreglos['arbol_threshold'],
+                    arreglos['arbol_hijos'],
+                    arreglos['arbol_valor'],
+                    arreglos['arbol_raices'],
+                    arreglos.get('scaler_mean'),
+                    arreglos.get('scaler_scale')
+                )
+        except (KeyError, ValueError) as e:
+            raise ModeloNoDisponible(f"{self.tipo}: bundle no válido: {str(e)}")
+        raise ModeloNoDisponible(f"{self.tipo}: tipo de modelo no soportado: {self.bundle.tipo_modelo}")
+
+    def save_bundle(self, ruta: str, metadatos: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Guarda el modelo cargado de archivos joblib como un bundle
+
+        Returns:
+            El checksum del bundle
+        """
+        return guardar_bundle(ruta, self.tipo, self.model, self.scaler, self.columns, self.limits,
+                              metadatos, self.intervalos)
+
+    def _load_lattice(self) -> Optional[PrediccionLattice]:
+        """Abre la malla precalculada del modelo si está activada y fue generada con esta versión"""
+        settings = get_settings()
+        if not settings.lattice_activo:
+            return None
+        ruta = os.path.join(settings.lattice_dir or os.path.join(BASE_PATH, 'lattice'), self.tipo)
+        try:
+            lattice = PrediccionLattice.load(ruta)
+        except (FileNotFoundError, ValueError, KeyError) as e:
+            logger.warning(f"Malla de {self.tipo} no disponible: {str(e)}")
+            return None
+        if lattice.version != self.version or lattice.alcaldias != self.alcaldias:
+            logger.warning(f"La malla de {self.tipo} no corresponde a la versión {self.version} del modelo")
+            return None
+        return lattice
+
+    def _predict_log_sklearn(self, input_data: Dict[str, Any]) -> float:
+        """Predice el logaritmo del precio con scaler.transform + model.predict"""
+        # Verificar que la alcaldía esté en las columnas del modelo
+        if input_data['alcaldia'] not in self.alcaldia_index:
+            raise AlcaldiaNoEncontrada(input_data['alcaldia'])
+
+        # Codificar la fila (metros_cuadrados va a la columna dimensiones) y predecir
+        X = self.encoder.encode_one(
+            [float(input_data[field]) for field in INPUT_FIELDS],
+            self.alcaldia_index[input_data['alcaldia']]
+        )
+        return self.model.predict(escalar(self.scaler, X))[0]
+
+    def predict(self, input_data: Dict[str, Any]) -> float:
+        """
+        Realiza una predicción del precio de la propiedad
+
+        Args:
+            input_data: Diccionario con las características de la propiedad
+
+        Returns:
+            Precio predicho
+
+        Raises:
+            AlcaldiaNoEncontrada: Si la alcaldía no está en el modelo
+            FeatureNoValida: Si algún valor está fuera de rango
+            ModeloNoDisponible: Si hay un error con el modelo
+        """
+        try:
+            # Validar valores numéricos
+            for feature in ['recamaras', 'banos', 'estacionamientos']:
+                self._validate_numeric_input(feature, input_data[feature])
+
+            alcaldia = self.resolve_alcaldia(input_data['alcaldia'])
+
+            # Hacer predicción (el modelo devuelve el logaritmo del precio)
+            log_prediction = None
+            if self.engine is not None or self.lattice is not None:
+                alcaldia_idx = self.alcaldia_index[alcaldia]
+                valores = (
+                    float(input_data['metros_cuadrados']),
+                    float(input_data['recamaras']),
+                    float(input_data['banos']),
+                    float(input_data['estacionamientos'])
+                )
+                # La malla responde con una búsqueda; fuera de su dominio se usa el modelo
+                if self.lattice is not None:
+                    log_prediction = self.lattice.predict_log(alcaldia_idx, valores)
+                if log_prediction is None and self.engine is not None:
+                    log_prediction = self.engine.predict_log(alcaldia_idx, valores)
+            if log_prediction is None:
+                log_prediction = self._predict_log_sklearn({**input_data, 'alcaldia': alcaldia})
+
+            # Convertir de logaritmo a precio real
+            prediction = float(np.exp(log_prediction))
+            # Los campos sólo se arman si el nivel DEBUG está activo para este logger
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("prediccion", extra={
+                    'tipo': self.tipo,
+                    'alcaldia_recibida': input_data['alcaldia'],
+                    'alcaldia': alcaldia,
+                    'log_prediccion': float(log_prediction),
+                    'precio': prediction
+                })
+
+            return prediction
+
+        except AlcaldiaNoEncontrada:
+            raise
+        except FeatureNoValida:
+            raise
+        except Exception as e:
+            raise ModeloNoDisponible(f"Error en la predicción: {str(e)}")
+
+    def _predict_log_matrix(self, X_num: np.ndarray, alcaldia_idx: np.ndarray) -> np.ndarray:
+        """
+        Predice el logaritmo del precio de varias filas en una sola llamada
+
+        Args:
+            X_num: Matriz (n, 4) con dimensiones, recámaras, baños y estacionamientos
+            alcaldia_idx: Vector (n,) con el índice de la alcaldía de cada fila
+        """
+        if self.lattice is None:
+            return self._predict_log_model(X_num, alcaldia_idx)
+
+        # Las filas fuera del dominio de la malla se evalúan con el modelo
+        log_predictions = self.lattice.predict_log_batch(X_num, alcaldia_idx)
+        faltantes = np.flatnonzero(np.isnan(log_predictions))
+        if len(faltantes):
+            log_predictions[faltantes] = self._predict_log_model(X_num[faltantes], alcaldia_idx[faltantes])
+        return log_predictions
+
+    def _predict_log_model(self, X_num: np.ndarray, alcaldia_idx: np.ndarray) -> np.ndarray:
+        """Igual que `_predict_log_matrix`, pero siempre evalúa el modelo (sin la malla)"""
+        # Para lotes grandes un motor con `filas_max` cede el paso a scikit-learn si está el modelo
+        if self.engine is not None and (
+                self.model is None or self.engine.filas_max is None or X_num.shape[0] <= self.engine.filas_max):
+            return self.engine.predict_log_batch(X_num, alcaldia_idx)
+
+        # Construir la matriz completa en el orden de columnas del modelo
+        X_scaled = escalar(self.scaler, self.encoder.encode(X_num, alcaldia_idx))
+        return np.asarray(self.model.predict(X_scaled), dtype=np.float64)
+
+    def predict_curva(self, alcaldia: str, metros: np.ndarray, recamaras: Sequence[int], banos: Sequence[int],
+                      estacionamientos: int) -> np.ndarray:
+        """
+        Predice el precio de una propiedad barriendo los metros cuadrados en una sola llamada al modelo
+
+        Args:
+            alcaldia: Alcaldía de la propiedad
+            metros: Vector (m,) con los metros cuadrados de la curva
+            recamaras: Valores de recámaras a barrer
+            banos: Valores de baños a barrer
+            estacionamientos: Estacionamientos de la propiedad
+
+        Returns:
+            Matriz (len(recamaras) × len(banos), m) con el precio de cada combinación
+            (recámaras en el orden externo) a lo largo de los metros cuadrados
+
+        Raises:
+            AlcaldiaNoEncontrada: Si la alcaldía no está en el modelo
+            FeatureNoValida: Si algún valor está fuera de rango
+            ModeloNoDisponible: Si hay un error con el modelo
+        """
+        alcaldia_idx = self.alcaldia_index[self.resolve_alcaldia(alcaldia)]
+        for feature, valores in (('recamaras', recamaras), ('banos', banos), ('estacionamientos', [estacionamientos])):
+            for valor in valores:
+                self._validate_numeric_input(feature, valor)
+
+        # Matriz de diseño completa: cada combinación (recámaras, baños) recorre todos los metros cuadrados
+        m = len(metros)
+        combinaciones = np.array([(r, b) for r in recamaras for b in banos], dtype=np.float64).reshape(-1, 2)
+        X_num = np.empty((len(combinaciones) * m, len(INPUT_FIELDS)), dtype=np.float64)
+        X_num[:, 0] = np.tile(metros, len(combinaciones))
+        X_num[:, 1:3] = np.repeat(combinaciones, m, axis=0)
+        X_num[:, 3] = estacionamientos
+
+        try:
+            log_predictions = self._predict_log_matrix(X_num, np.full(X_num.shape[0], alcaldia_idx, dtype=np.intp))
+        except Exception as e:
+            raise ModeloNoDisponible(f"Error en la predicción: {str(e)}")
+        return np.exp(log_predictions).reshape(len(combinaciones), m)
+
+    def predict_alcaldias(self, input_data: Dict[str, Any]) -> np.ndarray:
+        """
+        Predice el precio de una misma propiedad en cada alcaldía del modelo
+
+        Las filas sólo difieren en el bloque one-hot de alcaldías, así que se
+        evalúan juntas en una sola llamada (para el modelo lineal, un producto
+        de la misma fila por los interceptos de todas las alcaldías).
+
+        Args:
+            input_data: Diccionario con las características de la propiedad (sin alcaldía)
+
+        Returns:
+            Vector con el precio en cada alcaldía, en el orden de `self.alcaldias`
+
+        Raises:
+            FeatureNoValida: Si algún valor está fuera de rango
+            ModeloNoDisponible: Si hay un error con el modelo
+        """
+        for feature in ['recamaras', 'banos', 'estacionamientos']:
+            self._validate_numeric_input(feature, input_data[feature])
+
+        n = len(self.alcaldias)
+        X_num = np.repeat(self.encoder.numeric([input_data]), n, axis=0)
+        try:
+            log_predictions = self._predict_log_matrix(X_num, np.arange(n, dtype=np.intp))
+        except Exception as e:
+            raise ModeloNoDisponible(f"Error en la predicción: {str(e)}")
+        return np.exp(log_predictions)
+
+    def validate_batch(self, X_num: np.ndarray, alcaldias: Sequence[str]) -> Tuple[np.ndarray, List[Optional[DomainException]]]:
+        """
+        Valida un lote columna por columna
+
+        Args:
+            X_num: Matriz (n, 4) con metros cuadrados, recámaras, baños y estacionamientos
+            alcaldias: Alcaldía de cada fila
+
+        Returns:
+            Índice de alcaldía de cada fila (-1 si no es válida) y el error de cada fila (None si es válida)
+        """
+        n = X_num.shape[0]
+        errores: List[Optional[DomainException]] = [None] * n
+        invalidas = np.zeros(n, dtype=bool)
+
+        # Valores faltantes, no numéricos o superficies no positivas (cuando no pasaron por pydantic)
+        for j, feature in enumerate(INPUT_FIELDS):
+            columna = X_num[:, j]
+            no_validos = (~np.isfinite(columna) | (columna <= 0 if j == 0 else columna < 0)) & ~invalidas
+            for i in np.flatnonzero(no_validos):
+                errores[i] = FeatureNoValida(feature, columna[i])
+            invalidas |= no_validos
+
+        # Validar cada columna numérica con una sola comparación vectorizada
+        for j, feature in enumerate(INPUT_FIELDS):
+            if feature not in self.limits:
+                continue
+            min_val, max_val = self.limits[feature]
+            columna = X_num[:, j]
+            fuera_de_rango = ((columna < min_val) | (columna > max_val)) & ~invalidas
+            for i in np.flatnonzero(fuera_de_rango):
+                # La matriz es de floats: un entero se reporta como se recibió (9, no 9.0), igual que en `predict`
+                valor = float(columna[i])
+                errores[i] = FeatureNoValida(feature, int(valor) if valor.is_integer() else valor)
+            invalidas |= fuera_de_rango
+
+        # Resolver la alcaldía de cada fila (una sola vez por nombre distinto)
+        resueltas = {}
+        for alcaldia in set(alcaldias):
+            canonica = self.alcaldia_resolver.resolve(alcaldia) if isinstance(alcaldia, str) else None
+            resueltas[alcaldia] = self.alcaldia_index[canonica] if canonica is not None else -1
+        alcaldia_idx = np.fromiter((resueltas[a] for a in alcaldias), dtype=np.intp, count=n)
+        for i in np.flatnonzero((alcaldia_idx < 0) & ~invalidas):
+            alcaldia = alcaldias[i]
+            sugerencias = self.alcaldia_resolver.sugerencias(alcaldia) if isinstance(alcaldia, str) else []
+            errores[i] = AlcaldiaNoEncontrada(alcaldia, sugerencias)
+        alcaldia_idx[invalidas] = -1
+
+        return alcaldia_idx, errores
+
+    def predict_batch(self, rows: Sequence[Dict[str, Any]]) -> Tuple[np.ndarray, List[Optional[DomainException]]]:
+        """
+        Realiza la predicción de un lote de propiedades en una sola llamada al modelo
+
+        Args:
+            rows: Lista de diccionarios con las características de cada propiedad
+
+        Returns:
+            Precios predichos (NaN en las filas con error) y el error de cada fila (None si es válida)
+
+        Raises:
+            ModeloNoDisponible: Si hay un error con el modelo
+        """
+        X_num = self.encoder.numeric(rows)
+        alcaldias = [row['alcaldia'] for row in rows]
+        return self.predict_matrix(X_num, alcaldias)
+
+    def predict_matrix(self, X_num: np.ndarray, alcaldias: Sequence[str]) -> Tuple[np.ndarray, List[Optional[DomainException]]]:
+        """
+        Igual que `predict_batch`, pero recibe las características numéricas ya en columnas
+
+        Args:
+            X_num: Matriz (n, 4) con metros cuadrados, recámaras, baños y estacionamientos
+            alcaldias: Alcaldía de cada fila
+        """
+        alcaldia_idx, errores = self.validate_batch(X_num, alcaldias)
+        precios = np.full(X_num.shape[0], np.nan)
+        validas = np.flatnonzero(alcaldia_idx >= 0)
+        if len(validas) == 0:
+            return precios, errores
+
+        try:
+            log_predictions = self._predict_log_matrix(X_num[validas], alcaldia_idx[validas])
+        except Exception as e:
+            raise ModeloNoDisponible(f"Error en la predicción: {str(e)}")
+        precios[validas] = np.exp(log_predictions)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("prediccion_lote", extra={
+                'tipo': self.tipo,
+                'filas': int(X_num.shape[0]),
+                'validas': int(len(validas))
+            })
+        return precios, errores
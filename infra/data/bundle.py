@@ -0,0 +1,155 @@
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+import numpy as np
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
+from infra.inference.forest import FlattenedForest
+from infra.inference.intervals import TablaResiduos
+
+
+# Versión del formato del bundle; se incrementa cuando cambia la estructura del manifiesto
+FORMATO_BUNDLE = 1
+
+MANIFIESTO = 'manifest.json'
+
+
+def ruta_bundle(model_dir: str, tipo: str) -> str:
+    """Ruta del bundle de un tipo de propiedad dentro de un directorio de modelos"""
+    return os.path.join(model_dir, f'{tipo}.bundle')
+
+
+def _sha256(ruta: str) -> str:
+    sha = hashlib.sha256()
+    with open(ruta, 'rb') as f:
+        for bloque in iter(lambda: f.read(1 << 20), b''):
+            sha.update(bloque)
+    return sha.hexdigest()
+
+
+def _checksum(manifiesto: Dict[str, Any]) -> str:
+    """Checksum del manifiesto (que incluye el sha256 de cada arreglo), sin el propio checksum"""
+    contenido = {k: v for k, v in manifiesto.items() if k != 'checksum'}
+    return hashlib.sha256(json.dumps(contenido, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def _arreglos_modelo(model, scaler, columns: Sequence[str]) -> Tuple[str, Dict[str, np.ndarray]]:
+    """
+    Extrae los arreglos numéricos del modelo y del escalador
+
+    Raises:
+        TypeError: Si el tipo de modelo no se puede guardar en un bundle
+    """
+    arreglos: Dict[str, np.ndarray] = {}
+    if scaler is not None:
+        arreglos['scaler_mean'] = np.asarray(scaler.mean_, dtype=np.float64)
+        arreglos['scaler_scale'] = np.asarray(scaler.scale_, dtype=np.float64)
+
+    coef = getattr(model, 'coef_', None)
+    intercept = getattr(model, 'intercept_', None)
+    if coef is not None and intercept is not None and np.ndim(coef) == 1:
+        arreglos['coef'] = np.asarray(coef, dtype=np.float64)
+        arreglos['intercept'] = np.atleast_1d(np.asarray(intercept, dtype=np.float64))
+        return 'lineal', arreglos
+
+    # Bosques y árboles de regresión se guardan ya aplanados
+    try:
+        arreglos.update(FlattenedForest.from_sklearn(model, None, columns).arrays())
+    except (TypeError, ValueError):
+        raise TypeError(f"Tipo de modelo no soportado en un bundle: {type(model).__name__}")
+    return 'bosque', arreglos
+
+
+def guardar_bundle(ruta: str, tipo: str, model, scaler, columns: Sequence[str],
+                   limites: Mapping[str, Tuple[float, float]],
+                   metadatos: Optional[Dict[str, Any]] = None,
+                   intervalos: Optional[TablaResiduos] = None) -> str:
+    """
+    Guarda un modelo, su escalador, el orden de columnas, los límites de validación
+    y (opcionalmente) la tabla de residuos para intervalos de predicción en un bundle
+
+    Los arreglos se guardan como .npy (para abrirlos en memoria mapeada) y el
+    manifiesto registra el sha256 de cada uno. El bundle se escribe en un
+    directorio temporal que se renombra completo al final.
+
+    Returns:
+        El checksum del bundle
+    """
+    tipo_modelo, arreglos = _arreglos_modelo(model, scaler, columns)
+    if intervalos is not None:
+        arreglos.update(intervalos.arrays())
+    padre = os.path.dirname(os.path.abspath(ruta))
+    os.makedirs(padre, exist_ok=True)
+    temporal = tempfile.mkdtemp(prefix='.bundle-', dir=padre)
+
+    manifiesto: Dict[str, Any] = {
+        'formato': FORMATO_BUNDLE,
+        'tipo': tipo,
+        'tipo_modelo': tipo_modelo,
+        'columnas': list(columns),
+        'limites': {feature: list(rango) for feature, rango in limites.items()},
+        'metadatos': {'fecha_creacion': datetime.now().isoformat(), **(metadatos or {})},
+        'arreglos': {}
+    }
+    for nombre, arreglo in arreglos.items():
+        archivo = f'{nombre}.npy'
+        np.save(os.path.join(temporal, archivo), np.ascontiguousarray(arreglo))
+        manifiesto['arreglos'][nombre] = {
+            'archivo': archivo,
+            'dtype': str(arreglo.dtype),
+            'forma': list(arreglo.shape),
+            'sha256': _sha256(os.path.join(temporal, archivo))
+        }
+    manifiesto['checksum'] = _checksum(manifiesto)
+    with open(os.path.join(temporal, MANIFIESTO), 'w', encoding='utf-8') as f:
+        json.dump(manifiesto, f, ensure_ascii=False, indent=2)
+
+    if os.path.isdir(ruta):
+        shutil.rmtree(ruta)
+    os.rename(temporal, ruta)
+    return manifiesto['checksum']
+
+
+class ModeloBundle:
+    """
+    Bundle de un modelo abierto en modo de solo lectura.
+
+    Los arreglos se abren con `mmap_mode='r'`: no se copian a la memoria del
+    proceso, y todos los workers que abren el mismo bundle comparten las
+    páginas del archivo.
+    """
+
+    def __init__(self, ruta: str, verificar: bool = True):
+        """
+        Raises:
+            FileNotFoundError: Si el bundle no existe
+            ValueError: Si el formato no es compatible o algún checksum no coincide
+        """
+        self.ruta = ruta
+        with open(os.path.join(ruta, MANIFIESTO), encoding='utf-8') as f:
+            manifiesto = json.load(f)
+        if manifiesto.get('formato') != FORMATO_BUNDLE:
+            raise ValueError(f"Formato de bundle no soportado: {manifiesto.get('formato')}")
+        if manifiesto.get('checksum') != _checksum(manifiesto):
+            raise ValueError(f"El manifiesto de {ruta} no coincide con su checksum")
+
+        self.tipo: str = manifiesto['tipo']
+        self.tipo_modelo: str = manifiesto['tipo_modelo']
+        self.columns = tuple(manifiesto['columnas'])
+        self.limites = MappingProxyType({f: tuple(rango) for f, rango in manifiesto['limites'].items()})
+        self.metadatos = MappingProxyType(manifiesto['metadatos'])
+        self.checksum: str = manifiesto['checksum']
+
+        arreglos = {}
+        for nombre, info in manifiesto['arreglos'].items():
+            archivo = os.path.join(ruta, info['archivo'])
+            if verificar and _sha256(archivo) != info['sha256']:
+                raise ValueError(f"El arreglo {nombre} de {ruta} no coincide con su checksum")
+            arreglo = np.load(archivo, mmap_mode='r')
+            if list(arreglo.shape) != info['forma'] or str(arreglo.dtype) != info['dtype']:
+                raise ValueError(f"El arreglo {nombre} de {ruta} no tiene la forma o el tipo esperados")
+            arreglos[nombre] = arreglo
+        self.arreglos = MappingProxyType(arreglos)
@@ -0,0 +1,185 @@
+import logging
+import threading
+import time
+import numpy as np
+from typing import Callable, Dict, List, Optional, Tuple, Type
+from domain.models import ModeloInfo
+from domain.exceptions import ModeloNoDisponible
+from infra.config import get_settings
+from infra.data.base_repo import ModeloRepository
+from infra.data.casas_repo import CasasRepository
+from infra.data.deptos_repo import DepartamentosRepository
+from infra.data.model_store import directorio_candidato, directorio_modelo
+
+logger = logging.getLogger(__name__)
+
+# Propiedad de referencia con la que se valida un modelo antes de servirlo
+PROPIEDAD_VALIDACION = {'metros_cuadrados': 120.0, 'recamaras': 3, 'banos': 2, 'estacionamientos': 1}
+
+
+def validar_modelo(repo: ModeloRepository) -> None:
+    """
+    Hace predicciones de prueba (una por alcaldía) con un modelo recién cargado
+
+    Raises:
+        ModeloNoDisponible: Si alguna predicción falla o no es un precio positivo y finito
+    """
+    if not repo.alcaldias:
+        raise ModeloNoDisponible(f"{repo.tipo}: el modelo no tiene alcaldías")
+    filas = [{**PROPIEDAD_VALIDACION, 'alcaldia': alcaldia} for alcaldia in repo.alcaldias]
+    precios, errores = repo.predict_batch(filas)
+    for fila, precio, error in zip(filas, precios, errores):
+        if error is not None or not np.isfinite(precio) or precio <= 0:
+            raise ModeloNoDisponible(
+                f"{repo.tipo}: la validación falló para {fila['alcaldia']} ({error or precio})"
+            )
+
+
+class ModelRegistry:
+    """
+    Registro de modelos compartido por todo el proceso.
+
+    Carga los artefactos de cada tipo de propiedad una sola vez y entrega la
+    misma instancia (de solo lectura) a todas las peticiones. Una recarga
+    construye la nueva instancia aparte y sólo reemplaza la referencia al
+    final, así que las peticiones en curso terminan con la versión anterior.
+    """
+
+    def __init__(self, repositorios: Optional[Dict[str, Type[ModeloRepository]]] = None,
+                 modelos_dir: Optional[str] = None):
+        self._repositorios = repositorios or {
+            'casas': CasasRepository,
+            'departamentos': DepartamentosRepository
+        }
+        self.modelos_dir = modelos_dir
+        self._modelos: Dict[str, ModeloRepository] = {}
+        # Versión publicada (modelos/<tipo>/ACTUAL) de cada modelo cargado
+        self._versiones: Dict[str, Optional[str]] = {}
+        self._lock = threading.Lock()
+        self._carga_lock = threading.Lock()
+        self._suscriptores: List[Callable[[str, ModeloRepository], None]] = []
+
+    @property
+    def tipos(self) -> List[str]:
+        """Tipos de propiedad que el registro sabe cargar"""
+        return list(self._repositorios.keys())
+
+    def version_cargada(self, tipo: str) -> Optional[str]:
+        """Versión publicada del modelo cargado (None si se cargó de la raíz del proyecto)"""
+        return self._versiones.get(tipo)
+
+    def load(self, tipo: str, validar: bool = False) -> ModeloRepository:
+        """
+        Carga (o vuelve a cargar) los artefactos de un tipo de propiedad
+
+        Args:
+            tipo: Tipo de propiedad
+            validar: Hacer predicciones de prueba antes de servir el modelo
+
+        Raises:
+            ModeloNoDisponible: Si el tipo no existe, no se pueden cargar los artefactos o falla la validación
+        """
+        if tipo not in self._repositorios:
+            raise ModeloNoDisponible(f"tipo de propiedad desconocido: {tipo}")
+        inicio = time.perf_counter()
+        model_dir, version = directorio_modelo(tipo, self.modelos_dir or get_settings().modelos_dir)
+        repo = self._repositorios[tipo](model_dir)
+        if validar:
+            validar_modelo(repo)
+        with self._lock:
+            anterior = self._versiones.get(tipo)
+            self._modelos[tipo] = repo
+            self._versiones[tipo] = version
+        logger.info("modelo_cargado", extra={
+            'tipo': tipo,
+            'version': version,
+            'version_anterior': anterior,
+            'artefactos': repo.version,
+            'tiempo_ms': round((time.perf_counter() - inicio) * 1000, 3)
+        })
+        for suscriptor in list(self._suscriptores):
+            suscriptor(tipo, repo)
+        return repo
+
+    def load_candidate(self, tipo: str) -> Optional[Tuple[ModeloRepository, str]]:
+        """
+        Carga y valida la versión candidata de un tipo de propiedad, sin servirla
+
+        Returns:
+            El repositorio candidato y su versión, o None si no hay candidata
+
+        Raises:
+            ModeloNoDisponible: Si no se pueden cargar los artefactos o falla la validación
+        """
+        if tipo not in self._repositorios:
+            raise ModeloNoDisponible(f"tipo de propiedad desconocido: {tipo}")
+        candidato = directorio_candidato(tipo, self.modelos_dir or get_settings().modelos_dir)
+        if candidato is None:
+            return None
+        model_dir, version = candidato
+        repo = self._repositorios[tipo](model_dir)
+        validar_modelo(repo)
+        logger.info("candidato_cargado", extra={'tipo': tipo, 'version': version, 'artefactos': repo.version})
+        return repo, version
+
+    def subscribe(self, callback: Callable[[str, ModeloRepository], None]) -> None:
+        """Registra una función que se llama con (tipo, repositorio) cada vez que se carga un modelo"""
+        self._suscriptores.append(callback)
+
+    def load_all(self) -> None:
+        """Carga los modelos de todos los tipos de propiedad"""
+        for tipo in self._repositorios:
+            self.load(tipo)
+
+    def load_missing(self) -> None:
+        """
+        Carga sólo los modelos que aún no están en el registro
+
+        En un worker creado con fork los modelos heredados del proceso padre
+        ya están cargados y se comparten copy-on-write; volver a cargarlos
+        duplicaría la memoria.
+        """
+        for tipo in self._repositorios:
+            if tipo not in self._modelos:
+                self.get(tipo)
+
+    def get(self, tipo: str) -> ModeloRepository:
+        """
+        Obtiene el modelo cargado de un tipo de propiedad, cargándolo si hace falta
+
+        Raises:
+            ModeloNoDisponible: Si no se pueden cargar los artefactos
+        """
+        repo = self._modelos.get(tipo)
+        if repo is not None:
+            return repo
+        # Sólo un hilo carga los artefactos; los demás esperan y reutilizan la instancia
+        with self._carga_lock:
+            repo = self._modelos.get(tipo)
+            if repo is None:
+                repo = self.load(tipo)
+        return repo
+
+    def info(self) -> List[ModeloInfo]:
+        """Devuelve la versión y el tiempo de carga de los modelos cargados"""
+        return [
+            ModeloInfo(
+                tipo_propiedad=tipo,
+                version=repo.version,
+                tiempo_carga_ms=round(repo.tiempo_carga_ms, 3),
+                fecha_carga=repo.fecha_carga,
+                alcaldias=len(repo.alcaldias),
+                version_publicada=self._versiones.get(tipo),
+                lattice_error_relativo=repo.lattice.error_maximo.get('relativo') if repo.lattice is not None else None
+            )
+            for tipo, repo in list(self._modelos.items())
+        ]
+
+
+# Instancia única compartida por todo el proceso
+_registry = ModelRegistry()
+
+
+def get_model_registry() -> ModelRegistry:
+    """Devuelve el registro de modelos del proceso"""
+    return _registry
@@ -0,0 +1,113 @@
+import os
+import tempfile
+from datetime import datetime
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
+from infra.data.base_repo import BASE_PATH, LIMITES_POR_DEFECTO
+from infra.data.bundle import guardar_bundle, ruta_bundle
+from infra.inference.intervals import TablaResiduos
+
+
+# Directorio por defecto de los modelos versionados: modelos/<tipo>/<version>/
+MODELOS_DIR = os.path.join(BASE_PATH, 'modelos')
+
+# Archivo (dentro de modelos/<tipo>/) con el nombre de la versión que se debe servir
+ARCHIVO_ACTUAL = 'ACTUAL'
+
+# Archivo con el nombre de la versión candidata que se evalúa en modo sombra
+ARCHIVO_CANDIDATO = 'CANDIDATO'
+
+
+def _leer_version(tipo: str, archivo: str, raiz: Optional[str]) -> Optional[str]:
+    try:
+        with open(os.path.join(raiz or MODELOS_DIR, tipo, archivo), encoding='utf-8') as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def _escribir_version(tipo: str, archivo: str, version: str, raiz: Optional[str]) -> None:
+    """Reemplaza atómicamente el archivo que apunta a una versión"""
+    ruta = os.path.join(raiz or MODELOS_DIR, tipo, archivo)
+    with open(f'{ruta}.tmp', 'w', encoding='utf-8') as f:
+        f.write(version)
+    os.replace(f'{ruta}.tmp', ruta)
+
+
+def version_publicada(tipo: str, raiz: Optional[str] = None) -> Optional[str]:
+    """Devuelve la versión publicada de un tipo de propiedad, o None si no hay modelos versionados"""
+    return _leer_version(tipo, ARCHIVO_ACTUAL, raiz)
+
+
+def version_candidata(tipo: str, raiz: Optional[str] = None) -> Optional[str]:
+    """Devuelve la versión candidata de un tipo de propiedad, o None si no hay candidata"""
+    return _leer_version(tipo, ARCHIVO_CANDIDATO, raiz)
+
+
+def directorio_candidato(tipo: str, raiz: Optional[str] = None) -> Optional[Tuple[str, str]]:
+    """Directorio y versión del modelo candidato, o None si no hay candidato"""
+    version = version_candidata(tipo, raiz)
+    if version is None:
+        return None
+    return os.path.join(raiz or MODELOS_DIR, tipo, version), version
+
+
+def retirar_candidato(tipo: str, raiz: Optional[str] = None) -> None:
+    """Deja de evaluar en modo sombra la versión candidata (la versión se conserva en disco)"""
+    try:
+        os.remove(os.path.join(raiz or MODELOS_DIR, tipo, ARCHIVO_CANDIDATO))
+    except FileNotFoundError:
+        pass
+
+
+def directorio_modelo(tipo: str, raiz: Optional[str] = None) -> Tuple[str, Optional[str]]:
+    """
+    Resuelve el directorio de los artefactos que se deben cargar
+
+    Returns:
+        El directorio y la versión publicada; sin modelos versionados se usan
+        los artefactos de la raíz del proyecto y la versión es None
+    """
+    version = version_publicada(tipo, raiz)
+    if version is None:
+        return BASE_PATH, None
+    return os.path.join(raiz or MODELOS_DIR, tipo, version), version
+
+
+def publicar_version(tipo: str, model, scaler, columns: Sequence[str], version: Optional[str] = None,
+                     raiz: Optional[str] = None, limites: Mapping[str, Tuple[float, float]] = LIMITES_POR_DEFECTO,
+                     metadatos: Optional[Dict[str, Any]] = None,
+                     intervalos: Optional[TablaResiduos] = None, candidato: bool = False) -> str:
+    """
+    Guarda un modelo como bundle en una nueva versión y la publica
+
+    El bundle se escribe en un directorio temporal que se renombra completo,
+    y después se reemplaza el archivo ACTUAL; un proceso que lea ACTUAL nunca
+    ve una versión a medias. Con `candidato=True` se reemplaza CANDIDATO en su
+    lugar: la versión se evalúa en modo sombra sin servirse.
+
+    Args:
+        tipo: Tipo de propiedad (ej: 'casas')
+        model: Modelo entrenado
+        scaler: Escalador ajustado
+        columns: Orden de las columnas del modelo
+        version: Nombre de la versión (por defecto la fecha y hora actual)
+        raiz: Directorio de los modelos versionados
+        limites: Límites de validación de las características
+        metadatos: Información del entrenamiento (ej: R², número de filas)
+        intervalos: Cuantiles de residuos por alcaldía para los intervalos de predicción
+        candidato: Registrar la versión como candidata en lugar de publicarla
+
+    Returns:
+        El nombre de la versión publicada
+    """
+    directorio_tipo = os.path.join(raiz or MODELOS_DIR, tipo)
+    os.makedirs(directorio_tipo, exist_ok=True)
+    version = version or datetime.now().strftime('%Y%m%d-%H%M%S')
+
+    temporal = tempfile.mkdtemp(prefix=f'.{version}-', dir=directorio_tipo)
+    guardar_bundle(ruta_bundle(temporal, tipo), tipo, model, scaler, columns, limites,
+                   {'version': version, **(metadatos or {})}, intervalos)
+    os.rename(temporal, os.path.join(directorio_tipo, version))
+
+    _escribir_version(tipo, ARCHIVO_CANDIDATO if candidato else ARCHIVO_ACTUAL, version, raiz)
+    return version
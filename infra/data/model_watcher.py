@@ -0,0 +1,97 @@
+import logging
+import threading
+from typing import Dict, List, Optional, Set
+from domain.exceptions import ModeloNoDisponible
+from infra.config import get_settings
+from infra.data.model_registry import ModelRegistry, get_model_registry
+from infra.data.model_store import version_publicada
+from infra.data.shadow import actualizar_shadow_scorers
+
+logger = logging.getLogger(__name__)
+
+
+class ModelWatcher:
+    """
+    Revisa periódicamente si se publicó una versión nueva de algún modelo.
+
+    La versión nueva se carga y se valida en este hilo, fuera del camino de
+    las peticiones; si la validación falla se sigue sirviendo la versión
+    anterior y la versión rechazada no se vuelve a intentar. En la misma
+    revisión se sincronizan los evaluadores en modo sombra con la versión
+    candidata publicada.
+    """
+
+    def __init__(self, registry: ModelRegistry, intervalo_segundos: float = 30,
+                 modelos_dir: Optional[str] = None):
+        self.registry = registry
+        self.intervalo = intervalo_segundos
+        self.modelos_dir = modelos_dir
+        self._rechazadas: Dict[str, Set[str]] = {}
+        self._detener = threading.Event()
+        self._hilo: Optional[threading.Thread] = None
+
+    def revisar(self) -> List[str]:
+        """
+        Recarga los tipos de propiedad con una versión publicada distinta a la cargada
+
+        Returns:
+            Los tipos de propiedad que se recargaron
+        """
+        recargados = []
+        for tipo in self.registry.tipos:
+            version = version_publicada(tipo, self.modelos_dir or self.registry.modelos_dir)
+            if version is None or version == self.registry.version_cargada(tipo):
+                continue
+            if version in self._rechazadas.get(tipo, ()):
+                continue
+            try:
+                self.registry.load(tipo, validar=True)
+                recargados.append(tipo)
+            except ModeloNoDisponible as e:
+                self._rechazadas.setdefault(tipo, set()).add(version)
+                logger.error("modelo_rechazado", extra={'tipo': tipo, 'version': version, 'error': str(e)})
+        # Después de recargar: un candidato recién promovido a ACTUAL deja de evaluarse en modo sombra
+        actualizar_shadow_scorers(self.registry, self.modelos_dir)
+        return recargados
+
+    def _ejecutar(self) -> None:
+        while not self._detener.wait(self.intervalo):
+            try:
+                self.revisar()
+            except Exception:
+                # El hilo no debe morir por un error inesperado; se reintenta en el siguiente ciclo
+                logger.exception("error_revisando_modelos")
+
+    def start(self) -> None:
+        """Inicia el hilo que revisa las versiones publicadas"""
+        if self._hilo is None:
+            self._hilo = threading.Thread(target=self._ejecutar, name='model-watcher', daemon=True)
+            self._hilo.start()
+
+    def stop(self) -> None:
+        """Detiene el hilo que revisa las versiones publicadas"""
+        self._detener.set()
+        if self._hilo is not None:
+            self._hilo.join(timeout=5)
+            self._hilo = None
+
+
+_watcher: Optional[ModelWatcher] = None
+
+
+def start_model_watcher() -> Optional[ModelWatcher]:
+    """Inicia el watcher de modelos del proceso (None si la recarga está desactivada)"""
+    global _watcher
+    settings = get_settings()
+    if _watcher is None and settings.modelos_recarga_segundos > 0:
+        _watcher = ModelWatcher(get_model_registry(), settings.modelos_recarga_segundos, settings.modelos_dir)
+        _watcher.start()
+    return _watcher
+
+
+def stop_model_watcher() -> None:
+    """Detiene el watcher de modelos del proceso"""
+    global _watcher
+    if _watcher is not None:
+        _watcher.stop()
+        _watcher = None
@@ -0,0 +1,215 @@
+import logging
+import queue
+import random
+import threading
+from typing import Any, Dict, List, Optional, Set, Tuple
+from domain.exceptions import ModeloNoDisponible
+from domain.models import ShadowInfo
+from infra.config import get_settings
+from infra.data.base_repo import ModeloRepository
+from infra.data.model_registry import ModelRegistry, get_model_registry
+from infra.data.model_store import version_candidata
+from infra.metrics import Counter, RunningStats
+
+logger = logging.getLogger(__name__)
+
+
+class ShadowScorer:
+    """
+    Evalúa en segundo plano un modelo candidato con una muestra del tráfico real.
+
+    El camino de la petición sólo sortea la muestra y encola la entrada junto
+    con el precio del modelo primario (`put_nowait`): nunca espera al
+    candidato. Si la cola está llena la muestra se descarta en lugar de
+    acumular trabajo. Un hilo aparte vacía la cola por lotes, evalúa el
+    candidato con una sola llamada por lote y acumula estadísticas en
+    streaming del precio candidato y de su diferencia con el primario.
+    """
+
+    def __init__(self, tipo: str, candidato: ModeloRepository, version: str,
+                 muestreo: float = 0.1, max_cola: int = 1000, max_lote: int = 64):
+        self.tipo = tipo
+        self.candidato = candidato
+        self.version = version
+        self.muestreo = muestreo
+        self.max_lote = max_lote
+        self._cola: queue.Queue = queue.Queue(maxsize=max_cola)
+        self._detener = threading.Event()
+        self._hilo: Optional[threading.Thread] = None
+
+        self._enviadas = Counter()
+        self._descartadas = Counter()
+        self._evaluadas = Counter()
+        self._errores = Counter()
+        self._precio = RunningStats()
+        # Diferencia del candidato contra el primario: absoluta y relativa al precio primario
+        self._diferencia = RunningStats()
+        self._diferencia_relativa = RunningStats()
+
+    def enviar(self, model_input: Dict[str, Any], precio_primario: float) -> bool:
+        """
+        Encola (si sale en la muestra) una predicción ya respondida con el modelo primario
+
+        Returns:
+            True si la predicción se encoló para evaluarla con el candidato
+        """
+        if self.muestreo < 1.0 and random.random() >= self.muestreo:
+            return False
+        try:
+            self._cola.put_nowait((model_input, precio_primario))
+        except queue.Full:
+            self._descartadas.inc()
+            return False
+        self._enviadas.inc()
+        return True
+
+    def _siguiente_lote(self) -> List[Tuple[Dict[str, Any], float]]:
+        """Espera la primera entrada y toma las que ya estén en la cola, hasta `max_lote`"""
+        try:
+            lote = [self._cola.get(timeout=0.5)]
+        except queue.Empty:
+            return []
+        while len(lote) < self.max_lote:
+            try:
+                lote.append(self._cola.get_nowait())
+            except queue.Empty:
+                break
+        return lote
+
+    def evaluar(self, lote: List[Tuple[Dict[str, Any], float]]) -> None:
+        """Evalúa un lote con el candidato y acumula las diferencias con el primario"""
+        try:
+            precios, errores = self.candidato.predict_batch([model_input for model_input, _ in lote])
+        except Exception:
+            self._errores.inc(len(lote))
+            logger.exception("error_shadow", extra={'tipo': self.tipo, 'version': self.version})
+            return
+        for (_, primario), precio, error in zip(lote, precios, errores):
+            if error is not None:
+                self._errores.inc()
+                continue
+            precio = float(precio)
+            self._precio.observe(precio)
+            self._diferencia.observe(precio - primario)
+            self._diferencia_relativa.observe((precio - primario) / primario)
+        self._evaluadas.inc(len(lote))
+
+    def _ejecutar(self) -> None:
+        while not self._detener.is_set():
+            lote = self._siguiente_lote()
+            if lote:
+                self.evaluar(lote)
+
+    def start(self) -> None:
+        """Inicia el hilo que evalúa el candidato"""
+        if self._hilo is None:
+            self._hilo = threading.Thread(target=self._ejecutar, name=f'shadow-{self.tipo}', daemon=True)
+            self._hilo.start()
+
+    def stop(self) -> None:
+        """Detiene el hilo que evalúa el candidato (las entradas pendientes se descartan)"""
+        self._detener.set()
+        if self._hilo is not None:
+            self._hilo.join(timeout=5)
+            self._hilo = None
+
+    def info(self) -> ShadowInfo:
+        """Estadísticas acumuladas del candidato"""
+        return ShadowInfo(
+            tipo_propiedad=self.tipo,
+            version_candidata=self.version,
+            artefactos=self.candidato.version,
+            muestreo=self.muestreo,
+            enviadas=self._enviadas.valor,
+            evaluadas=self._evaluadas.valor,
+            descartadas=self._descartadas.valor,
+            errores=self._errores.valor,
+            pendientes=self._cola.qsize(),
+            precio_candidato=self._precio.snapshot(),
+            diferencia=self._diferencia.snapshot(),
+            diferencia_relativa=self._diferencia_relativa.snapshot()
+        )
+
+
+_scorers: Dict[str, ShadowScorer] = {}
+# Versiones candidatas que no pasaron la validación; no se vuelven a intentar
+_rechazados: Dict[str, Set[str]] = {}
+_lock = threading.Lock()
+
+
+def get_shadow_scorer(tipo: str) -> Optional[ShadowScorer]:
+    """Devuelve el evaluador en modo sombra de un tipo de propiedad (None si no hay candidato)"""
+    return _scorers.get(tipo)
+
+
+def _detener_scorer(tipo: str, motivo: str) -> None:
+    scorer = _scorers.pop(tipo, None)
+    if scorer is not None:
+        scorer.stop()
+        logger.info("shadow_detenido", extra={'tipo': tipo, 'version': scorer.version, 'motivo': motivo})
+
+
+def _actualizar_scorer(tipo: str, registry: ModelRegistry, modelos_dir: Optional[str]) -> None:
+    version = version_candidata(tipo, modelos_dir or registry.modelos_dir or get_settings().modelos_dir)
+    if version is None:
+        _detener_scorer(tipo, 'candidato_retirado')
+        return
+    # Un candidato promovido a ACTUAL ya es el modelo primario: compararlo consigo mismo no aporta nada
+    if version == registry.version_cargada(tipo):
+        _detener_scorer(tipo, 'candidato_promovido')
+        return
+    anterior = _scorers.get(tipo)
+    if anterior is not None and anterior.version == version:
+        return
+    if version in _rechazados.get(tipo, ()):
+        return
+    # El evaluador anterior corresponde a un candidato que ya no está publicado
+    _detener_scorer(tipo, 'candidato_reemplazado')
+    try:
+        candidato = registry.load_candidate(tipo)
+    except ModeloNoDisponible as e:
+        _rechazados.setdefault(tipo, set()).add(version)
+        logger.error("candidato_rechazado", extra={'tipo': tipo, 'version': version, 'error': str(e)})
+        return
+    if candidato is None:
+        return
+    settings = get_settings()
+    scorer = ShadowScorer(tipo, *candidato, settings.shadow_muestreo, settings.shadow_max_cola)
+    scorer.start()
+    _scorers[tipo] = scorer
+
+
+def actualizar_shadow_scorers(registry: Optional[ModelRegistry] = None,
+                              modelos_dir: Optional[str] = None) -> Dict[str, ShadowScorer]:
+    """
+    Sincroniza los evaluadores en modo sombra con modelos/<tipo>/CANDIDATO
+
+    Un candidato nuevo reemplaza al evaluador anterior; si se retira el
+    candidato o su versión es la que ya se sirve (se promovió a ACTUAL) se
+    deja de evaluar en modo sombra. El watcher de modelos la llama en cada
+    revisión.
+    """
+    if get_settings().shadow_muestreo <= 0:
+        return _scorers
+    registry = registry or get_model_registry()
+    with _lock:
+        for tipo in registry.tipos:
+            _actualizar_scorer(tipo, registry, modelos_dir)
+    return _scorers
+
+
+def start_shadow_scorers() -> Dict[str, ShadowScorer]:
+    """Carga los modelos candidatos publicados e inicia sus evaluadores en modo sombra"""
+    return actualizar_shadow_scorers()
+
+
+def stop_shadow_scorers() -> None:
+    """Detiene los evaluadores en modo sombra del proceso"""
+    with _lock:
+        for tipo in list(_scorers):
+            _scorers.pop(tipo).stop()
+
+
+def shadow_info() -> List[ShadowInfo]:
+    """Estadísticas de los evaluadores en modo sombra activos"""
+    return [scorer.info() for scorer in list(_scorers.values())]
\ No newline at end of file
@@ -0,0 +1,278 @@
+import time
+import logging
+import threading
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from domain.exceptions import CampoNoValido, ErrorEstadisticas
+from domain.models import (
+    PreciosAlcaldiaResponse,
+    PrecioM2AlcaldiaResponse,
+    MaterializacionInfo,
+    ResumenEstadisticas,
+    ResumenTipo,
+    SnapshotInfo,
+    StatsDebugInfo
+)
+from infra.data.stats_repo import StatsRepository
+from infra.data.stats_snapshot import DatasetSnapshot, StatsSnapshots, get_stats_snapshots
+
+logger = logging.getLogger(__name__)
+
+
+# Estadística -> (tipos de propiedad de los que depende, cálculo con un repositorio fijo a esos snapshots).
+# Los métodos se buscan en el repositorio al calcular (no al importar el módulo).
+ESTADISTICAS = MappingProxyType({
+    'precio_m2_casas': (('casas',), lambda repo: repo.get_precio_m2_casas()),
+    'precio_m2_departamentos': (('departamentos',), lambda repo: repo.get_precio_m2_departamentos()),
+    'stats_casas': (('casas',), lambda repo: repo.get_stats_casas()),
+    'stats_departamentos': (('departamentos',), lambda repo: repo.get_stats_departamentos()),
+    'precio_m2_total': (('casas', 'departamentos'), lambda repo: repo.get_precio_m2_total()),
+    'stats_total': (('casas', 'departamentos'), lambda repo: repo.get_stats_total()),
+    'total_casas': (('casas',), lambda repo: repo.get_total_casas()),
+    'total_departamentos': (('departamentos',), lambda repo: repo.get_total_departamentos()),
+    'total_propiedades': (('casas', 'departamentos'), lambda repo: repo.get_total_propiedades()),
+    'precios_por_alcaldia_casas': (
+        ('casas',),
+        lambda repo: PreciosAlcaldiaResponse(precios=repo.get_precio_promedio_por_alcaldia_casas())
+    ),
+    'precios_por_alcaldia_departamentos': (
+        ('departamentos',),
+        lambda repo: PreciosAlcaldiaResponse(precios=repo.get_precio_promedio_por_alcaldia_departamentos())
+    ),
+    'precios_por_alcaldia_total': (
+        ('casas', 'departamentos'),
+        lambda repo: PreciosAlcaldiaResponse(precios=repo.get_precio_promedio_por_alcaldia_total())
+    ),
+    'precio_m2_por_alcaldia_casas': (
+        ('casas',),
+        lambda repo: PrecioM2AlcaldiaResponse(precios=repo.get_precio_m2_por_alcaldia_casas())
+    ),
+    'precio_m2_por_alcaldia_departamentos': (
+        ('departamentos',),
+        lambda repo: PrecioM2AlcaldiaResponse(precios=repo.get_precio_m2_por_alcaldia_departamentos())
+    ),
+    'precio_m2_por_alcaldia_total': (
+        ('casas', 'departamentos'),
+        lambda repo: PrecioM2AlcaldiaResponse(precios=repo.get_precio_m2_por_alcaldia_total())
+    )
+})
+
+
+# Sección del resumen -> campo -> (estadística materializada, atributo del resultado que se reporta)
+RESUMEN = MappingProxyType({
+    seccion: MappingProxyType({
+        'total': (total, 'total'),
+        'precio_m2': (f'precio_m2_{sufijo}', 'precio_m2'),
+        'stats': (f'stats_{sufijo}', None),
+        'precios_por_alcaldia': (f'precios_por_alcaldia_{sufijo}', 'precios'),
+        'precio_m2_por_alcaldia': (f'precio_m2_por_alcaldia_{sufijo}', 'precios')
+    })
+    for seccion, sufijo, total in (
+        ('casas', 'casas', 'total_casas'),
+        ('departamentos', 'departamentos', 'total_departamentos'),
+        ('propiedades', 'total', 'total_propiedades')
+    )
+})
+
+
+def seleccion_resumen(campos: Optional[Sequence[str]] = None) -> Dict[str, List[str]]:
+    """
+    Campos de cada sección del resumen que pide un selector
+
+    Cada campo del selector puede ser una sección (`casas`), un campo de todas
+    las secciones (`precio_m2`) o un campo de una sección (`casas.precio_m2`).
+
+    Raises:
+        CampoNoValido: Si algún campo no es una sección ni un campo del resumen
+    """
+    if not campos:
+        return {seccion: list(por_campo) for seccion, por_campo in RESUMEN.items()}
+    pedidos = {seccion: set() for seccion in RESUMEN}
+    disponibles = list(RESUMEN) + list(RESUMEN['casas'])
+    for campo in campos:
+        seccion, _, nombre = campo.partition('.')
+        if seccion in RESUMEN and not nombre:
+            pedidos[seccion].update(RESUMEN[seccion])
+        elif seccion in RESUMEN and nombre in RESUMEN[seccion]:
+            pedidos[seccion].add(nombre)
+        elif not nombre and campo in RESUMEN['casas']:
+            for por_campo in pedidos.values():
+                por_campo.add(campo)
+        else:
+            raise CampoNoValido(campo, disponibles)
+    # Mismo orden que el resumen completo
+    return {
+        seccion: [nombre for nombre in RESUMEN[seccion] if nombre in pedidos[seccion]]
+        for seccion in RESUMEN if pedidos[seccion]
+    }
+
+
+class TablaEstadisticas:
+    """
+    Resultados de las estadísticas que dependen de un mismo conjunto de snapshots.
+
+    Todos se calculan al construir la tabla; después cada consulta es una
+    búsqueda en un diccionario. Una estadística que falla guarda su error y
+    lo vuelve a levantar en cada consulta, igual que si se calculara en la
+    petición.
+    """
+
+    def __init__(self, snapshots: Tuple[DatasetSnapshot, ...]):
+        self.snapshots = snapshots
+        self.tipos = tuple(snapshot.tipo for snapshot in snapshots)
+        repo = StatsRepository(fijos=snapshots)
+        self._resultados: Dict[str, Any] = {}
+        self.errores: Dict[str, ErrorEstadisticas] = {}
+        self.tiempos_ms: Dict[str, float] = {}
+
+        inicio = time.perf_counter()
+        for nombre, (tipos, calculo) in ESTADISTICAS.items():
+            if tipos != self.tipos:
+                continue
+            inicio_calculo = time.perf_counter()
+            try:
+                self._resultados[nombre] = calculo(repo)
+            except Exception as e:
+                self.errores[nombre] = e if isinstance(e, ErrorEstadisticas) else ErrorEstadisticas(str(e))
+            self.tiempos_ms[nombre] = (time.perf_counter() - inicio_calculo) * 1000
+        self.tiempo_ms = (time.perf_counter() - inicio) * 1000
+        self.fecha = datetime.now().isoformat()
+
+    def vigente(self, snapshots: Tuple[DatasetSnapshot, ...]) -> bool:
+        """Indica si la tabla se calculó con estos mismos snapshots"""
+        return all(a is b for a, b in zip(self.snapshots, snapshots))
+
+    def get(self, nombre: str) -> Any:
+        """
+        Raises:
+            ErrorEstadisticas: Si la estadística falló al calcularse
+        """
+        if nombre in self.errores:
+            raise self.errores[nombre]
+        return self._resultados[nombre]
+
+    def info(self) -> MaterializacionInfo:
+        return MaterializacionInfo(
+            tipos=list(self.tipos),
+            hashes=[snapshot.hash[:12] for snapshot in self.snapshots],
+            fecha=self.fecha,
+            tiempo_ms=round(self.tiempo_ms, 3),
+            tiempos_ms={nombre: round(t, 3) for nombre, t in self.tiempos_ms.items()},
+            errores={nombre: str(error) for nombre, error in self.errores.items()}
+        )
+
+
+class StatsMaterializadas:
+    """
+    Tabla en memoria con los resultados de todas las estadísticas.
+
+    Cada vez que se carga (o se recarga) el snapshot de un tipo de
+    propiedad se recalculan las tablas que dependen de él; los endpoints
+    sólo consultan el resultado. Una tabla nueva reemplaza a la anterior
+    al final, así que las consultas nunca ven una tabla a medio calcular.
+    """
+
+    def __init__(self, snapshots: Optional[StatsSnapshots] = None):
+        self.snapshots = snapshots or get_stats_snapshots()
+        self._tablas: Dict[Tuple[str, ...], TablaEstadisticas] = {}
+        self._lock = threading.Lock()
+        self.snapshots.subscribe(self._snapshot_cargado)
+
+    def _materializar(self, tipos: Tuple[str, ...], snapshots: Tuple[DatasetSnapshot, ...]) -> TablaEstadisticas:
+        tabla = TablaEstadisticas(snapshots)
+        self._tablas[tipos] = tabla
+        logger.info("estadisticas_materializadas", extra={
+            'tipos': list(tipos),
+            'estadisticas': len(tabla.tiempos_ms),
+            'errores': len(tabla.errores),
+            'tiempo_ms': round(tabla.tiempo_ms, 3)
+        })
+        return tabla
+
+    def _snapshot_cargado(self, tipo: str, snapshot: DatasetSnapshot) -> None:
+        """Recalcula las tablas que dependen del tipo recién cargado (si sus demás snapshots ya están)"""
+        cargados = self.snapshots.cargados()
+        for tipos in {tipos for tipos, _ in ESTADISTICAS.values() if tipo in tipos}:
+            if all(t in cargados for t in tipos):
+                with self._lock:
+                    self._materializar(tipos, tuple(cargados[t] for t in tipos))
+
+    def get(self, nombre: str) -> Any:
+        """
+        Resultado de una estadística
+
+        Raises:
+            ErrorEstadisticas: Si la estadística no existe, no se pueden cargar los datos o el cálculo falló
+        """
+        if nombre not in ESTADISTICAS:
+            raise ErrorEstadisticas(f"estadística desconocida: {nombre}")
+        tipos = ESTADISTICAS[nombre][0]
+        # Obtener los snapshots también revisa si los archivos cambiaron
+        snapshots = tuple(self.snapshots.get(tipo) for tipo in tipos)
+        tabla = self._tablas.get(tipos)
+        if tabla is None or not tabla.vigente(snapshots):
+            with self._lock:
+                tabla = self._tablas.get(tipos)
+                if tabla is None or not tabla.vigente(snapshots):
+                    tabla = self._materializar(tipos, snapshots)
+        return tabla.get(nombre)
+
+    def resumen(self, campos: Optional[Sequence[str]] = None) -> ResumenEstadisticas:
+        """
+        Estadísticas de casas, departamentos y todas las propiedades en una sola respuesta
+
+        Sólo se consultan las tablas de las estadísticas seleccionadas.
+
+        Args:
+            campos: Selector de secciones y campos (ver `seleccion_resumen`); todos si se omite
+
+        Raises:
+            CampoNoValido: Si el selector tiene un campo desconocido
+            ErrorEstadisticas: Si no se pueden cargar los datos o falló alguna estadística
+        """
+        secciones = {}
+        for seccion, nombres in seleccion_resumen(campos).items():
+            valores = {}
+            for nombre in nombres:
+                estadistica, atributo = RESUMEN[seccion][nombre]
+                resultado = self.get(estadistica)
+                valores[nombre] = getattr(resultado, atributo) if atributo else resultado
+            secciones[seccion] = ResumenTipo(**valores)
+        return ResumenEstadisticas(**secciones)
+
+    def recalcular(self) -> StatsDebugInfo:
+        """Revisa si cambiaron los archivos y vuelve a calcular todas las tablas, aunque estén vigentes"""
+        for tipo in list(self.snapshots.cargados()):
+            self.snapshots.reload_if_changed(tipo)
+        cargados = self.snapshots.cargados()
+        with self._lock:
+            for tipos in {tipos for tipos, _ in ESTADISTICAS.values()}:
+                if all(t in cargados for t in tipos):
+                    self._materializar(tipos, tuple(cargados[t] for t in tipos))
+        return self.info()
+
+    def info(self) -> StatsDebugInfo:
+        """Snapshots cargados y tiempos de la última materialización de cada tabla"""
+        return StatsDebugInfo(
+            snapshots=[
+                SnapshotInfo(
+                    tipo_propiedad=tipo,
+                    filas=snapshot.filas,
+                    hash=snapshot.hash[:12],
+                    fecha_carga=snapshot.fecha_carga,
+                    tiempo_carga_ms=round(snapshot.tiempo_carga_ms, 3)
+                )
+                for tipo, snapshot in self.snapshots.cargados().items()
+            ],
+            materializaciones=[tabla.info() for tabla in list(self._tablas.values())]
+        )
+
+
+# Instancia única compartida por todo el proceso
+_materializadas = StatsMaterializadas()
+
+
+def get_stats_materializadas() -> StatsMaterializadas:
+    """Devuelve la tabla de estadísticas materializadas del proceso"""
+    return _materializadas
\ No newline at end of file
@@ -1,9 +1,12 @@
 import pandas as pd
 import numpy as np
-import os
-from typing import Dict, Any, List
+import logging
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 from domain.exceptions import ErrorEstadisticas
 from domain.models import PrecioM2Response, EstadisticasPrecios, TotalResponse, PreciosAlcaldiaResponse, PrecioM2AlcaldiaResponse
+from infra.data.stats_snapshot import DatasetSnapshot, StatsSnapshots, get_stats_snapshots
+
+logger = logging.getLogger(__name__)
 
 
 def _clean_numeric_data(value: str) -> float:
@@ -63,23 +66,107 @@ def remove_outliers(df: pd.DataFrame, column: str) -> pd.DataFrame:
     return df[(df[column] >= lower_bound) & (df[column] <= upper_bound)]
 
 
+def promedios_por_alcaldia(frames: Sequence[pd.DataFrame], columns: Sequence[str]) -> Dict[str, Dict[str, float]]:
+    """
+    Promedio de cada columna por alcaldía, sin outliers (método IQR dentro de cada alcaldía)
+
+    Equivale a filtrar cada alcaldía y aplicar `remove_outliers`, pero con una
+    sola agrupación sobre todas las filas de todos los DataFrames: los cuartiles
+    de todos los grupos y columnas se calculan juntos, los límites se comparan
+    fila por fila con los códigos de la columna categórica `alcaldia` y las
+    sumas de cada grupo salen de `np.bincount`.
+
+    Args:
+        frames: DataFrames con la columna categórica `alcaldia` y las columnas a promediar
+        columns: Columnas a promediar
+
+    Returns:
+        Por columna, el promedio de cada alcaldía que aparece en alguno de los DataFrames
+        (0.0 si no tiene filas), en el orden de las categorías
+    """
+    alcaldias = list(dict.fromkeys(a for df in frames for a in df['alcaldia'].cat.categories))
+    n = len(alcaldias)
+    codigos = np.concatenate([
+        df['alcaldia'].cat.set_categories(alcaldias).cat.codes.to_numpy() for df in frames
+    ]).astype(np.intp)
+    # Las filas sin alcaldía (código -1) no pertenecen a ningún grupo
+    validos = codigos >= 0
+    codigos = codigos[validos]
+    valores = pd.DataFrame({
+        column: np.concatenate([df[column].to_numpy(dtype=np.float64) for df in frames])[validos]
+        for column in columns
+    })
+    
+    # Cuartiles de todos los grupos y columnas en una sola pasada
+    grupos = pd.Categorical.from_codes(codigos, categories=range(n))
+    cuartiles = valores.groupby(grupos, observed=False).quantile([0.25, 0.75])
+    filas = np.bincount(codigos, minlength=n)
+    
+    promedios = {}
+    for column in columns:
+        q1, q3 = cuartiles[column].to_numpy().reshape(n, 2).T
+        iqr = q3 - q1
+        v = valores[column].to_numpy()
+        # Cada fila se compara con los límites de su alcaldía
+        dentro = (v >= (q1 - 1.5 * iqr)[codigos]) & (v <= (q3 + 1.5 * iqr)[codigos])
+        sumas = np.bincount(codigos[dentro], weights=v[dentro], minlength=n)
+        cuentas = np.bincount(codigos[dentro], minlength=n)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            medias = sumas / cuentas
+        promedios[column] = {
+            alcaldia: float(medias[i]) if filas[i] > 0 else 0.0
+            for i, alcaldia in enumerate(alcaldias)
+        }
+    return promedios
+
+
 class StatsRepository:
-    """Repositorio para estadísticas de propiedades"""
+    """
+    Repositorio para estadísticas de propiedades
+
+    Lee los snapshots compartidos del proceso en lugar de los CSV: crear una
+    instancia no lee archivos, y cada tipo de propiedad se obtiene sólo
+    cuando una estadística lo usa. Una instancia conserva los snapshots que
+    ya obtuvo, así que un cálculo no mezcla dos versiones de los datos.
+    """
     
-    def __init__(self):
-        try:
-            # Obtener la ruta base del proyecto
-            base_path = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            
-            # Cargar datos usando rutas absolutas
-            self.casas_df = pd.read_csv(os.path.join(base_path, 'new_casas.csv'))
-            self.deptos_df = pd.read_csv(os.path.join(base_path, 'new_departamentos.csv'))
-            
-            # Obtener lista de alcaldías
-            self.alcaldias = [col.replace('alcaldia_', '') for col in self.casas_df.columns if col.startswith('alcaldia_')]
-            
-        except Exception as e:
-            raise ErrorEstadisticas(f"Error al cargar datos: {str(e)}")
+    def __init__(self, snapshots: Optional[StatsSnapshots] = None, fijos: Sequence[DatasetSnapshot] = ()):
+        """
+        Args:
+            snapshots: Snapshots de los que se leen los datos (los del proceso por defecto)
+            fijos: Snapshots ya obtenidos que se usan en lugar de pedirlos (para materializar)
+        """
+        self.snapshots = snapshots or get_stats_snapshots()
+        self._cache: Dict[str, DatasetSnapshot] = {snapshot.tipo: snapshot for snapshot in fijos}
+        # Promedios por alcaldía ya calculados, por combinación de tipos de propiedad
+        self._promedios: Dict[Tuple[str, ...], Dict[str, Dict[str, float]]] = {}
+    
+    def _snapshot(self, tipo: str) -> DatasetSnapshot:
+        snapshot = self._cache.get(tipo)
+        if snapshot is None:
+            snapshot = self._cache[tipo] = self.snapshots.get(tipo)
+        return snapshot
+    
+    def _promedios_por_alcaldia(self, *tipos: str) -> Dict[str, Dict[str, float]]:
+        """Promedios por alcaldía de precio y precio por m2 (una sola agrupación para ambas columnas)"""
+        promedios = self._promedios.get(tipos)
+        if promedios is None:
+            frames = [self._snapshot(tipo).df for tipo in tipos]
+            promedios = self._promedios[tipos] = promedios_por_alcaldia(frames, ('precio', 'precio_por_mt2'))
+        return promedios
+    
+    @property
+    def casas_df(self) -> pd.DataFrame:
+        return self._snapshot('casas').df
+    
+    @property
+    def deptos_df(self) -> pd.DataFrame:
+        return self._snapshot('departamentos').df
+    
+    @property
+    def alcaldias(self) -> List[str]:
+        """Lista de alcaldías del archivo de casas"""
+        return list(self._snapshot('casas').alcaldias)
     
     def get_precio_m2_casas(self) -> PrecioM2Response:
         """Calcula el precio promedio por metro cuadrado de casas"""
@@ -131,146 +218,83 @@ class StatsRepository:
         except Exception as e:
             raise ErrorEstadisticas(f"Error al calcular estadísticas: {str(e)}")
     
+    def get_precio_m2_total(self) -> PrecioM2Response:
+        """Calcula el precio promedio por metro cuadrado de todas las propiedades"""
+        try:
+            # Casas y departamentos juntos: los outliers se calculan sobre ambos
+            df_combined = pd.concat([self.casas_df[['precio_por_mt2']], self.deptos_df[['precio_por_mt2']]])
+            df_clean = remove_outliers(df_combined, 'precio_por_mt2')
+            return PrecioM2Response(precio_m2=df_clean['precio_por_mt2'].mean())
+        except Exception as e:
+            raise ErrorEstadisticas(f"Error al calcular precio por m2: {str(e)}")
+    
+    def get_stats_total(self) -> EstadisticasPrecios:
+        """Obtiene estadísticas de precios de todas las propiedades"""
+        try:
+            # Casas y departamentos juntos: los outliers se calculan sobre ambos
+            df_combined = pd.concat([self.casas_df[['precio']], self.deptos_df[['precio']]])
+            stats = remove_outliers(df_combined, 'precio')['precio'].describe()
+            return EstadisticasPrecios(
+                precio_minimo=float(stats['min']),
+                precio_maximo=float(stats['max']),
+                precio_promedio=float(stats['mean']),
+                precio_mediana=float(stats['50%'])
+            )
+        except Exception as e:
+            raise ErrorEstadisticas(f"Error al calcular estadísticas: {str(e)}")
+    
     def get_total_casas(self) -> TotalResponse:
         """Obtiene el total de casas"""
-        return TotalResponse(total=len(self.casas_df))
+        return TotalResponse(total=self._snapshot('casas').filas)
     
     def get_total_departamentos(self) -> TotalResponse:
         """Obtiene el total de departamentos"""
-        return TotalResponse(total=len(self.deptos_df))
+        return TotalResponse(total=self._snapshot('departamentos').filas)
     
     def get_total_propiedades(self) -> TotalResponse:
         """Obtiene el total de todas las propiedades"""
-        return TotalResponse(total=len(self.casas_df) + len(self.deptos_df))
+        return TotalResponse(total=self._snapshot('casas').filas + self._snapshot('departamentos').filas)
 
     def get_precio_promedio_por_alcaldia_casas(self) -> Dict[str, float]:
         """Obtiene el precio promedio por alcaldía para casas"""
         try:
-            precios_por_alcaldia = {}
-            for alcaldia in self.alcaldias:
-                # Filtrar por alcaldía
-                mask = self.casas_df[f'alcaldia_{alcaldia}'] == 1
-                df_alcaldia = self.casas_df[mask]
-                if len(df_alcaldia) > 0:
-                    # Eliminar outliers y calcular promedio
-                    df_clean = remove_outliers(df_alcaldia, 'precio')
-                    precios_por_alcaldia[alcaldia] = float(df_clean['precio'].mean())
-                else:
-                    precios_por_alcaldia[alcaldia] = 0.0
-            return precios_por_alcaldia
+            return self._promedios_por_alcaldia('casas')['precio']
         except Exception as e:
             raise ErrorEstadisticas(f"Error al calcular precios por alcaldía: {str(e)}")
 
     def get_precio_promedio_por_alcaldia_departamentos(self) -> Dict[str, float]:
         """Obtiene el precio promedio por alcaldía para departamentos"""
         try:
-            precios_por_alcaldia = {}
-            for alcaldia in self.alcaldias:
-                # Filtrar por alcaldía
-                mask = self.deptos_df[f'alcaldia_{alcaldia}'] == 1
-                df_alcaldia = self.deptos_df[mask]
-                if len(df_alcaldia) > 0:
-                    # Eliminar outliers y calcular promedio
-                    df_clean = remove_outliers(df_alcaldia, 'precio')
-                    precios_por_alcaldia[alcaldia] = float(df_clean['precio'].mean())
-                else:
-                    precios_por_alcaldia[alcaldia] = 0.0
-            return precios_por_alcaldia
+            return self._promedios_por_alcaldia('departamentos')['precio']
         except Exception as e:
             raise ErrorEstadisticas(f"Error al calcular precios por alcaldía: {str(e)}")
 
     def get_precio_m2_por_alcaldia_casas(self) -> Dict[str, float]:
         """Obtiene el precio promedio por metro cuadrado por alcaldía para casas"""
         try:
-            precios_m2_por_alcaldia = {}
-            for alcaldia in self.alcaldias:
-                # Filtrar por alcaldía
-                mask = self.casas_df[f'alcaldia_{alcaldia}'] == 1
-                df_alcaldia = self.casas_df[mask]
-                if len(df_alcaldia) > 0:
-                    # Eliminar outliers y calcular promedio
-                    df_clean = remove_outliers(df_alcaldia, 'precio_por_mt2')
-                    precios_m2_por_alcaldia[alcaldia] = float(df_clean['precio_por_mt2'].mean())
-                else:
-                    precios_m2_por_alcaldia[alcaldia] = 0.0
-            return precios_m2_por_alcaldia
+            return self._promedios_por_alcaldia('casas')['precio_por_mt2']
         except Exception as e:
             raise ErrorEstadisticas(f"Error al calcular precios por m2 por alcaldía: {str(e)}")
 
     def get_precio_m2_por_alcaldia_departamentos(self) -> Dict[str, float]:
         """Obtiene el precio promedio por metro cuadrado por alcaldía para departamentos"""
         try:
-            precios_m2_por_alcaldia = {}
-            for alcaldia in self.alcaldias:
-                # Filtrar por alcaldía
-                mask = self.deptos_df[f'alcaldia_{alcaldia}'] == 1
-                df_alcaldia = self.deptos_df[mask]
-                if len(df_alcaldia) > 0:
-                    # Eliminar outliers y calcular promedio
-                    df_clean = remove_outliers(df_alcaldia, 'precio_por_mt2')
-                    precios_m2_por_alcaldia[alcaldia] = float(df_clean['precio_por_mt2'].mean())
-                else:
-                    precios_m2_por_alcaldia[alcaldia] = 0.0
-            return precios_m2_por_alcaldia
+            return self._promedios_por_alcaldia('departamentos')['precio_por_mt2']
         except Exception as e:
             raise ErrorEstadisticas(f"Error al calcular precios por m2 por alcaldía: {str(e)}")
 
     def get_precio_m2_por_alcaldia_total(self) -> Dict[str, float]:
         """Obtiene el precio promedio por metro cuadrado por alcaldía para todas las propiedades"""
         try:
-            precios_m2_por_alcaldia = {}
-            for alcaldia in self.alcaldias:
-                # Filtrar casas por alcaldía
-                mask_casas = self.casas_df[f'alcaldia_{alcaldia}'] == 1
-                df_casas = self.casas_df[mask_casas]
-                
-                # Filtrar departamentos por alcaldía
-                mask_deptos = self.deptos_df[f'alcaldia_{alcaldia}'] == 1
-                df_deptos = self.deptos_df[mask_deptos]
-                
-                # Combinar datos
-                df_combined = pd.concat([
-                    df_casas[['precio_por_mt2']],
-                    df_deptos[['precio_por_mt2']]
-                ])
-                
-                if len(df_combined) > 0:
-                    # Eliminar outliers y calcular promedio
-                    df_clean = remove_outliers(df_combined, 'precio_por_mt2')
-                    precios_m2_por_alcaldia[alcaldia] = float(df_clean['precio_por_mt2'].mean())
-                else:
-                    precios_m2_por_alcaldia[alcaldia] = 0.0
-                    
-            return precios_m2_por_alcaldia
+            # Casas y departamentos se agrupan juntos: los outliers se calculan sobre ambos
+            return self._promedios_por_alcaldia('casas', 'departamentos')['precio_por_mt2']
         except Exception as e:
             raise ErrorEstadisticas(f"Error al calcular precios por m2 por alcaldía: {str(e)}")
 
     def get_precio_promedio_por_alcaldia_total(self) -> Dict[str, float]:
         """Obtiene el precio promedio por alcaldía para todas las propiedades"""
         try:
-            precios_por_alcaldia = {}
-            for alcaldia in self.alcaldias:
-                # Filtrar casas por alcaldía
-                mask_casas = self.casas_df[f'alcaldia_{alcaldia}'] == 1
-                df_casas = self.casas_df[mask_casas]
-                
-                # Filtrar departamentos por alcaldía
-                mask_deptos = self.deptos_df[f'alcaldia_{alcaldia}'] == 1
-                df_deptos = self.deptos_df[mask_deptos]
-                
-                # Combinar datos
-                df_combined = pd.concat([
-                    df_casas[['precio']],
-                    df_deptos[['precio']]
-                ])
-                
-                if len(df_combined) > 0:
-                    # Eliminar outliers y calcular promedio
-                    df_clean = remove_outliers(df_combined, 'precio')
-                    precios_por_alcaldia[alcaldia] = float(df_clean['precio'].mean())
-                else:
-                    precios_por_alcaldia[alcaldia] = 0.0
-                    
-            return precios_por_alcaldia
+            # Casas y departamentos se agrupan juntos: los outliers se calculan sobre ambos
+            return self._promedios_por_alcaldia('casas', 'departamentos')['precio']
         except Exception as e:
-            raise ErrorEstadisticas(f"Error al calcular precios por alcaldía: {str(e)}") 
\ No newline at end of file
+            raise ErrorEstadisticas(f"Error al calcular precios por alcaldía: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,225 @@
+import os
+import time
+import hashlib
+import logging
+import threading
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from types import MappingProxyType
+from typing import Callable, Dict, List, Optional, Tuple
+from domain.exceptions import ErrorEstadisticas
+from infra.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+# Ruta base del proyecto, donde viven los CSV de publicaciones
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Archivo de publicaciones de cada tipo de propiedad
+ARCHIVOS_STATS = MappingProxyType({
+    'casas': 'new_casas.csv',
+    'departamentos': 'new_departamentos.csv'
+})
+
+# Columnas que usan las estadísticas (además de las columnas one-hot de alcaldía);
+# el resto (descripcion, dir, col...) no se lee
+COLUMNAS_STATS = ('precio', 'precio_por_mt2')
+
+
+def _usar_columna(columna: str) -> bool:
+    return columna in COLUMNAS_STATS or columna.startswith('alcaldia_')
+
+
+def decodificar_alcaldias(df: pd.DataFrame) -> Tuple[pd.DataFrame, Tuple[str, ...]]:
+    """
+    Reemplaza las columnas one-hot de alcaldía por una sola columna categórica `alcaldia`
+
+    Las filas sin ninguna alcaldía marcada quedan con la categoría vacía (NaN).
+
+    Returns:
+        El DataFrame con la columna `alcaldia` y las alcaldías (categorías) en el orden de las columnas
+    """
+    columnas = [col for col in df.columns if col.startswith('alcaldia_')]
+    alcaldias = tuple(col.replace('alcaldia_', '') for col in columnas)
+    bloque = df[columnas].to_numpy() == 1
+    codigos = np.where(bloque.any(axis=1), bloque.argmax(axis=1), -1) if columnas else np.full(len(df), -1)
+    decodificado = df.drop(columns=columnas)
+    decodificado['alcaldia'] = pd.Categorical.from_codes(codigos, categories=list(alcaldias))
+    return decodificado, alcaldias
+
+
+def _hash_archivo(ruta: str) -> str:
+    """sha256 del contenido de un archivo"""
+    sha = hashlib.sha256()
+    with open(ruta, 'rb') as f:
+        for bloque in iter(lambda: f.read(1 << 20), b''):
+            sha.update(bloque)
+    return sha.hexdigest()
+
+
+class DatasetSnapshot:
+    """
+    Publicaciones de un tipo de propiedad cargadas en memoria, de solo lectura.
+
+    Se construye una sola vez por versión del archivo y después no se modifica:
+    todas las peticiones (y todos los hilos del pool) leen el mismo DataFrame.
+    Una recarga construye un snapshot nuevo y sólo reemplaza la referencia.
+    """
+
+    def __init__(self, tipo: str, ruta: str, hash_contenido: Optional[str] = None):
+        """
+        Raises:
+            ErrorEstadisticas: Si no se puede leer el archivo
+        """
+        inicio = time.perf_counter()
+        try:
+            # El hash se calcula antes de leer: si el archivo cambia durante la lectura la
+            # siguiente revisión verá un hash distinto y volverá a cargarlo
+            self.hash = hash_contenido or _hash_archivo(ruta)
+            df = pd.read_csv(ruta, usecols=_usar_columna)
+        except Exception as e:
+            logger.warning("error_cargando_estadisticas", extra={'tipo': tipo, 'error': str(e)})
+            raise ErrorEstadisticas(f"Error al cargar datos de {tipo}: {str(e)}")
+        self.tipo = tipo
+        self.ruta = ruta
+        # Las columnas one-hot se decodifican una sola vez; las estadísticas agrupan por `alcaldia`
+        self.df, self.alcaldias = decodificar_alcaldias(df)
+        self.filas = len(self.df)
+        self.tiempo_carga_ms = (time.perf_counter() - inicio) * 1000
+        self.fecha_carga = datetime.now().isoformat()
+
+
+class StatsSnapshots:
+    """
+    Snapshots de las publicaciones compartidos por todo el proceso.
+
+    Cada tipo de propiedad se carga la primera vez que una estadística lo
+    pide (sólo las columnas que usan las estadísticas). Después, a lo más
+    cada `recarga_segundos`, se revisa el tamaño y la fecha de modificación
+    del archivo; si cambiaron se calcula el hash del contenido y sólo si el
+    hash es distinto se carga un snapshot nuevo.
+    """
+
+    def __init__(self, base_dir: Optional[str] = None, recarga_segundos: Optional[float] = None):
+        self.base_dir = base_dir or BASE_PATH
+        self.recarga_segundos = recarga_segundos
+        self._snapshots: Dict[str, DatasetSnapshot] = {}
+        # (tamaño, fecha de modificación) del archivo del que se cargó cada snapshot
+        self._firmas: Dict[str, Tuple[int, float]] = {}
+        self._revisiones: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._suscriptores: List[Callable[[str, DatasetSnapshot], None]] = []
+
+    def _ruta(self, tipo: str) -> str:
+        if tipo not in ARCHIVOS_STATS:
+            raise ErrorEstadisticas(f"tipo de propiedad desconocido: {tipo}")
+        return os.path.join(self.base_dir, ARCHIVOS_STATS[tipo])
+
+    @staticmethod
+    def _firma(ruta: str) -> Tuple[int, float]:
+        stat = os.stat(ruta)
+        return stat.st_size, stat.st_mtime
+
+    def load(self, tipo: str, hash_contenido: Optional[str] = None) -> DatasetSnapshot:
+        """
+        Carga (o vuelve a cargar) el snapshot de un tipo de propiedad
+
+        Raises:
+            ErrorEstadisticas: Si el tipo no existe o no se puede leer el archivo
+        """
+        ruta = self._ruta(tipo)
+        try:
+            firma = self._firma(ruta)
+        except OSError as e:
+            raise ErrorEstadisticas(f"Error al cargar datos de {tipo}: {str(e)}")
+        snapshot = DatasetSnapshot(tipo, ruta, hash_contenido)
+        anterior = self._snapshots.get(tipo)
+        self._snapshots[tipo] = snapshot
+        self._firmas[tipo] = firma
+        self._revisiones[tipo] = time.monotonic()
+        logger.info("estadisticas_cargadas", extra={
+            'tipo': tipo,
+            'filas': snapshot.filas,
+            'hash': snapshot.hash[:12],
+            'hash_anterior': anterior.hash[:12] if anterior is not None else None,
+            'tiempo_ms': round(snapshot.tiempo_carga_ms, 3)
+        })
+        for suscriptor in list(self._suscriptores):
+            suscriptor(tipo, snapshot)
+        return snapshot
+
+    def subscribe(self, callback: Callable[[str, DatasetSnapshot], None]) -> None:
+        """Registra una función que se llama con (tipo, snapshot) cada vez que se carga un snapshot"""
+        self._suscriptores.append(callback)
+
+    def cargados(self) -> Dict[str, DatasetSnapshot]:
+        """Snapshots cargados hasta ahora, por tipo de propiedad"""
+        return dict(self._snapshots)
+
+    def reload_if_changed(self, tipo: str) -> bool:
+        """
+        Vuelve a cargar el snapshot de un tipo si el contenido de su archivo cambió
+
+        Returns:
+            True si se cargó un snapshot nuevo
+        """
+        with self._lock:
+            self._revisiones[tipo] = time.monotonic()
+            actual = self._snapshots.get(tipo)
+            if actual is None:
+                return False
+            try:
+                firma = self._firma(actual.ruta)
+                if firma == self._firmas.get(tipo):
+                    return False
+                hash_contenido = _hash_archivo(actual.ruta)
+            except OSError as e:
+                # Sin el archivo se siguen sirviendo los datos ya cargados
+                logger.warning("error_revisando_estadisticas", extra={'tipo': tipo, 'error': str(e)})
+                return False
+            if hash_contenido == actual.hash:
+                # Sólo cambió la fecha de modificación
+                self._firmas[tipo] = firma
+                return False
+            try:
+                self.load(tipo, hash_contenido)
+            except ErrorEstadisticas:
+                return False
+            return True
+
+    def get(self, tipo: str) -> DatasetSnapshot:
+        """
+        Obtiene el snapshot de un tipo de propiedad, cargándolo si hace falta
+
+        Raises:
+            ErrorEstadisticas: Si el tipo no existe o no se puede leer el archivo
+        """
+        snapshot = self._snapshots.get(tipo)
+        if snapshot is None:
+            # Sólo un hilo lee el archivo; los demás esperan y reutilizan el snapshot
+            with self._lock:
+                snapshot = self._snapshots.get(tipo)
+                if snapshot is None:
+                    snapshot = self.load(tipo)
+            return snapshot
+        recarga = self.recarga_segundos if self.recarga_segundos is not None else get_settings().stats_recarga_segundos
+        if recarga > 0 and time.monotonic() - self._revisiones.get(tipo, 0.0) >= recarga:
+            if self.reload_if_changed(tipo):
+                snapshot = self._snapshots[tipo]
+        return snapshot
+
+    def load_all(self) -> None:
+        """Carga los snapshots de todos los tipos de propiedad"""
+        for tipo in ARCHIVOS_STATS:
+            self.get(tipo)
+
+
+# Instancia única compartida por todo el proceso
+_snapshots = StatsSnapshots()
+
+
+def get_stats_snapshots() -> StatsSnapshots:
+    """Devuelve los snapshots de estadísticas del proceso"""
+    return _snapshots
\ No newline at end of file
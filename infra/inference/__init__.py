@@ -0,0 +1,13 @@
+from infra.inference.encoder import FeatureEncoder
+from infra.inference.linear import CompiledLinearPredictor
+from infra.inference.forest import FlattenedForest
+from infra.inference.lattice import PrediccionLattice
+from infra.inference.intervals import TablaResiduos
+
+__all__ = [
+    'CompiledLinearPredictor',
+    'FeatureEncoder',
+    'FlattenedForest',
+    'PrediccionLattice',
+    'TablaResiduos'
+]
\ No newline at end of file
@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
+
+
+# Características numéricas del modelo, en el orden en que se reciben
+NUMERIC_FEATURES = ('dimensiones', 'recamaras', 'banos', 'estacionamientos')
+
+# Campo de entrada (petición o archivo) de cada característica numérica, en el mismo orden
+INPUT_FIELDS = ('metros_cuadrados', 'recamaras', 'banos', 'estacionamientos')
+
+# Otros nombres con los que aparecen las columnas numéricas en artefactos o datos de entrenamiento
+ALIAS_COLUMNAS = {'metros_cuadrados': 'dimensiones'}
+
+PREFIJO_ALCALDIA = 'alcaldia_'
+
+
+def escalar(scaler, X: np.ndarray):
+    """
+    Aplica `scaler.transform` a una matriz ya codificada
+
+    Si el escalador se ajustó con un DataFrame se le pasan los mismos nombres de
+    columnas con los que se ajustó (así los artefactos con `metros_cuadrados`
+    siguen funcionando).
+    """
+    if scaler is None:
+        return X
+    nombres = getattr(scaler, 'feature_names_in_', None)
+    if nombres is not None:
+        X = pd.DataFrame(X, columns=list(nombres))
+    return scaler.transform(X)
+
+
+class FeatureEncoder:
+    """
+    Codificador de características compartido por el entrenamiento y el servicio.
+
+    A partir del orden de columnas del modelo (lo único que hay que guardar con
+    el modelo) precalcula la posición de cada característica numérica y de cada
+    columna one-hot de alcaldía. Una fila o un lote se codifica en una matriz
+    contigua de float64 con una asignación por columna numérica y una sola
+    asignación indexada para el bloque de alcaldías, sin DataFrames ni bucles
+    por columna.
+    """
+
+    def __init__(self, columns: Sequence[str]):
+        """
+        Args:
+            columns: Orden de las columnas del modelo; `metros_cuadrados` se acepta como `dimensiones`
+
+        Raises:
+            ValueError: Si faltan características numéricas o hay columnas desconocidas
+        """
+        columns = [ALIAS_COLUMNAS.get(c, c) for c in columns]
+        faltantes = [f for f in NUMERIC_FEATURES if f not in columns]
+        otras = [c for c in columns if c not in NUMERIC_FEATURES and not c.startswith(PREFIJO_ALCALDIA)]
+        if faltantes or otras:
+            raise ValueError(f"Columnas no compatibles con el codificador: {faltantes + otras}")
+
+        self.columns: Tuple[str, ...] = tuple(columns)
+        self.numeric_index = np.array([columns.index(f) for f in NUMERIC_FEATURES], dtype=np.intp)
+        self.alcaldia_columns = np.array(
+            [i for i, c in enumerate(columns) if c.startswith(PREFIJO_ALCALDIA)], dtype=np.intp
+        )
+        self.alcaldias: Tuple[str, ...] = tuple(columns[i][len(PREFIJO_ALCALDIA):] for i in self.alcaldia_columns)
+        self.alcaldia_index: Dict[str, int] = {alcaldia: i for i, alcaldia in enumerate(self.alcaldias)}
+
+    @classmethod
+    def para_alcaldias(cls, alcaldias: Sequence[str]) -> 'FeatureEncoder':
+        """Codificador con el orden de columnas estándar: características numéricas y luego alcaldías"""
+        return cls(list(NUMERIC_FEATURES) + [f'{PREFIJO_ALCALDIA}{a}' for a in alcaldias])
+
+    def numeric(self, rows: Sequence[Mapping[str, Any]]) -> np.ndarray:
+        """Matriz (n, 4) con los campos numéricos de entrada de cada fila, llenada columna por columna"""
+        n = len(rows)
+        X_num = np.empty((n, len(INPUT_FIELDS)), dtype=np.float64)
+        for j, field in enumerate(INPUT_FIELDS):
+            X_num[:, j] = np.fromiter((row[field] for row in rows), dtype=np.float64, count=n)
+        return X_num
+
+    def encode(self, X_num: np.ndarray, alcaldia_idx: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Codifica un lote en una matriz (n, columnas) en el orden del modelo
+
+        Args:
+            X_num: Matriz (n, 4) con metros cuadrados, recámaras, baños y estacionamientos
+            alcaldia_idx: Vector (n,) con el índice de la alcaldía de cada fila
+            out: Arreglo opcional preasignado (n, columnas) donde escribir el resultado
+        """
+        n = X_num.shape[0]
+        if out is None:
+            out = np.zeros((n, len(self.columns)), dtype=np.float64)
+        else:
+            out.fill(0.0)
+        out[:, self.numeric_index] = X_num
+        out[np.arange(n), self.alcaldia_columns[alcaldia_idx]] = 1.0
+        return out
+
+    def encode_one(self, valores: Sequence[float], alcaldia_idx: int) -> np.ndarray:
+        """Codifica una sola propiedad en una matriz (1, columnas)"""
+        X = np.zeros((1, len(self.columns)), dtype=np.float64)
+        X[0, self.numeric_index] = valores
+        X[0, self.alcaldia_columns[alcaldia_idx]] = 1.0
+        return X
+
+    def alcaldia_idx_frame(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Índice de alcaldía de cada fila de un DataFrame, de sus columnas one-hot o de una columna `alcaldia`
+
+        Raises:
+            ValueError: Si alguna fila no corresponde a ninguna alcaldía del codificador
+        """
+        one_hot = [f'{PREFIJO_ALCALDIA}{a}' for a in self.alcaldias]
+        if all(c in df.columns for c in one_hot):
+            bloque = df[one_hot].to_numpy(dtype=np.float64)
+            idx = bloque.argmax(axis=1)
+            validas = bloque[np.arange(len(idx)), idx] > 0
+        else:
+            idx = df['alcaldia'].map(self.alcaldia_index).to_numpy()
+            validas = ~pd.isna(idx)
+            idx = np.where(validas, idx, 0)
+        if not np.all(validas):
+            raise ValueError(f"{int(np.sum(~validas))} filas sin una alcaldía conocida por el codificador")
+        return idx.astype(np.intp)
+
+    def numeric_frame(self, df: pd.DataFrame) -> np.ndarray:
+        """Matriz (n, 4) con las características numéricas de un DataFrame (con cualquiera de sus nombres)"""
+        alias = {v: k for k, v in ALIAS_COLUMNAS.items()}
+        columnas = [f if f in df.columns else alias.get(f, f) for f in NUMERIC_FEATURES]
+        return df[columnas].to_numpy(dtype=np.float64)
+
+    def encode_frame(self, df: pd.DataFrame) -> np.ndarray:
+        """Codifica un DataFrame de entrenamiento (o de evaluación) en el orden de columnas del modelo"""
+        return self.encode(self.numeric_frame(df), self.alcaldia_idx_frame(df))
\ No newline at end of file
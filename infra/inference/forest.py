@@ -0,0 +1,223 @@
+import numpy as np
+from typing import Dict, Optional, Sequence, Tuple
+from infra.inference.encoder import FeatureEncoder, escalar
+
+
+# Filas evaluadas a la vez; acota el tamaño de los arreglos de trabajo (filas × árboles)
+FILAS_POR_BLOQUE = 256
+
+
+class FlattenedForest:
+    """
+    Evaluador vectorizado para bosques de árboles de regresión (RandomForest, ExtraTrees).
+
+    Los nodos de todos los árboles se concatenan en arreglos contiguos
+    (característica, umbral, hijo izquierdo, hijo derecho, valor) con índices
+    globales. Todos los pares (fila, árbol) avanzan juntos un nivel por
+    iteración con operaciones de NumPy, y los que llegan a una hoja salen del
+    conjunto activo; el bucle de Python sólo recorre la profundidad del
+    árbol más profundo.
+
+    El escalador no se pliega en los umbrales: scikit-learn compara las
+    características escaladas convertidas a float32, y aquí se hace lo mismo
+    para obtener exactamente las mismas hojas.
+    """
+
+    # Por encima de este número de filas el recorrido en Cython de scikit-learn es más rápido;
+    # el repositorio lo usa cuando tiene el modelo original
+    filas_max: Optional[int] = 512
+
+    def __init__(self, columns: Sequence[str], feature: np.ndarray, threshold: np.ndarray,
+                 hijos: np.ndarray, value: np.ndarray, roots: np.ndarray,
+                 mean: Optional[np.ndarray] = None, scale: Optional[np.ndarray] = None):
+        """
+        Args:
+            columns: Orden de las columnas del modelo
+            feature: Columna que compara cada nodo
+            threshold: Umbral de cada nodo (+inf en las hojas)
+            hijos: Hijos izquierdo y derecho intercalados (2 × nodos); las hojas apuntan a sí mismas
+            value: Valor de cada nodo
+            roots: Índice de la raíz de cada árbol
+            mean: Media del escalador
+            scale: Escala del escalador
+        """
+        self.encoder = FeatureEncoder(columns)
+
+        # Los arreglos pueden venir de un bundle en memoria mapeada: no se copian. Los hijos
+        # van intercalados para resolver el siguiente nodo con una sola lectura
+        self.feature = feature
+        self.threshold = threshold
+        self.hijos = hijos
+        self.left = hijos[0::2]
+        self.right = hijos[1::2]
+        self.value = value
+        self.roots = roots
+        self.n_arboles = len(roots)
+        self.profundidad = self._profundidad()
+        self._hoja = self.left == np.arange(len(self.left))
+
+        self.columns = self.encoder.columns
+        self.numeric_index = self.encoder.numeric_index
+        self.alcaldia_columns = self.encoder.alcaldia_columns
+        self.alcaldias: Tuple[str, ...] = self.encoder.alcaldias
+        self.alcaldia_index: Dict[str, int] = self.encoder.alcaldia_index
+        self.mean = np.zeros(len(columns)) if mean is None else np.asarray(mean, dtype=np.float64)
+        self.scale = np.ones(len(columns)) if scale is None else np.asarray(scale, dtype=np.float64)
+
+    def _profundidad(self) -> int:
+        """Número de niveles necesarios para que todas las raíces lleguen a una hoja"""
+        frontera = np.asarray(self.roots, dtype=np.intp)
+        profundidad = 0
+        while len(frontera):
+            internos = frontera[self.left[frontera] != frontera]
+            if len(internos) == 0:
+                break
+            frontera = np.concatenate([self.left[internos], self.right[internos]])
+            profundidad += 1
+        return profundidad
+
+    @classmethod
+    def from_sklearn(cls, model, scaler, columns: Sequence[str]) -> 'FlattenedForest':
+        """
+        Aplana un bosque (o un solo árbol) de regresión de scikit-learn
+
+        Raises:
+            TypeError: Si el modelo no es un árbol o un bosque de regresión promediado
+            ValueError: Si las columnas no son compatibles
+        """
+        if hasattr(model, 'tree_'):
+            arboles = [model]
+        elif hasattr(model, 'estimators_') and not hasattr(model, 'learning_rate'):
+            arboles = list(model.estimators_)
+        else:
+            raise TypeError(f"El modelo {type(model).__name__} no es un bosque de regresión")
+        if not arboles or not all(hasattr(a, 'tree_') for a in arboles):
+            raise TypeError(f"El modelo {type(model).__name__} no es un bosque de regresión")
+        if any(a.tree_.value.shape[1] != 1 for a in arboles):
+            raise TypeError("Sólo se soportan bosques con una sola salida")
+
+        features, thresholds, hijos, values, roots = [], [], [], [], []
+        offset = 0
+        for arbol in arboles:
+            tree = arbol.tree_
+            n = tree.node_count
+            indices = np.arange(n, dtype=np.intp)
+            hoja = tree.children_left < 0
+            # Las hojas apuntan a sí mismas y comparan contra +inf (siempre a la "izquierda")
+            features.append(np.where(hoja, 0, tree.feature).astype(np.intp))
+            thresholds.append(np.where(hoja, np.inf, tree.threshold).astype(np.float64))
+            hijos.append(np.column_stack([
+                np.where(hoja, indices, tree.children_left),
+                np.where(hoja, indices, tree.children_right)
+            ]).ravel() + offset)
+            values.append(tree.value[:, 0, 0].astype(np.float64))
+            roots.append(offset)
+            offset += n
+
+        mean = scale = None
+        if scaler is not None:
+            mean = getattr(scaler, 'mean_', None) if getattr(scaler, 'with_mean', True) else None
+            scale = getattr(scaler, 'scale_', None) if getattr(scaler, 'with_std', True) else None
+        return cls(
+            columns,
+            np.concatenate(features),
+            np.concatenate(thresholds),
+            np.concatenate(hijos).astype(np.intp),
+            np.concatenate(values),
+            np.array(roots, dtype=np.intp),
+            mean,
+            scale
+        )
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """Arreglos que definen el bosque (para guardarlo en un bundle)"""
+        return {
+            'arbol_feature': np.asarray(self.feature),
+            'arbol_threshold': np.asarray(self.threshold),
+            'arbol_hijos': np.asarray(self.hijos),
+            'arbol_valor': np.asarray(self.value),
+            'arbol_raices': np.asarray(self.roots)
+        }
+
+    def _matriz(self, X_num: np.ndarray, alcaldia_idx: np.ndarray) -> np.ndarray:
+        """Matriz escalada en float32, en el orden de columnas del modelo"""
+        X = self.encoder.encode(X_num, alcaldia_idx)
+        X -= self.mean
+        X /= self.scale
+        return X.astype(np.float32)
+
+    def predict_log_batch(self, X_num: np.ndarray, alcaldia_idx: np.ndarray,
+                          out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Evalúa el bosque sobre un lote de propiedades
+
+        Args:
+            X_num: Matriz (n, 4) con las características numéricas
+            alcaldia_idx: Vector (n,) con el índice de la alcaldía de cada fila
+            out: Arreglo opcional preasignado donde escribir el resultado
+        """
+        n = X_num.shape[0]
+        out = np.empty(n) if out is None else out
+        # Recorrer por bloques de filas para que los arreglos de trabajo quepan en caché
+        for inicio in range(0, n, FILAS_POR_BLOQUE):
+            fin = min(inicio + FILAS_POR_BLOQUE, n)
+            out[inicio:fin] = self._evaluar_bloque(self._matriz(X_num[inicio:fin], alcaldia_idx[inicio:fin]))
+        return out
+
+    def _evaluar_bloque(self, X: np.ndarray) -> np.ndarray:
+        """Recorre todos los árboles para un bloque de filas ya escaladas"""
+        n = X.shape[0]
+        X = X.ravel()
+        # Un par (fila, árbol) por posición; `base` es el desplazamiento de la fila en X
+        nodos = np.tile(np.asarray(self.roots, dtype=np.intp), n)
+        base = np.repeat(np.arange(n, dtype=np.intp) * len(self.columns), self.n_arboles)
+        activos = np.arange(n * self.n_arboles, dtype=np.intp)
+        for _ in range(self.profundidad):
+            actuales = nodos[activos]
+            derecha = X[base[activos] + self.feature[actuales]] > self.threshold[actuales]
+            siguientes = self.hijos[2 * actuales + derecha]
+            nodos[activos] = siguientes
+            # Los pares que ya llegaron a una hoja dejan de recorrerse
+            activos = activos[~self._hoja[siguientes]]
+            if len(activos) == 0:
+                break
+        return self.value[nodos].reshape(n, self.n_arboles).mean(axis=1)
+
+    def predict_log(self, alcaldia_idx: int, valores: Sequence[float]) -> float:
+        """
+        Evalúa el bosque para una sola propiedad
+
+        Args:
+            alcaldia_idx: Índice de la alcaldía en `self.alcaldias`
+            valores: dimensiones, recámaras, baños y estacionamientos
+        """
+        X_num = np.asarray(valores, dtype=np.float64).reshape(1, -1)
+        return float(self.predict_log_batch(X_num, np.array([alcaldia_idx]))[0])
+
+    def verify(self, model, scaler, n: int = 256, tol: float = 1e-9, seed: int = 0) -> float:
+        """
+        Compara el bosque aplanado contra scaler.transform + model.predict
+
+        Returns:
+            Máxima diferencia absoluta
+
+        Raises:
+            ValueError: Si la diferencia supera la tolerancia
+        """
+        rng = np.random.default_rng(seed)
+        X_num = np.column_stack([
+            rng.uniform(20, 2000, n),
+            rng.integers(1, 7, n),
+            rng.integers(1, 6, n),
+            rng.integers(0, 5, n)
+        ]).astype(np.float64)
+        alcaldia_idx = rng.integers(0, len(self.alcaldias), n)
+
+        X = escalar(scaler, self.encoder.encode(X_num, alcaldia_idx))
+
+        esperado = model.predict(X)
+        obtenido = self.predict_log_batch(X_num, alcaldia_idx)
+        error = float(np.max(np.abs(esperado - obtenido)))
+        if not error <= tol * max(1.0, float(np.max(np.abs(esperado)))):
+            raise ValueError(f"El bosque aplanado difiere del modelo original: {error}")
+        return error
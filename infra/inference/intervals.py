@@ -0,0 +1,94 @@
+import bisect
+import numpy as np
+from typing import Dict, Optional, Sequence, Tuple
+
+
+# Niveles de confianza precalculados: 0.50, 0.51, ..., 0.99
+NIVELES = tuple(round(0.5 + i / 100, 2) for i in range(50))
+
+# Mínimo de residuos de calibración para usar el cuantil propio de una alcaldía
+MIN_MUESTRAS = 20
+
+
+def _cuantil_conforme(residuos: np.ndarray, nivel: float) -> float:
+    """
+    Cuantil de conformal prediction (split conformal) de los residuos absolutos
+
+    Se toma el residuo en la posición ceil((n + 1) · nivel) de los residuos
+    ordenados, lo que garantiza una cobertura de al menos `nivel` en datos
+    intercambiables con los de calibración.
+    """
+    n = len(residuos)
+    k = int(np.ceil((n + 1) * nivel))
+    if k > n:
+        return float(np.max(residuos))
+    return float(np.partition(residuos, k - 1)[k - 1])
+
+
+class TablaResiduos:
+    """
+    Tabla de cuantiles de residuos (en logaritmo del precio) por alcaldía y nivel.
+
+    El intervalo de una predicción es [precio · e^-q, precio · e^q], con q el
+    cuantil de su alcaldía para el nivel pedido: una búsqueda en la tabla, sin
+    evaluar modelos adicionales.
+    """
+
+    def __init__(self, niveles: np.ndarray, cuantiles: np.ndarray):
+        """
+        Args:
+            niveles: Vector (k,) ordenado de niveles de confianza
+            cuantiles: Matriz (alcaldías, k) con el cuantil de cada alcaldía y nivel
+        """
+        self.niveles = niveles
+        self.cuantiles = cuantiles
+        self._niveles_tuple = tuple(float(n) for n in niveles)
+
+    @classmethod
+    def calibrar(cls, residuos: np.ndarray, alcaldia_idx: np.ndarray, n_alcaldias: int,
+                 niveles: Sequence[float] = NIVELES, min_muestras: int = MIN_MUESTRAS) -> 'TablaResiduos':
+        """
+        Calcula la tabla con residuos de un conjunto de calibración (no usado para entrenar)
+
+        Args:
+            residuos: Diferencia entre el logaritmo del precio real y el predicho
+            alcaldia_idx: Índice de la alcaldía de cada residuo
+            n_alcaldias: Número de alcaldías del modelo
+            niveles: Niveles de confianza a precalcular
+            min_muestras: Las alcaldías con menos residuos usan los cuantiles globales
+        """
+        residuos = np.abs(np.asarray(residuos, dtype=np.float64))
+        alcaldia_idx = np.asarray(alcaldia_idx)
+        niveles = np.array(sorted(niveles), dtype=np.float64)
+
+        globales = np.array([_cuantil_conforme(residuos, nivel) for nivel in niveles])
+        cuantiles = np.tile(globales, (n_alcaldias, 1))
+        for i in range(n_alcaldias):
+            propios = residuos[alcaldia_idx == i]
+            if len(propios) >= min_muestras:
+                cuantiles[i] = [_cuantil_conforme(propios, nivel) for nivel in niveles]
+        # Un nivel más alto nunca debe dar un intervalo más angosto
+        cuantiles = np.maximum.accumulate(cuantiles, axis=1)
+        return cls(niveles, cuantiles)
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """Arreglos de la tabla (para guardarla en un bundle)"""
+        return {'residuos_niveles': np.asarray(self.niveles), 'residuos_cuantiles': np.asarray(self.cuantiles)}
+
+    @classmethod
+    def from_arrays(cls, arreglos) -> Optional['TablaResiduos']:
+        """Construye la tabla desde los arreglos de un bundle (None si el bundle no la tiene)"""
+        if 'residuos_niveles' not in arreglos or 'residuos_cuantiles' not in arreglos:
+            return None
+        return cls(arreglos['residuos_niveles'], arreglos['residuos_cuantiles'])
+
+    def cuantil(self, alcaldia_idx: int, nivel: float) -> float:
+        """Cuantil del menor nivel precalculado que sea mayor o igual al pedido"""
+        niveles = self._niveles_tuple
+        j = bisect.bisect_left(niveles, nivel - 1e-9)
+        return float(self.cuantiles[alcaldia_idx, min(j, len(niveles) - 1)])
+
+    def intervalo(self, alcaldia_idx: int, precio: float, nivel: float) -> Tuple[float, float]:
+        """Límites inferior y superior del precio para el nivel de confianza pedido"""
+        q = self.cuantil(alcaldia_idx, nivel)
+        return precio * float(np.exp(-q)), precio * float(np.exp(q))
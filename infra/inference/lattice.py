@@ -0,0 +1,183 @@
+import json
+import os
+from bisect import bisect_right
+import numpy as np
+from typing import Dict, Optional, Sequence, Tuple
+
+
+# m² por defecto de los nodos de la malla: espaciado geométrico entre 20 y 5,000 m²
+KNOTS_M2 = tuple(float(k) for k in np.round(np.geomspace(20, 5000, 96), 2))
+
+
+class PrediccionLattice:
+    """
+    Malla precalculada de predicciones servida desde un arreglo en memoria mapeada.
+
+    El espacio de entrada está acotado: alcaldía × recámaras × baños ×
+    estacionamientos es una malla finita, y sólo los metros cuadrados son
+    continuos. La malla guarda el logaritmo del precio en cada combinación
+    para un conjunto de nodos de m²; una predicción es una búsqueda más una
+    interpolación lineal a lo largo de m². Como el arreglo se abre con
+    `mmap_mode='r'`, todos los workers comparten las mismas páginas.
+
+    Los archivos son `<ruta>.npy` (valores) y `<ruta>.json` (metadatos).
+    """
+
+    def __init__(self, valores: np.ndarray, knots: Sequence[float], alcaldias: Sequence[str],
+                 rangos: Dict[str, Tuple[int, int]], version: str, error_maximo: Dict[str, float]):
+        self.valores = valores
+        self.knots = np.asarray(knots, dtype=np.float64)
+        self.alcaldias = tuple(alcaldias)
+        self.rangos = {feature: (int(a), int(b)) for feature, (a, b) in rangos.items()}
+        self.version = version
+        self.error_maximo = error_maximo
+        self._minimos = np.array([self.rangos[f][0] for f in ('recamaras', 'banos', 'estacionamientos')])
+        self._maximos = np.array([self.rangos[f][1] for f in ('recamaras', 'banos', 'estacionamientos')])
+        self._knots_tuple = tuple(float(k) for k in self.knots)
+        # Vista plana sobre las mismas páginas mapeadas: indexar un memoryview es mucho más
+        # barato que indexar el memmap de numpy para una sola predicción
+        self._plano = memoryview(np.ascontiguousarray(valores).reshape(-1)).cast('B').cast('d')
+        self._pasos = tuple(s // valores.itemsize for s in valores.strides)
+        self._rangos_enteros = tuple(
+            (self.rangos[f][0], self.rangos[f][1]) for f in ('recamaras', 'banos', 'estacionamientos')
+        )
+
+    @staticmethod
+    def _rutas(ruta: str) -> Tuple[str, str]:
+        return f"{ruta}.npy", f"{ruta}.json"
+
+    @classmethod
+    def build(cls, repo, ruta: str, knots: Sequence[float] = KNOTS_M2,
+              n_validacion: int = 20000, seed: int = 0) -> 'PrediccionLattice':
+        """
+        Evalúa el modelo sobre toda la malla y la guarda en disco
+
+        Args:
+            repo: Repositorio del modelo (se usa su camino de predicción sin malla)
+            ruta: Ruta base de los archivos, sin extensión
+            knots: Nodos de m² de la malla
+            n_validacion: Puntos aleatorios con los que se mide el error contra el modelo
+        """
+        knots = np.asarray(sorted(knots), dtype=np.float64)
+        rangos = {f: tuple(repo.limits[f]) for f in ('recamaras', 'banos', 'estacionamientos')}
+        ejes = [np.arange(len(repo.alcaldias))]
+        ejes += [np.arange(rangos[f][0], rangos[f][1] + 1) for f in ('recamaras', 'banos', 'estacionamientos')]
+        forma = tuple(len(eje) for eje in ejes) + (len(knots),)
+
+        # Una sola llamada al modelo para toda la malla
+        malla = np.meshgrid(*ejes, knots, indexing='ij')
+        alcaldia_idx = malla[0].ravel()
+        X_num = np.column_stack([malla[4].ravel(), malla[1].ravel(), malla[2].ravel(), malla[3].ravel()]).astype(np.float64)
+        log_precios = repo._predict_log_model(X_num, alcaldia_idx).reshape(forma)
+
+        ruta_npy, ruta_json = cls._rutas(ruta)
+        os.makedirs(os.path.dirname(os.path.abspath(ruta_npy)), exist_ok=True)
+        # Escribir a un archivo temporal y reemplazar para que los lectores nunca vean una malla a medias
+        temporal = f"{ruta_npy}.tmp"
+        valores = np.lib.format.open_memmap(temporal, mode='w+', dtype=np.float64, shape=forma)
+        valores[...] = log_precios
+        valores.flush()
+        del valores
+        os.replace(temporal, ruta_npy)
+
+        lattice = cls(np.load(ruta_npy, mmap_mode='r'), knots, repo.alcaldias, rangos, repo.version, {})
+        lattice.error_maximo = lattice.medir_error(repo, n_validacion, seed)
+        with open(f"{ruta_json}.tmp", 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': repo.version,
+                'knots': knots.tolist(),
+                'alcaldias': list(repo.alcaldias),
+                'rangos': rangos,
+                'error_maximo': lattice.error_maximo
+            }, f, ensure_ascii=False, indent=2)
+        os.replace(f"{ruta_json}.tmp", ruta_json)
+        return lattice
+
+    @classmethod
+    def load(cls, ruta: str) -> 'PrediccionLattice':
+        """
+        Abre una malla en memoria mapeada
+
+        Raises:
+            FileNotFoundError: Si no existen los archivos de la malla
+        """
+        ruta_npy, ruta_json = cls._rutas(ruta)
+        with open(ruta_json, encoding='utf-8') as f:
+            meta = json.load(f)
+        return cls(
+            np.load(ruta_npy, mmap_mode='r'),
+            meta['knots'],
+            meta['alcaldias'],
+            meta['rangos'],
+            meta['version'],
+            meta['error_maximo']
+        )
+
+    def medir_error(self, repo, n: int = 20000, seed: int = 0) -> Dict[str, float]:
+        """Compara la malla contra el modelo en puntos aleatorios dentro de su dominio"""
+        rng = np.random.default_rng(seed)
+        X_num = np.column_stack([
+            rng.uniform(self.knots[0], self.knots[-1], n),
+            rng.integers(self._minimos[0], self._maximos[0] + 1, n),
+            rng.integers(self._minimos[1], self._maximos[1] + 1, n),
+            rng.integers(self._minimos[2], self._maximos[2] + 1, n)
+        ]).astype(np.float64)
+        alcaldia_idx = rng.integers(0, len(self.alcaldias), n)
+
+        esperado = repo._predict_log_model(X_num, alcaldia_idx)
+        obtenido = self.predict_log_batch(X_num, alcaldia_idx)
+        error_log = np.abs(obtenido - esperado)
+        return {
+            'log_precio': float(np.max(error_log)),
+            'relativo': float(np.max(np.expm1(error_log)))
+        }
+
+    def predict_log(self, alcaldia_idx: int, valores: Sequence[float]) -> Optional[float]:
+        """
+        Predice el logaritmo del precio de una sola propiedad
+
+        Returns:
+            El logaritmo del precio, o None si la propiedad está fuera del dominio de la malla
+        """
+        m2, recamaras, banos, estacionamientos = valores
+        knots = self._knots_tuple
+        if not knots[0] <= m2 <= knots[-1]:
+            return None
+        offset = alcaldia_idx * self._pasos[0]
+        for valor, (minimo, maximo), paso in zip((recamaras, banos, estacionamientos), self._rangos_enteros, self._pasos[1:4]):
+            if valor != int(valor) or not minimo <= valor <= maximo:
+                return None
+            offset += (int(valor) - minimo) * paso
+
+        j = min(bisect_right(knots, m2) - 1, len(knots) - 2)
+        t = (m2 - knots[j]) / (knots[j + 1] - knots[j])
+        izquierda = self._plano[offset + j]
+        return izquierda + t * (self._plano[offset + j + 1] - izquierda)
+
+    def predict_log_batch(self, X_num: np.ndarray, alcaldia_idx: np.ndarray) -> np.ndarray:
+        """
+        Predice el logaritmo del precio de un lote
+
+        Returns:
+            Vector con el logaritmo del precio; NaN en las filas fuera del dominio de la malla
+        """
+        m2 = X_num[:, 0]
+        enteros = X_num[:, 1:]
+        cubiertas = (
+            (m2 >= self.knots[0]) & (m2 <= self.knots[-1])
+            & np.all(enteros == np.round(enteros), axis=1)
+            & np.all((enteros >= self._minimos) & (enteros <= self._maximos), axis=1)
+        )
+        resultado = np.full(X_num.shape[0], np.nan)
+        filas = np.flatnonzero(cubiertas)
+        if len(filas) == 0:
+            return resultado
+
+        indices = (enteros[filas] - self._minimos).astype(np.intp)
+        j = np.clip(np.searchsorted(self.knots, m2[filas], side='right') - 1, 0, len(self.knots) - 2)
+        t = (m2[filas] - self.knots[j]) / (self.knots[j + 1] - self.knots[j])
+        base = (alcaldia_idx[filas], indices[:, 0], indices[:, 1], indices[:, 2])
+        izquierda = self.valores[base + (j,)]
+        derecha = self.valores[base + (j + 1,)]
+        resultado[filas] = izquierda + t * (derecha - izquierda)
+        return resultado
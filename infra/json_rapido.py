@@ -0,0 +1,149 @@
+"""
+Serialización rápida de las respuestas de predicción.
+
+El camino normal construye un `Prediccion` de pydantic por fila y FastAPI lo
+vuelve a validar y a convertir en diccionarios antes de `json.dumps`. Con
+`FENNEC_JSON_RAPIDO` los endpoints de predicción escriben directamente los
+bytes de la respuesta: las partes constantes de cada objeto (llaves, tipo de
+propiedad, alcaldías ya vistas) se codifican una sola vez y cada fila sólo
+formatea sus números. Si orjson está instalado se usa para el resto de los
+valores; si no, el módulo `json` de la biblioteca estándar.
+"""
+import json
+import math
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from starlette.responses import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende del entorno
+    orjson = None
+
+
+# Máximo de nombres de alcaldía codificados que se conservan (la alcaldía viene tal como la escribió el usuario)
+MAX_ALCALDIAS_CODIFICADAS = 1024
+
+
+def dumps(valor: Any) -> bytes:
+    """Codifica un valor en JSON compacto (orjson si está instalado)"""
+    if orjson is not None:
+        return orjson.dumps(valor)
+    return json.dumps(valor, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class RespuestaJSON(Response):
+    """Respuesta JSON que usa orjson si está instalado y deja pasar bytes ya codificados"""
+
+    media_type = 'application/json'
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
+
+
+def _numero(valor: float) -> bytes:
+    """Formatea un float como lo haría `json.dumps` (null si no es finito)"""
+    if not math.isfinite(valor):
+        return b'null'
+    return repr(valor).encode('ascii')
+
+
+class CodificadorPredicciones:
+    """
+    Escribe en JSON las predicciones de un tipo de propiedad con fragmentos precodificados
+
+    Produce exactamente los mismos campos, en el mismo orden, que `Prediccion`
+    y `PrediccionLote` serializados por FastAPI.
+    """
+
+    def __init__(self, tipo_propiedad: str, decimales: Optional[int] = None):
+        """
+        Args:
+            tipo_propiedad: Valor del campo tipo_propiedad (ej: 'casa')
+            decimales: Decimales a los que se redondean los precios (None para no redondear)
+        """
+        self.tipo_propiedad = tipo_propiedad
+        self.decimales = decimales
+        tipo = dumps(tipo_propiedad)
+        self._prediccion = b'{"tipo_propiedad":' + tipo + b',"precio_estimado":'
+        self._lote = b'{"tipo_propiedad":' + tipo + b',"total":'
+        self._alcaldias: Dict[str, bytes] = {}
+
+    def _alcaldia(self, alcaldia: str) -> bytes:
+        codificada = self._alcaldias.get(alcaldia)
+        if codificada is None:
+            codificada = dumps(alcaldia)
+            if len(self._alcaldias) < MAX_ALCALDIAS_CODIFICADAS:
+                self._alcaldias[alcaldia] = codificada
+        return codificada
+
+    def _precio(self, precio: float) -> bytes:
+        return _numero(round(precio, self.decimales) if self.decimales is not None else precio)
+
+    def _partes_prediccion(self, partes: List[bytes], input_data, precio: float, fecha: bytes,
+                           intervalo: Optional[Tuple[float, float]], nivel: Optional[float]) -> None:
+        partes += (
+            self._prediccion, self._precio(float(precio)),
+            b',"alcaldia":', self._alcaldia(input_data.alcaldia),
+            b',"caracteristicas":{"metros_cuadrados":', _numero(float(input_data.metros_cuadrados)),
+            b',"recamaras":', _numero(float(input_data.recamaras)),
+            b',"banos":', _numero(float(input_data.banos)),
+            b',"estacionamientos":', _numero(float(input_data.estacionamientos)),
+            b'},"fecha_prediccion":', fecha
+        )
+        if intervalo:
+            partes += (
+                b',"precio_minimo":', self._precio(intervalo[0]),
+                b',"precio_maximo":', self._precio(intervalo[1]),
+                b',"nivel_confianza":', _numero(float(nivel)), b'}'
+            )
+        else:
+            partes.append(b',"precio_minimo":null,"precio_maximo":null,"nivel_confianza":null}')
+
+    def prediccion(self, input_data, precio: float, fecha_prediccion: str,
+                   intervalo: Optional[Tuple[float, float]] = None, nivel: Optional[float] = None) -> bytes:
+        """
+        Codifica la predicción de una propiedad
+
+        Args:
+            input_data: Datos de entrada de la propiedad (alcaldía y características)
+            precio: Precio predicho
+            fecha_prediccion: Fecha de la predicción en formato ISO
+            intervalo: Precio mínimo y máximo (None si el modelo no tiene tabla de residuos)
+            nivel: Nivel de confianza del intervalo
+        """
+        partes: List[bytes] = []
+        self._partes_prediccion(partes, input_data, precio, dumps(fecha_prediccion), intervalo, nivel)
+        return b''.join(partes)
+
+    def lote(self, input_data: Sequence, precios: Sequence[float], errores: Sequence[Optional[Exception]],
+             fecha_prediccion: str) -> bytes:
+        """
+        Codifica un lote de predicciones con el error de cada fila inválida
+
+        Args:
+            input_data: Datos de entrada de cada fila
+            precios: Precio de cada fila (ignorado en las filas con error)
+            errores: Error de cada fila (None si es válida)
+            fecha_prediccion: Fecha de la predicción en formato ISO (la misma para todo el lote)
+        """
+        fecha = dumps(fecha_prediccion)
+        exitosas = sum(1 for error in errores if error is None)
+        partes: List[bytes] = [
+            self._lote, str(len(input_data)).encode('ascii'),
+            b',"exitosas":', str(exitosas).encode('ascii'),
+            b',"resultados":['
+        ]
+        for indice, (item, precio, error) in enumerate(zip(input_data, precios, errores)):
+            if indice:
+                partes.append(b',')
+            partes += (b'{"indice":', str(indice).encode('ascii'))
+            if error is not None:
+                partes += (b',"prediccion":null,"error":', dumps(str(error)), b'}')
+                continue
+            partes.append(b',"prediccion":')
+            self._partes_prediccion(partes, item, precio, fecha, None, None)
+            partes.append(b',"error":null}')
+        partes.append(b']}')
+        return b''.join(partes)
\ No newline at end of file
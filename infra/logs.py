@@ -0,0 +1,107 @@
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+
+from infra.config import get_settings
+
+
+# Paquetes de la aplicación cuyos registros pasan por la cola
+PAQUETES = ('app', 'domain', 'infra', 'usecases')
+
+# Atributos estándar de un LogRecord (el resto son campos agregados con `extra=`)
+_ATRIBUTOS_ESTANDAR = frozenset(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'taskName'}
+
+
+class JsonFormatter(logging.Formatter):
+    """Formatea cada registro como una línea JSON con los campos pasados en `extra`"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        registro: Dict[str, Any] = {
+            'ts': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            'nivel': record.levelname,
+            'logger': record.name,
+            'mensaje': record.getMessage()
+        }
+        for campo, valor in vars(record).items():
+            if campo not in _ATRIBUTOS_ESTANDAR:
+                registro[campo] = valor
+        if record.exc_info:
+            registro['excepcion'] = self.formatException(record.exc_info)
+        return json.dumps(registro, ensure_ascii=False, default=str)
+
+
+class MuestreoFilter(logging.Filter):
+    """
+    Deja pasar sólo una fracción de los registros de depuración.
+
+    Los registros INFO y superiores pasan siempre; los DEBUG (uno o varios por
+    petición) pasan con probabilidad `tasa`, de modo que activar la depuración
+    en producción no multiplica el volumen de logs.
+    """
+
+    def __init__(self, tasa: float = 1.0):
+        super().__init__()
+        self.tasa = tasa
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.INFO or self.tasa >= 1.0:
+            return True
+        return random.random() < self.tasa
+
+
+_listener: Optional[QueueListener] = None
+
+
+def configure_logging() -> None:
+    """
+    Configura los logs de la aplicación a partir de la configuración del proceso
+
+    Los registros se encolan desde el hilo que los genera (sin I/O) y un hilo
+    aparte los formatea y escribe en stderr. La función es idempotente.
+    """
+    global _listener
+    if _listener is not None:
+        return
+    settings = get_settings()
+
+    salida = logging.StreamHandler(sys.stderr)
+    if settings.log_formato == 'json':
+        salida.setFormatter(JsonFormatter())
+    else:
+        salida.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+
+    cola: queue.SimpleQueue = queue.SimpleQueue()
+    manejador = QueueHandler(cola)
+    # El muestreo se decide antes de encolar para que los registros descartados no cuesten nada más
+    manejador.addFilter(MuestreoFilter(settings.log_muestreo))
+
+    for paquete in PAQUETES:
+        logger = logging.getLogger(paquete)
+        logger.handlers = [manejador]
+        logger.propagate = False
+        logger.setLevel(settings.log_nivel)
+
+    # Niveles por logger, ej: FENNEC_LOG_NIVELES="infra.data.base_repo=DEBUG,usecases=WARNING"
+    for nombre, nivel in settings.log_niveles.items():
+        logging.getLogger(nombre).setLevel(nivel)
+
+    _listener = QueueListener(cola, salida, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Vacía la cola de logs y detiene el hilo que los escribe"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+# Se registra una sola vez: configure_logging se vuelve a llamar alrededor de cada fork
+atexit.register(shutdown_logging)
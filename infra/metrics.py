@@ -0,0 +1,157 @@
+import bisect
+import threading
+from typing import Any, Dict, Optional, Sequence
+
+
+class Counter:
+    """Contador monotónico seguro entre hilos"""
+
+    def __init__(self):
+        self._valor = 0
+        self._lock = threading.Lock()
+
+    def inc(self, cantidad: int = 1) -> None:
+        with self._lock:
+            self._valor += cantidad
+
+    @property
+    def valor(self) -> int:
+        return self._valor
+
+    def snapshot(self) -> int:
+        return self._valor
+
+
+class Gauge:
+    """Valor instantáneo que puede subir o bajar"""
+
+    def __init__(self):
+        self._valor = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, valor: float) -> None:
+        self._valor = valor
+
+    def inc(self, cantidad: float = 1) -> None:
+        with self._lock:
+            self._valor += cantidad
+
+    def dec(self, cantidad: float = 1) -> None:
+        with self._lock:
+            self._valor -= cantidad
+
+    @property
+    def valor(self) -> float:
+        return self._valor
+
+    def snapshot(self) -> float:
+        return self._valor
+
+
+class Histogram:
+    """Histograma de cubetas fijas con conteo, suma, mínimo y máximo"""
+
+    def __init__(self, cubetas: Sequence[float]):
+        self.cubetas = tuple(sorted(cubetas))
+        self._conteos = [0] * (len(self.cubetas) + 1)
+        self._conteo = 0
+        self._suma = 0.0
+        self._minimo: Optional[float] = None
+        self._maximo: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def observe(self, valor: float) -> None:
+        i = bisect.bisect_left(self.cubetas, valor)
+        with self._lock:
+            self._conteos[i] += 1
+            self._conteo += 1
+            self._suma += valor
+            if self._minimo is None or valor < self._minimo:
+                self._minimo = valor
+            if self._maximo is None or valor > self._maximo:
+                self._maximo = valor
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            etiquetas = [f"<={limite:g}" for limite in self.cubetas] + [f">{self.cubetas[-1]:g}"]
+            return {
+                'conteo': self._conteo,
+                'suma': self._suma,
+                'promedio': self._suma / self._conteo if self._conteo else 0.0,
+                'minimo': self._minimo,
+                'maximo': self._maximo,
+                'cubetas': dict(zip(etiquetas, self._conteos))
+            }
+
+
+class RunningStats:
+    """Media, desviación estándar, mínimo y máximo en streaming (algoritmo de Welford)"""
+
+    def __init__(self):
+        self._conteo = 0
+        self._media = 0.0
+        self._m2 = 0.0
+        self._minimo: Optional[float] = None
+        self._maximo: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def observe(self, valor: float) -> None:
+        with self._lock:
+            self._conteo += 1
+            delta = valor - self._media
+            self._media += delta / self._conteo
+            self._m2 += delta * (valor - self._media)
+            if self._minimo is None or valor < self._minimo:
+                self._minimo = valor
+            if self._maximo is None or valor > self._maximo:
+                self._maximo = valor
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'conteo': self._conteo,
+                'promedio': self._media,
+                'desviacion': (self._m2 / (self._conteo - 1)) ** 0.5 if self._conteo > 1 else 0.0,
+                'minimo': self._minimo,
+                'maximo': self._maximo
+            }
+
+
+class MetricsRegistry:
+    """Registro de métricas del proceso, indexadas por nombre"""
+
+    def __init__(self):
+        self._metricas: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _obtener(self, nombre: str, fabrica):
+        metrica = self._metricas.get(nombre)
+        if metrica is None:
+            with self._lock:
+                metrica = self._metricas.setdefault(nombre, fabrica())
+        return metrica
+
+    def counter(self, nombre: str) -> Counter:
+        return self._obtener(nombre, Counter)
+
+    def gauge(self, nombre: str) -> Gauge:
+        return self._obtener(nombre, Gauge)
+
+    def histogram(self, nombre: str, cubetas: Sequence[float]) -> Histogram:
+        return self._obtener(nombre, lambda: Histogram(cubetas))
+
+    def running_stats(self, nombre: str) -> RunningStats:
+        return self._obtener(nombre, RunningStats)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Devuelve el valor actual de todas las métricas"""
+        return {nombre: metrica.snapshot() for nombre, metrica in sorted(self._metricas.items())}
+
+
+# Instancia única compartida por todo el proceso
+_metrics = MetricsRegistry()
+
+
+def get_metrics() -> MetricsRegistry:
+    """Devuelve el registro de métricas del proceso"""
+    return _metrics
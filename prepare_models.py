@@ -3,82 +3,67 @@ import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LinearRegression
 from sklearn.preprocessing import StandardScaler
-import joblib
+from datetime import datetime
+from infra.data.model_store import publicar_version
+from infra.inference.encoder import FeatureEncoder, NUMERIC_FEATURES
+from infra.inference.intervals import TablaResiduos
 
-# Función principal para entrenar modelos
-def train_models():
-    print("Entrenando modelo para casas...")
-    # Cargar datos de casas
-    casas_df = pd.read_csv('new_casas.csv')
-    
-    # Seleccionar características para el modelo
-    feature_cols = ['dimensiones', 'recamaras', 'banos', 'estacionamientos']
-    casas_alcaldia_cols = [col for col in casas_df.columns if col.startswith('alcaldia_')]
-    casas_features = casas_df[feature_cols + casas_alcaldia_cols]
-    casas_target = casas_df['log_precio']  # Usamos el logaritmo del precio
-    
-    # Dividir en entrenamiento y prueba
-    X_train, X_test, y_train, y_test = train_test_split(casas_features, casas_target, test_size=0.2, random_state=42)
-    
-    # Escalar características
-    scaler = StandardScaler()
-    X_train_scaled = scaler.fit_transform(X_train)
-    X_test_scaled = scaler.transform(X_test)
-    
-    # Guardar el scaler
-    joblib.dump(scaler, 'casas_scaler.joblib')
-    
-    # Entrenar el modelo
-    model = LinearRegression()
-    model.fit(X_train_scaled, y_train)
-    
-    # Evaluar el modelo
-    score = model.score(X_test_scaled, y_test)
-    print(f"R² para casas: {score:.4f}")
-    
-    # Guardar el modelo
-    joblib.dump(model, 'casas_model.joblib')
-    
-    # Guardar las columnas para referencia
-    column_names = X_train.columns.tolist()
-    joblib.dump(column_names, 'casas_columns.joblib')
-    
-    print("Entrenando modelo para departamentos...")
-    # Cargar datos de departamentos
-    deptos_df = pd.read_csv('new_departamentos.csv')
-    
-    # Seleccionar características para el modelo
-    deptos_alcaldia_cols = [col for col in deptos_df.columns if col.startswith('alcaldia_')]
-    deptos_features = deptos_df[feature_cols + deptos_alcaldia_cols]
-    deptos_target = deptos_df['log_precio']  # Usamos el logaritmo del precio
+
+def calibrar_intervalos(model, X_test_scaled, y_test, alcaldia_idx, n_alcaldias):
+    """
+    Cuantiles de residuos por alcaldía sobre el conjunto de prueba (no usado para entrenar),
+    para servir intervalos de predicción sin evaluar modelos adicionales
+    """
+    residuos = y_test - model.predict(X_test_scaled)
+    return TablaResiduos.calibrar(residuos, alcaldia_idx, n_alcaldias)
+
+# Entrena y publica el modelo de un tipo de propiedad
+def entrenar_modelo(tipo, archivo, version):
+    print(f"Entrenando modelo para {tipo}...")
+    df = pd.read_csv(archivo)
+    
+    # El codificador se construye con el orden de columnas del modelo; es el mismo que usa el servicio
+    alcaldia_cols = [col for col in df.columns if col.startswith('alcaldia_')]
+    encoder = FeatureEncoder(list(NUMERIC_FEATURES) + alcaldia_cols)
+    X = encoder.encode_frame(df)
+    alcaldia_idx = encoder.alcaldia_idx_frame(df)
+    y = df['log_precio'].to_numpy(dtype=np.float64)  # Usamos el logaritmo del precio
     
     # Dividir en entrenamiento y prueba
-    X_train, X_test, y_train, y_test = train_test_split(deptos_features, deptos_target, test_size=0.2, random_state=42)
+    X_train, X_test, y_train, y_test, _, idx_test = train_test_split(
+        X, y, alcaldia_idx, test_size=0.2, random_state=42
+    )
     
     # Escalar características
     scaler = StandardScaler()
     X_train_scaled = scaler.fit_transform(X_train)
     X_test_scaled = scaler.transform(X_test)
     
-    # Guardar el scaler
-    joblib.dump(scaler, 'departamentos_scaler.joblib')
-    
     # Entrenar el modelo
     model = LinearRegression()
     model.fit(X_train_scaled, y_train)
     
     # Evaluar el modelo
     score = model.score(X_test_scaled, y_test)
-    print(f"R² para departamentos: {score:.4f}")
-    
-    # Guardar el modelo
-    joblib.dump(model, 'departamentos_model.joblib')
+    print(f"R² para {tipo}: {score:.4f}")
+    
+    # Publicar el modelo, el scaler y las columnas del codificador como un bundle en una nueva versión
+    publicar_version(tipo, model, scaler, list(encoder.columns), version, metadatos={
+        'r2': score,
+        'filas_entrenamiento': len(X_train),
+        'filas_prueba': len(X_test)
+    }, intervalos=calibrar_intervalos(model, X_test_scaled, y_test, idx_test, len(encoder.alcaldias)))
+    print(f"Versión publicada: modelos/{tipo}/{version}")
+
+# Función principal para entrenar modelos
+def train_models():
+    # Misma versión para los dos modelos entrenados en esta corrida
+    version = datetime.now().strftime('%Y%m%d-%H%M%S')
     
-    # Guardar las columnas para referencia
-    column_names = X_train.columns.tolist()
-    joblib.dump(column_names, 'departamentos_columns.joblib')
+    entrenar_modelo('casas', 'new_casas.csv', version)
+    entrenar_modelo('departamentos', 'new_departamentos.csv', version)
     
     print("Modelos guardados exitosamente.")
 
 if __name__ == "__main__":
-    train_models() 
\ No newline at end of file
+    train_models()
\ No newline at end of file
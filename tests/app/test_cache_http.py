@@ -0,0 +1,64 @@
+from unittest.mock import patch
+import pytest
+from fastapi.testclient import TestClient
+from app.cache_http import _coincide
+from app.main import app
+from infra.config import get_settings
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+class TestValidadorCache:
+    """Pruebas de los validadores HTTP de las respuestas de estadísticas"""
+
+    def test_etag_y_cache_control(self, client):
+        respuesta = client.get('/stats/casas/total')
+
+        assert respuesta.status_code == 200
+        assert respuesta.headers['etag'].startswith('"')
+        assert respuesta.headers['cache-control'] == get_settings().stats_cache_control
+        # El ETag es estable para la misma versión de los datos
+        assert client.get('/stats/casas/total').headers['etag'] == respuesta.headers['etag']
+
+    def test_304_sin_consultar_la_estadistica(self, client):
+        """Con un If-None-Match que coincide no se ejecuta el caso de uso ni se serializa la respuesta"""
+        etag = client.get('/stats/precios-por-alcaldia').headers['etag']
+
+        with patch('app.routers.stats.get_precios_por_alcaldia_total') as mock_caso_uso:
+            respuesta = client.get('/stats/precios-por-alcaldia', headers={'If-None-Match': f'W/{etag}, "otro"'})
+
+        assert respuesta.status_code == 304
+        assert respuesta.content == b''
+        assert respuesta.headers['etag'] == etag
+        mock_caso_uso.assert_not_called()
+
+    def test_etag_distinto_por_ruta_y_parametros(self, client):
+        etags = {
+            client.get('/stats/casas/total').headers['etag'],
+            client.get('/stats/departamentos/total').headers['etag'],
+            client.get('/stats/summary').headers['etag'],
+            client.get('/stats/summary', params={'fields': 'casas'}).headers['etag']
+        }
+
+        assert len(etags) == 4
+        respuesta = client.get('/stats/summary', headers={'If-None-Match': client.get('/stats/total').headers['etag']})
+        assert respuesta.status_code == 200
+
+    def test_cache_control_configurable(self, client):
+        settings = get_settings()
+        anterior = settings.stats_cache_control
+        try:
+            settings.stats_cache_control = 'public, max-age=60'
+            assert client.get('/stats/total').headers['cache-control'] == 'public, max-age=60'
+            settings.stats_cache_control = ''
+            assert 'cache-control' not in client.get('/stats/total').headers
+        finally:
+            settings.stats_cache_control = anterior
+
+    def test_coincide(self):
+        assert _coincide('*', '"abc"')
+        assert _coincide('"x", W/"abc"', '"abc"')
+        assert not _coincide('"abcd"', '"abc"')
\ No newline at end of file
@@ -0,0 +1,59 @@
+import asyncio
+import pytest
+from app.coalescer import PrediccionCoalescer
+from domain.exceptions import AlcaldiaNoEncontrada
+from infra.data.model_registry import get_model_registry
+
+
+def _model_input(alcaldia: str, metros_cuadrados: float) -> dict:
+    return {
+        'alcaldia': alcaldia,
+        'metros_cuadrados': metros_cuadrados,
+        'recamaras': 3,
+        'banos': 2,
+        'estacionamientos': 1
+    }
+
+
+class TestPrediccionCoalescer:
+    """Pruebas para el coalescer de predicciones individuales"""
+
+    def test_agrupa_peticiones_concurrentes(self):
+        """Las peticiones concurrentes se evalúan en un solo lote con el mismo resultado"""
+        coalescer = PrediccionCoalescer('casas', ventana_ms=5, max_filas=64)
+        entradas = [_model_input('Tlalpan', 100 + i) for i in range(10)]
+
+        async def correr():
+            return await asyncio.gather(*(coalescer.predict(e) for e in entradas))
+
+        precios = asyncio.run(correr())
+
+        repo = get_model_registry().get('casas')
+        assert precios == pytest.approx([repo.predict(e) for e in entradas])
+        lotes = coalescer._tamano_lote.snapshot()
+        assert lotes['conteo'] >= 1 and lotes['maximo'] == 10
+
+    def test_despacha_al_llenar_el_lote(self):
+        """Al alcanzar el máximo de filas el lote se evalúa sin esperar la ventana"""
+        coalescer = PrediccionCoalescer('casas', ventana_ms=10000, max_filas=4)
+
+        async def correr():
+            entradas = [_model_input('Coyoacán', 120)] * 4
+            return await asyncio.wait_for(asyncio.gather(*(coalescer.predict(e) for e in entradas)), 1)
+
+        assert len(asyncio.run(correr())) == 4
+
+    def test_error_por_peticion(self):
+        """Una fila inválida sólo hace fallar su propia petición"""
+        coalescer = PrediccionCoalescer('departamentos', ventana_ms=5, max_filas=64)
+
+        async def correr():
+            return await asyncio.gather(
+                coalescer.predict(_model_input('Miguel Hidalgo', 80)),
+                coalescer.predict(_model_input('Alcaldía Inexistente', 80)),
+                return_exceptions=True
+            )
+
+        valido, error = asyncio.run(correr())
+        assert valido > 0
+        assert isinstance(error, AlcaldiaNoEncontrada)
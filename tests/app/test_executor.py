@@ -0,0 +1,52 @@
+import asyncio
+import threading
+import time
+import pytest
+from app.executor import PrediccionExecutor
+from domain.exceptions import ServicioSaturado, AlcaldiaNoEncontrada
+
+
+class TestPrediccionExecutor:
+    """Pruebas para el pool dedicado de predicciones"""
+
+    def test_ejecuta_fuera_del_event_loop(self):
+        """La función se ejecuta en un hilo del pool, no en el del event loop"""
+        executor = PrediccionExecutor('thread', workers=2, max_pendientes=8)
+
+        async def correr():
+            return await executor.run(lambda: threading.current_thread().name)
+
+        try:
+            assert asyncio.run(correr()).startswith('prediccion')
+        finally:
+            executor.shutdown()
+
+    def test_rechaza_cuando_la_cola_esta_llena(self):
+        """Al superar el máximo de pendientes se levanta ServicioSaturado en lugar de encolar"""
+        executor = PrediccionExecutor('thread', workers=1, max_pendientes=2)
+
+        async def correr():
+            return await asyncio.gather(*(executor.run(time.sleep, 0.05) for _ in range(3)), return_exceptions=True)
+
+        try:
+            resultados = asyncio.run(correr())
+        finally:
+            executor.shutdown()
+
+        assert sum(isinstance(r, ServicioSaturado) for r in resultados) == 1
+        assert executor.pendientes == 0
+
+    def test_pool_de_procesos_conserva_las_excepciones(self):
+        """Las excepciones de dominio cruzan el pool de procesos sin perder sus datos"""
+        from usecases.predict_casas import predict_casa
+        from domain.models import CasaInputData
+        executor = PrediccionExecutor('process', workers=1, max_pendientes=4)
+        input_data = CasaInputData(alcaldia="Alcaldía Inexistente", metros_cuadrados=150, recamaras=3, banos=2, estacionamientos=1)
+
+        try:
+            with pytest.raises(AlcaldiaNoEncontrada) as excinfo:
+                asyncio.run(executor.run(predict_casa, input_data))
+        finally:
+            executor.shutdown()
+
+        assert excinfo.value.alcaldia == "Alcaldía Inexistente"
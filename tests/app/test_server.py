@@ -0,0 +1,137 @@
+import json
+import os
+import queue
+import signal
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from pathlib import Path
+from unittest.mock import mock_open, patch
+import pytest
+from app.server import Servidor, memoria_proceso
+
+RAIZ = Path(__file__).resolve().parents[2]
+
+SMAPS_ROLLUP = """00400000-7ffd00000000 ---p 00000000 00:00 0                          [rollup]
+Rss:              204800 kB
+Pss:              102400 kB
+Shared_Clean:     153600 kB
+Shared_Dirty:       1024 kB
+Private_Clean:      2048 kB
+Private_Dirty:     48128 kB
+Swap:                  0 kB
+"""
+
+
+def _reporte(worker: int) -> bytes:
+    datos = {'worker': worker, 'pid': 1000 + worker, 'tiempo_arranque_ms': 10.0 + worker, 'rss_mb': 100.0}
+    return (json.dumps(datos) + '\n').encode('utf-8')
+
+
+@pytest.fixture
+def servidor():
+    servidor = Servidor(app=None, sock=None, workers=2)
+    yield servidor
+    os.close(servidor._lectura)
+    os.close(servidor._escritura)
+
+
+class TestMemoriaProceso:
+    """Pruebas de la lectura de memoria del proceso"""
+
+    def test_lee_smaps_rollup(self):
+        """Separa la memoria compartida de la privada y la convierte a MB"""
+        with patch('app.server.open', mock_open(read_data=SMAPS_ROLLUP), create=True):
+            memoria = memoria_proceso()
+
+        assert memoria == {'rss_mb': 200.0, 'pss_mb': 100.0, 'compartida_mb': 151.0, 'privada_mb': 49.0}
+
+    @pytest.mark.parametrize('abrir', [
+        patch('app.server.open', side_effect=FileNotFoundError, create=True),
+        patch('app.server.open', mock_open(read_data='Rss: 1024 kB\n'), create=True)
+    ], ids=['sin_smaps_rollup', 'campos_incompletos'])
+    def test_sin_smaps_usa_el_rss_maximo(self, abrir):
+        """Sin /proc/self/smaps_rollup completo sólo se reporta el RSS máximo"""
+        with abrir:
+            memoria = memoria_proceso()
+
+        assert list(memoria) == ['rss_mb']
+        assert memoria['rss_mb'] > 0
+
+
+class TestLeerReportes:
+    """Pruebas de la lectura de los reportes de arranque de los workers"""
+
+    def test_lineas_partidas(self, servidor):
+        """Un reporte que llega en dos lecturas se procesa hasta que la línea está completa"""
+        reporte = _reporte(0)
+        os.write(servidor._escritura, reporte[:15])
+        servidor._leer_reportes(timeout=0.1)
+        assert servidor._reportes == {}
+
+        os.write(servidor._escritura, reporte[15:] + _reporte(1)[:5])
+        servidor._leer_reportes(timeout=0.1)
+
+        assert list(servidor._reportes) == [0]
+        assert servidor._pendiente == _reporte(1)[:5]
+
+    def test_resumen_una_sola_vez(self, servidor):
+        """El resumen se registra al reportar todos los workers, no cuando uno se vuelve a crear"""
+        with patch.object(Servidor, '_resumen') as mock_resumen:
+            os.write(servidor._escritura, _reporte(0))
+            servidor._leer_reportes(timeout=0.1)
+            mock_resumen.assert_not_called()
+
+            os.write(servidor._escritura, _reporte(1))
+            servidor._leer_reportes(timeout=0.1)
+            os.write(servidor._escritura, _reporte(0))
+            servidor._leer_reportes(timeout=0.1)
+
+        assert mock_resumen.call_count == 1
+
+    def test_sin_reportes_no_bloquea(self, servidor):
+        """Sin datos en el pipe la lectura regresa al vencer el timeout"""
+        servidor._leer_reportes(timeout=0.01)
+
+        assert servidor._reportes == {}
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason="el servidor con pre-fork requiere os.fork")
+def test_arranca_responde_y_se_apaga():
+    """El servidor crea los workers en un puerto libre, responde /health y termina con SIGTERM"""
+    proceso = subprocess.Popen(
+        [sys.executable, '-m', 'app.server', '--host', '127.0.0.1', '--port', '0', '--workers', '2'],
+        cwd=RAIZ, stderr=subprocess.PIPE, stdout=subprocess.DEVNULL, text=True
+    )
+    lineas = queue.Queue()
+    threading.Thread(target=lambda: [lineas.put(linea) for linea in proceso.stderr], daemon=True).start()
+
+    def esperar(mensaje: str) -> dict:
+        limite = time.monotonic() + 60
+        while time.monotonic() < limite:
+            try:
+                linea = lineas.get(timeout=1)
+            except queue.Empty:
+                continue
+            if not linea.startswith('{'):
+                continue
+            registro = json.loads(linea)
+            if registro.get('mensaje') == mensaje:
+                return registro
+        pytest.fail(f"el servidor no registró {mensaje}")
+
+    try:
+        puerto = esperar('servidor_iniciado')['puerto']
+        assert esperar('workers_listos')['workers'] == 2
+
+        with urllib.request.urlopen(f'http://127.0.0.1:{puerto}/health', timeout=10) as respuesta:
+            assert respuesta.status == 200
+
+        proceso.send_signal(signal.SIGTERM)
+        assert proceso.wait(timeout=30) == 0
+    finally:
+        if proceso.poll() is None:
+            proceso.kill()
+            proceso.wait()
\ No newline at end of file
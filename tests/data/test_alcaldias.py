@@ -0,0 +1,64 @@
+import pickle
+import pytest
+from domain.exceptions import AlcaldiaNoEncontrada
+from infra.data.alcaldias import AlcaldiaResolver, normalizar_alcaldia
+from infra.data.casas_repo import CasasRepository
+
+
+@pytest.fixture(scope='module')
+def repo():
+    return CasasRepository()
+
+
+class TestAlcaldiaResolver:
+    """Pruebas para la resolución de nombres de alcaldía"""
+
+    def test_normalizar(self):
+        """La normalización ignora acentos, mayúsculas y puntuación"""
+        assert normalizar_alcaldia(' Gustavo A.  Madero ') == 'gustavo a madero'
+        assert normalizar_alcaldia('ÁLVARO-OBREGÓN') == 'alvaro obregon'
+
+    @pytest.mark.parametrize("nombre, esperado", [
+        ('Benito Juárez', 'Benito Juárez'),
+        ('Benito Juarez', 'Benito Juárez'),
+        ('benito juarez', 'Benito Juárez'),
+        ('Magdalena Contreras', 'La Magdalena Contreras'),
+        ('Gustavo A Madero', 'Gustavo A. Madero'),
+        ('Benito Juaez', 'Benito Juárez'),
+        ('Coyocan', 'Coyoacán')
+    ])
+    def test_resolve(self, repo, nombre, esperado):
+        """Las variantes y los errores menores se resuelven al nombre del modelo"""
+        assert repo.alcaldia_resolver.resolve(nombre) == esperado
+
+    def test_ambiguo_o_desconocido(self):
+        """Un nombre desconocido, o igual de cercano a dos alcaldías, no se resuelve"""
+        resolver = AlcaldiaResolver(['Tlalpan', 'Tlalpam'])
+
+        assert resolver.resolve('Tlalpaz') is None
+        assert resolver.resolve('Ciudad Gótica') is None
+
+    def test_sugerencias(self, repo):
+        """Las alcaldías no reconocidas incluyen sugerencias en el error"""
+        with pytest.raises(AlcaldiaNoEncontrada) as e:
+            repo.resolve_alcaldia('Venustiano')
+
+        assert e.value.sugerencias == ['Venustiano Carranza']
+        assert '¿Quisiste decir' in str(e.value)
+        assert pickle.loads(pickle.dumps(e.value)).sugerencias == ['Venustiano Carranza']
+
+    def test_predict_acepta_variantes(self, repo):
+        """El repositorio predice lo mismo con el nombre exacto y con una variante"""
+        model_input = {
+            'alcaldia': 'Benito Juárez',
+            'metros_cuadrados': 150,
+            'recamaras': 3,
+            'banos': 2,
+            'estacionamientos': 1
+        }
+        esperado = repo.predict(model_input)
+
+        assert repo.predict({**model_input, 'alcaldia': 'Benito Juarez'}) == esperado
+        precios, errores = repo.predict_batch([{**model_input, 'alcaldia': 'BENITO JUAREZ'}])
+        assert errores == [None]
+        assert precios[0] == pytest.approx(esperado)
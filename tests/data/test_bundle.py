@@ -0,0 +1,65 @@
+import json
+import os
+import numpy as np
+import pytest
+from domain.exceptions import ModeloNoDisponible
+from infra.data.bundle import ModeloBundle, ruta_bundle
+from infra.data.casas_repo import CasasRepository
+
+
+MODEL_INPUT = {
+    'alcaldia': 'Benito Juárez',
+    'metros_cuadrados': 150,
+    'recamaras': 3,
+    'banos': 2,
+    'estacionamientos': 1
+}
+
+
+@pytest.fixture
+def bundle_dir(tmp_path):
+    CasasRepository().save_bundle(ruta_bundle(str(tmp_path), 'casas'), {'origen': 'prueba'})
+    return str(tmp_path)
+
+
+class TestModeloBundle:
+    """Pruebas del formato de bundle de los modelos"""
+
+    def test_contenido(self, bundle_dir):
+        """El bundle guarda columnas, límites, metadatos y arreglos en memoria mapeada"""
+        bundle = ModeloBundle(ruta_bundle(bundle_dir, 'casas'))
+        original = CasasRepository()
+
+        assert bundle.tipo_modelo == 'lineal'
+        assert bundle.columns == original.columns
+        assert dict(bundle.limites) == dict(original.limits)
+        assert bundle.metadatos['origen'] == 'prueba'
+        assert isinstance(bundle.arreglos['coef'], np.memmap)
+
+    def test_repositorio_desde_bundle(self, bundle_dir):
+        """Un repositorio cargado del bundle predice lo mismo que con los archivos joblib"""
+        repo = CasasRepository(bundle_dir)
+
+        assert repo.bundle is not None and repo.model is None
+        assert repo.predict(MODEL_INPUT) == pytest.approx(CasasRepository().predict(MODEL_INPUT), rel=1e-12)
+
+    def test_checksum_no_coincide(self, bundle_dir):
+        """Un arreglo modificado después de guardar el bundle se rechaza"""
+        ruta = os.path.join(ruta_bundle(bundle_dir, 'casas'), 'coef.npy')
+        coef = np.load(ruta)
+        np.save(ruta, coef * 2)
+
+        with pytest.raises(ModeloNoDisponible):
+            CasasRepository(bundle_dir)
+
+    def test_manifiesto_modificado(self, bundle_dir):
+        """Un manifiesto editado a mano (ej: otros límites) se rechaza"""
+        ruta = os.path.join(ruta_bundle(bundle_dir, 'casas'), 'manifest.json')
+        with open(ruta, encoding='utf-8') as f:
+            manifiesto = json.load(f)
+        manifiesto['limites']['recamaras'] = [1, 60]
+        with open(ruta, 'w', encoding='utf-8') as f:
+            json.dump(manifiesto, f)
+
+        with pytest.raises(ModeloNoDisponible):
+            CasasRepository(bundle_dir)
@@ -0,0 +1,63 @@
+import pytest
+from unittest.mock import patch
+from domain.exceptions import ModeloNoDisponible
+from infra.data.casas_repo import CasasRepository
+from infra.data.model_registry import ModelRegistry
+
+
+class TestModelRegistry:
+    """Pruebas para el registro de modelos compartido"""
+
+    def test_get_carga_una_sola_vez(self):
+        """El registro debe entregar siempre la misma instancia sin recargar artefactos"""
+        registry = ModelRegistry()
+        with patch("infra.data.base_repo.joblib.load", wraps=__import__("joblib").load) as mock_load:
+            repo1 = registry.get('casas')
+            repo2 = registry.get('casas')
+
+        assert repo1 is repo2
+        assert isinstance(repo1, CasasRepository)
+        assert mock_load.call_count == 3
+
+    def test_load_missing_conserva_los_cargados(self):
+        """Los modelos heredados del proceso padre no se vuelven a cargar"""
+        registry = ModelRegistry()
+        casas = registry.get('casas')
+
+        registry.load_missing()
+
+        assert registry.get('casas') is casas
+        assert {modelo.tipo_propiedad for modelo in registry.info()} == {'casas', 'departamentos'}
+
+    def test_info_expone_version_y_tiempo_de_carga(self):
+        """La información del modelo incluye la versión del artefacto y el tiempo de carga"""
+        registry = ModelRegistry()
+        registry.load_all()
+
+        info = {modelo.tipo_propiedad: modelo for modelo in registry.info()}
+
+        assert set(info) == {'casas', 'departamentos'}
+        assert len(info['casas'].version) == 12
+        assert info['casas'].tiempo_carga_ms > 0
+
+    def test_predict_no_modifica_la_entrada(self):
+        """El repositorio compartido no debe modificar los datos recibidos"""
+        repo = ModelRegistry().get('casas')
+        model_input = {
+            'alcaldia': 'Benito Juárez',
+            'metros_cuadrados': 150,
+            'recamaras': 3,
+            'banos': 2,
+            'estacionamientos': 1
+        }
+
+        precio1 = repo.predict(dict(model_input))
+        precio2 = repo.predict(model_input)
+
+        assert precio1 == precio2
+        assert 'metros_cuadrados' in model_input
+
+    def test_tipo_desconocido(self):
+        """Un tipo de propiedad desconocido levanta ModeloNoDisponible"""
+        with pytest.raises(ModeloNoDisponible):
+            ModelRegistry().get('terrenos')
@@ -0,0 +1,68 @@
+import copy
+import joblib
+import numpy as np
+import pytest
+from infra.data.model_registry import ModelRegistry
+from infra.data.model_store import publicar_version, version_publicada
+from infra.data.model_watcher import ModelWatcher
+
+
+MODEL_INPUT = {
+    'alcaldia': 'Benito Juárez',
+    'metros_cuadrados': 150,
+    'recamaras': 3,
+    'banos': 2,
+    'estacionamientos': 1
+}
+
+
+def _artefactos(tipo: str, desplazamiento: float = 0.0):
+    """Artefactos de la raíz del proyecto, con el intercepto desplazado para distinguir versiones"""
+    model = copy.deepcopy(joblib.load(f'{tipo}_model.joblib'))
+    model.intercept_ = model.intercept_ + desplazamiento
+    return model, joblib.load(f'{tipo}_scaler.joblib'), joblib.load(f'{tipo}_columns.joblib')
+
+
+class TestModelWatcher:
+    """Pruebas de la recarga de modelos versionados"""
+
+    def test_carga_la_version_publicada(self, tmp_path):
+        """El registro carga la versión indicada en modelos/<tipo>/ACTUAL"""
+        publicar_version('casas', *_artefactos('casas'), version='v1', raiz=str(tmp_path))
+        registry = ModelRegistry(modelos_dir=str(tmp_path))
+
+        registry.get('casas')
+
+        assert version_publicada('casas', str(tmp_path)) == 'v1'
+        assert registry.version_cargada('casas') == 'v1'
+
+    def test_recarga_atomica(self, tmp_path):
+        """Una versión nueva reemplaza a la anterior sin afectar a quien ya tiene la instancia vieja"""
+        publicar_version('casas', *_artefactos('casas'), version='v1', raiz=str(tmp_path))
+        registry = ModelRegistry(modelos_dir=str(tmp_path))
+        watcher = ModelWatcher(registry)
+        anterior = registry.get('casas')
+        precio_anterior = anterior.predict(MODEL_INPUT)
+
+        assert watcher.revisar() == []
+
+        publicar_version('casas', *_artefactos('casas', np.log(2)), version='v2', raiz=str(tmp_path))
+        assert watcher.revisar() == ['casas']
+
+        assert registry.version_cargada('casas') == 'v2'
+        assert registry.get('casas').predict(MODEL_INPUT) == pytest.approx(2 * precio_anterior)
+        # Una petición en curso con la instancia anterior sigue obteniendo el precio anterior
+        assert anterior.predict(MODEL_INPUT) == precio_anterior
+
+    def test_version_invalida_no_se_sirve(self, tmp_path):
+        """Si la validación falla se conserva la versión anterior y no se reintenta"""
+        publicar_version('casas', *_artefactos('casas'), version='v1', raiz=str(tmp_path))
+        registry = ModelRegistry(modelos_dir=str(tmp_path))
+        watcher = ModelWatcher(registry)
+        registry.get('casas')
+
+        publicar_version('casas', *_artefactos('casas', np.inf), version='v2', raiz=str(tmp_path))
+
+        assert watcher.revisar() == []
+        assert registry.version_cargada('casas') == 'v1'
+        assert watcher.revisar() == []
@@ -0,0 +1,136 @@
+import copy
+import time
+import joblib
+import numpy as np
+import pytest
+from infra.data.model_registry import ModelRegistry
+from infra.data.model_store import publicar_version, retirar_candidato, version_candidata, version_publicada
+from infra.data.model_watcher import ModelWatcher
+from infra.data.shadow import ShadowScorer, get_shadow_scorer, stop_shadow_scorers
+
+
+MODEL_INPUT = {
+    'alcaldia': 'Benito Juárez',
+    'metros_cuadrados': 150,
+    'recamaras': 3,
+    'banos': 2,
+    'estacionamientos': 1
+}
+
+
+def _artefactos(tipo: str, desplazamiento: float = 0.0):
+    """Artefactos de la raíz del proyecto, con el intercepto desplazado para distinguir versiones"""
+    model = copy.deepcopy(joblib.load(f'{tipo}_model.joblib'))
+    model.intercept_ = model.intercept_ + desplazamiento
+    return model, joblib.load(f'{tipo}_scaler.joblib'), joblib.load(f'{tipo}_columns.joblib')
+
+
+@pytest.fixture
+def registry(tmp_path):
+    publicar_version('casas', *_artefactos('casas'), version='v1', raiz=str(tmp_path))
+    # El candidato predice el doble del precio primario
+    publicar_version('casas', *_artefactos('casas', np.log(2)), version='v2', raiz=str(tmp_path), candidato=True)
+    return ModelRegistry(modelos_dir=str(tmp_path))
+
+
+class TestShadowScorer:
+    """Pruebas de la evaluación de modelos candidatos en modo sombra"""
+
+    def test_candidato_no_se_sirve(self, tmp_path, registry):
+        """La versión candidata se registra junto a la publicada sin reemplazarla"""
+        candidato, version = registry.load_candidate('casas')
+
+        assert version_publicada('casas', str(tmp_path)) == 'v1'
+        assert version_candidata('casas', str(tmp_path)) == 'v2'
+        assert version == 'v2'
+        assert candidato is not registry.get('casas')
+        assert registry.load_candidate('departamentos') is None
+
+    def test_diferencias_contra_el_primario(self, registry):
+        """El hilo evalúa las muestras y acumula la diferencia relativa contra el primario"""
+        scorer = ShadowScorer('casas', *registry.load_candidate('casas'), muestreo=1.0)
+        primario = registry.get('casas').predict(MODEL_INPUT)
+        scorer.start()
+        try:
+            for _ in range(20):
+                assert scorer.enviar(dict(MODEL_INPUT), primario)
+            limite = time.monotonic() + 5
+            while scorer.info().evaluadas < 20 and time.monotonic() < limite:
+                time.sleep(0.01)
+        finally:
+            scorer.stop()
+
+        info = scorer.info()
+        assert info.evaluadas == 20
+        assert info.errores == 0
+        assert info.diferencia_relativa['promedio'] == pytest.approx(1.0)
+        assert info.precio_candidato['promedio'] == pytest.approx(2 * primario)
+
+    def test_cola_llena_descarta(self, registry):
+        """Con la cola llena las muestras se descartan en lugar de esperar"""
+        scorer = ShadowScorer('casas', *registry.load_candidate('casas'), muestreo=1.0, max_cola=2)
+
+        enviadas = [scorer.enviar(dict(MODEL_INPUT), 1.0) for _ in range(5)]
+
+        assert enviadas == [True, True, False, False, False]
+        assert scorer.info().descartadas == 3
+        assert scorer.info().pendientes == 2
+
+    def test_errores_por_fila(self, registry):
+        """Una muestra que el candidato no puede evaluar cuenta como error sin afectar al resto"""
+        scorer = ShadowScorer('casas', *registry.load_candidate('casas'), muestreo=1.0)
+
+        scorer.evaluar([(dict(MODEL_INPUT), 1.0), ({**MODEL_INPUT, 'recamaras': 12}, 1.0)])
+
+        assert scorer.info().evaluadas == 2
+        assert scorer.info().errores == 1
+        assert scorer.info().precio_candidato['conteo'] == 1
+
+class TestCandidatoPublicado:
+    """Pruebas del seguimiento de modelos/<tipo>/CANDIDATO por el watcher"""
+
+    def test_cambia_al_nuevo_candidato(self, tmp_path, registry):
+        """Un segundo candidato reemplaza al evaluador del primero"""
+        watcher = ModelWatcher(registry)
+        registry.get('casas')
+        try:
+            watcher.revisar()
+            anterior = get_shadow_scorer('casas')
+            assert anterior.version == 'v2'
+
+            publicar_version('casas', *_artefactos('casas', np.log(3)), version='v3', raiz=str(tmp_path),
+                             candidato=True)
+            watcher.revisar()
+
+            scorer = get_shadow_scorer('casas')
+            assert scorer.version == 'v3'
+            assert anterior._hilo is None
+            primario = registry.get('casas').predict(MODEL_INPUT)
+            scorer.evaluar([(dict(MODEL_INPUT), primario)])
+            assert scorer.info().precio_candidato['promedio'] == pytest.approx(3 * primario)
+        finally:
+            stop_shadow_scorers()
+
+    def test_candidato_promovido_o_retirado(self, tmp_path, registry):
+        """Se deja de evaluar en modo sombra al promover el candidato a ACTUAL o al retirarlo"""
+        watcher = ModelWatcher(registry)
+        registry.get('casas')
+        try:
+            watcher.revisar()
+            assert get_shadow_scorer('casas').version == 'v2'
+
+            # Promover el candidato: ACTUAL apunta a la versión que ya está en disco
+            (tmp_path / 'casas' / 'ACTUAL').write_text('v2', encoding='utf-8')
+            assert watcher.revisar() == ['casas']
+            assert get_shadow_scorer('casas') is None
+
+            publicar_version('casas', *_artefactos('casas', np.log(3)), version='v3', raiz=str(tmp_path),
+                             candidato=True)
+            watcher.revisar()
+            assert get_shadow_scorer('casas').version == 'v3'
+
+            retirar_candidato('casas', str(tmp_path))
+            watcher.revisar()
+            assert get_shadow_scorer('casas') is None
+        finally:
+            stop_shadow_scorers()
\ No newline at end of file
@@ -0,0 +1,134 @@
+import os
+import shutil
+import pytest
+from unittest.mock import patch
+from domain.exceptions import CampoNoValido, ErrorEstadisticas
+from domain.models import PreciosAlcaldiaResponse
+from infra.data.stats_materializadas import StatsMaterializadas
+from infra.data.stats_repo import StatsRepository
+from infra.data.stats_snapshot import ARCHIVOS_STATS, StatsSnapshots
+
+
+@pytest.fixture
+def base_dir(tmp_path):
+    for archivo in ARCHIVOS_STATS.values():
+        shutil.copy(archivo, tmp_path / archivo)
+    return tmp_path
+
+
+def _quitar_ultima_fila(ruta) -> None:
+    """Quita la última publicación de un archivo y adelanta su fecha de modificación"""
+    contenido = ruta.read_text(encoding='utf-8')
+    ruta.write_text(contenido.rsplit('\n', 2)[0] + '\n', encoding='utf-8')
+    stat = os.stat(ruta)
+    os.utime(ruta, (stat.st_atime, stat.st_mtime + 10))
+
+
+class TestStatsMaterializadas:
+    """Pruebas de la tabla de estadísticas materializadas"""
+
+    def test_materializa_al_cargar_el_snapshot(self, base_dir):
+        """Cargar los datos calcula todas las estadísticas; las consultas no vuelven a calcular"""
+        snapshots = StatsSnapshots(str(base_dir), recarga_segundos=0)
+        materializadas = StatsMaterializadas(snapshots)
+        snapshots.load_all()
+
+        with patch.object(StatsRepository, 'get_stats_casas') as mock_calculo:
+            for _ in range(3):
+                stats = materializadas.get('stats_casas')
+
+        mock_calculo.assert_not_called()
+        assert stats == StatsRepository(snapshots).get_stats_casas()
+        assert len(materializadas.info().materializaciones) == 3
+
+    def test_mismos_resultados_que_el_repositorio(self, base_dir):
+        """Cada estadística materializada es igual a la calculada en la petición"""
+        snapshots = StatsSnapshots(str(base_dir), recarga_segundos=0)
+        materializadas = StatsMaterializadas(snapshots)
+        repo = StatsRepository(snapshots)
+
+        assert materializadas.get('total_propiedades') == repo.get_total_propiedades()
+        assert materializadas.get('precio_m2_departamentos') == repo.get_precio_m2_departamentos()
+        assert materializadas.get('precios_por_alcaldia_casas') == PreciosAlcaldiaResponse(
+            precios=repo.get_precio_promedio_por_alcaldia_casas()
+        )
+
+    def test_rematerializa_si_cambian_los_datos(self, base_dir):
+        """Una recarga del snapshot recalcula las tablas que dependen de él"""
+        snapshots = StatsSnapshots(str(base_dir), recarga_segundos=0)
+        materializadas = StatsMaterializadas(snapshots)
+        total_casas = materializadas.get('total_casas').total
+        total = materializadas.get('total_propiedades').total
+
+        _quitar_ultima_fila(base_dir / ARCHIVOS_STATS['casas'])
+        snapshots.reload_if_changed('casas')
+
+        assert materializadas.get('total_casas').total == total_casas - 1
+        assert materializadas.get('total_propiedades').total == total - 1
+
+    def test_errores_y_estadisticas_desconocidas(self, base_dir):
+        """Un cálculo que falla guarda su error; una estadística desconocida también es un error"""
+        snapshots = StatsSnapshots(str(base_dir), recarga_segundos=0)
+        materializadas = StatsMaterializadas(snapshots)
+        with patch.object(StatsRepository, 'get_total_casas', side_effect=KeyError('alcaldia_x')):
+            snapshots.load('casas')
+
+        with pytest.raises(ErrorEstadisticas):
+            materializadas.get('total_casas')
+        assert materializadas.get('stats_casas').precio_promedio > 0
+        assert 'total_casas' in materializadas.info().materializaciones[0].errores
+        with pytest.raises(ErrorEstadisticas):
+            materializadas.get('no_existe')
+
+    def test_recalcular_aunque_este_vigente(self, base_dir):
+        """El recálculo para depuración vuelve a materializar y reporta los tiempos"""
+        snapshots = StatsSnapshots(str(base_dir), recarga_segundos=0)
+        materializadas = StatsMaterializadas(snapshots)
+        snapshots.load_all()
+        anteriores = {tuple(m.tipos): m.fecha for m in materializadas.info().materializaciones}
+
+        with patch.object(StatsRepository, 'get_total_casas', wraps=StatsRepository.get_total_casas,
+                          autospec=True) as mock_calculo:
+            info = materializadas.recalcular()
+
+        assert mock_calculo.call_count == 1
+        assert {s.tipo_propiedad for s in info.snapshots} == set(ARCHIVOS_STATS)
+        assert len(info.materializaciones) == len(anteriores)
+        assert all(m.tiempo_ms >= 0 for m in info.materializaciones)
+
+    def test_resumen_completo(self, base_dir):
+        """El resumen tiene las mismas estadísticas que los endpoints individuales"""
+        snapshots = StatsSnapshots(str(base_dir), recarga_segundos=0)
+        materializadas = StatsMaterializadas(snapshots)
+
+        resumen = materializadas.resumen()
+
+        assert resumen.casas.total == materializadas.get('total_casas').total
+        assert resumen.departamentos.stats == materializadas.get('stats_departamentos')
+        assert resumen.propiedades.total == resumen.casas.total + resumen.departamentos.total
+        assert resumen.propiedades.precios_por_alcaldia == materializadas.get('precios_por_alcaldia_total').precios
+
+    def test_resumen_con_selector(self, base_dir):
+        """El selector acepta secciones, campos de todas las secciones y campos de una sección"""
+        snapshots = StatsSnapshots(str(base_dir), recarga_segundos=0)
+        materializadas = StatsMaterializadas(snapshots)
+
+        resumen = materializadas.resumen(['casas.total', 'precio_m2']).model_dump(exclude_none=True)
+
+        assert {seccion: list(campos) for seccion, campos in resumen.items()} == {
+            'casas': ['total', 'precio_m2'],
+            'departamentos': ['precio_m2'],
+            'propiedades': ['precio_m2']
+        }
+        assert set(materializadas.resumen(['departamentos']).model_dump(exclude_none=True)) == {'departamentos'}
+        with pytest.raises(CampoNoValido):
+            materializadas.resumen(['casas.no_existe'])
+
+    def test_resumen_solo_carga_lo_pedido(self, base_dir):
+        """Un resumen de una sola sección no carga los datos de los demás tipos"""
+        snapshots = StatsSnapshots(str(base_dir), recarga_segundos=0)
+        materializadas = StatsMaterializadas(snapshots)
+
+        materializadas.resumen(['casas'])
+
+        assert list(snapshots.cargados()) == ['casas']
\ No newline at end of file
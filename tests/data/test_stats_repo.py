@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+from infra.data.stats_repo import promedios_por_alcaldia, remove_outliers
+
+
+def _publicaciones(n, alcaldias, rng, vacias=()):
+    """Publicaciones aleatorias con la columna categórica `alcaldia` (sin filas en las alcaldías `vacias`)"""
+    con_filas = [a for a in alcaldias if a not in vacias]
+    return pd.DataFrame({
+        'precio': rng.lognormal(15, 0.8, n),
+        'precio_por_mt2': rng.lognormal(10, 0.5, n),
+        'alcaldia': pd.Categorical(rng.choice(con_filas, n), categories=alcaldias)
+    })
+
+
+def _promedio_por_alcaldia_filtrando(frames, column):
+    """Cálculo anterior: filtrar cada alcaldía, quitar outliers y promediar"""
+    alcaldias = list(dict.fromkeys(a for df in frames for a in df['alcaldia'].cat.categories))
+    resultado = {}
+    for alcaldia in alcaldias:
+        df_alcaldia = pd.concat([df.loc[df['alcaldia'] == alcaldia, [column]] for df in frames])
+        if len(df_alcaldia) > 0:
+            resultado[alcaldia] = float(remove_outliers(df_alcaldia, column)[column].mean())
+        else:
+            resultado[alcaldia] = 0.0
+    return resultado
+
+
+class TestPromedioPorAlcaldia:
+    """Pruebas del promedio sin outliers por alcaldía en una sola agrupación"""
+
+    def test_igual_que_filtrar_cada_alcaldia(self):
+        rng = np.random.default_rng(0)
+        df = _publicaciones(2000, ['Coyoacán', 'Tlalpan', 'Xochimilco', 'Milpa Alta'], rng, vacias=['Milpa Alta'])
+        df.loc[:5, 'precio'] = 1e12  # outliers
+        df.loc[6:8, 'precio'] = np.nan
+
+        resultado = promedios_por_alcaldia([df], ['precio', 'precio_por_mt2'])
+
+        assert list(resultado['precio']) == ['Coyoacán', 'Tlalpan', 'Xochimilco', 'Milpa Alta']
+        assert resultado['precio']['Milpa Alta'] == 0.0
+        for column in ('precio', 'precio_por_mt2'):
+            assert resultado[column] == pytest.approx(_promedio_por_alcaldia_filtrando([df], column), rel=1e-12)
+
+    def test_varios_dataframes_con_distintas_alcaldias(self):
+        """Los outliers se calculan sobre las filas de todos los DataFrames; las alcaldías son la unión"""
+        rng = np.random.default_rng(1)
+        casas = _publicaciones(500, ['Coyoacán', 'Tlalpan', 'Tláhuac'], rng)
+        deptos = _publicaciones(300, ['Coyoacán', 'Benito Juárez'], rng)
+
+        resultado = promedios_por_alcaldia([casas, deptos], ['precio'])['precio']
+
+        assert list(resultado) == ['Coyoacán', 'Tlalpan', 'Tláhuac', 'Benito Juárez']
+        assert resultado == pytest.approx(_promedio_por_alcaldia_filtrando([casas, deptos], 'precio'), rel=1e-12)
+
+    def test_filas_sin_alcaldia_se_ignoran(self):
+        df = pd.DataFrame({
+            'precio': [1.0, 2.0, 3.0, 100.0],
+            'alcaldia': pd.Categorical(['Tlalpan', 'Tlalpan', 'Tlalpan', None], categories=['Tlalpan'])
+        })
+
+        assert promedios_por_alcaldia([df], ['precio']) == {'precio': {'Tlalpan': 2.0}}
\ No newline at end of file
@@ -0,0 +1,83 @@
+import os
+import shutil
+import pytest
+import pandas as pd
+from unittest.mock import patch
+from infra.data.stats_repo import StatsRepository
+from infra.data.stats_snapshot import ARCHIVOS_STATS, COLUMNAS_STATS, StatsSnapshots
+
+
+@pytest.fixture
+def base_dir(tmp_path):
+    for archivo in ARCHIVOS_STATS.values():
+        shutil.copy(archivo, tmp_path / archivo)
+    return tmp_path
+
+
+def _reescribir(ruta, contenido: str) -> None:
+    """Reescribe un archivo y adelanta su fecha de modificación (la resolución puede ser de segundos)"""
+    with open(ruta, 'w', encoding='utf-8') as f:
+        f.write(contenido)
+    stat = os.stat(ruta)
+    os.utime(ruta, (stat.st_atime, stat.st_mtime + 10))
+
+
+class TestStatsSnapshots:
+    """Pruebas de los snapshots de estadísticas compartidos por el proceso"""
+
+    def test_carga_una_sola_vez_y_por_tipo(self, base_dir):
+        """Varias peticiones leen el mismo snapshot; sólo se lee el tipo que se usa"""
+        snapshots = StatsSnapshots(str(base_dir), recarga_segundos=0)
+        with patch("infra.data.stats_snapshot.pd.read_csv", wraps=__import__("pandas").read_csv) as mock_read:
+            totales = [StatsRepository(snapshots).get_total_casas().total for _ in range(5)]
+
+        assert mock_read.call_count == 1
+        assert len(set(totales)) == 1
+        assert snapshots.get('casas') is snapshots.get('casas')
+        assert 'departamentos' not in snapshots._snapshots
+
+    def test_solo_columnas_usadas(self, base_dir):
+        """La descripción y las demás columnas que no usan las estadísticas no se leen"""
+        df = StatsSnapshots(str(base_dir)).get('departamentos').df
+
+        assert 'descripcion' not in df.columns
+        assert set(df.columns) == set(COLUMNAS_STATS) | {'alcaldia'}
+
+    def test_recarga_solo_si_cambia_el_contenido(self, base_dir):
+        """Un archivo reescrito con el mismo contenido no se recarga; uno distinto sí"""
+        snapshots = StatsSnapshots(str(base_dir), recarga_segundos=0)
+        ruta = base_dir / ARCHIVOS_STATS['casas']
+        original = snapshots.get('casas')
+        contenido = ruta.read_text(encoding='utf-8')
+
+        _reescribir(ruta, contenido)
+        assert not snapshots.reload_if_changed('casas')
+        assert snapshots.get('casas') is original
+
+        _reescribir(ruta, contenido.rsplit('\n', 2)[0] + '\n')
+        assert snapshots.reload_if_changed('casas')
+        assert snapshots.get('casas').filas == original.filas - 1
+        assert snapshots.get('casas').hash != original.hash
+
+    def test_repositorio_conserva_su_snapshot(self, base_dir):
+        """Una instancia del repositorio sigue leyendo el snapshot que ya obtuvo después de una recarga"""
+        snapshots = StatsSnapshots(str(base_dir), recarga_segundos=0)
+        repo = StatsRepository(snapshots)
+        total = repo.get_total_casas().total
+        ruta = base_dir / ARCHIVOS_STATS['casas']
+
+        _reescribir(ruta, ruta.read_text(encoding='utf-8').rsplit('\n', 2)[0] + '\n')
+        snapshots.reload_if_changed('casas')
+
+        assert repo.get_total_casas().total == total
+        assert StatsRepository(snapshots).get_total_casas().total == total - 1
+
+    def test_decodifica_las_columnas_de_alcaldia(self, base_dir):
+        """Las columnas one-hot se reemplazan por una columna categórica con las mismas filas por alcaldía"""
+        original = pd.read_csv(base_dir / ARCHIVOS_STATS['departamentos'])
+        snapshot = StatsSnapshots(str(base_dir)).get('departamentos')
+
+        assert snapshot.df['alcaldia'].dtype == 'category'
+        assert list(snapshot.df['alcaldia'].cat.categories) == list(snapshot.alcaldias)
+        for alcaldia in snapshot.alcaldias:
+            assert (snapshot.df['alcaldia'] == alcaldia).sum() == original[f'alcaldia_{alcaldia}'].sum()
\ No newline at end of file
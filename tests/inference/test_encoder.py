@@ -0,0 +1,72 @@
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from infra.inference.encoder import FeatureEncoder, NUMERIC_FEATURES
+
+
+class TestFeatureEncoder:
+    """Pruebas del codificador de características compartido por entrenamiento y servicio"""
+
+    @pytest.mark.parametrize("tipo", ['casas', 'departamentos'])
+    def test_equivalente_al_dataframe(self, tipo):
+        """El lote codificado coincide con las columnas del DataFrame de entrenamiento"""
+        df = pd.read_csv(f'new_{tipo}.csv')
+        columns = joblib.load(f'{tipo}_columns.joblib')
+        encoder = FeatureEncoder(columns)
+
+        X = encoder.encode_frame(df)
+
+        assert X.flags['C_CONTIGUOUS'] and X.dtype == np.float64
+        np.testing.assert_array_equal(X, df[list(columns)].to_numpy(dtype=np.float64))
+
+    def test_fila_y_lote_coinciden(self):
+        """Una fila codificada sola es igual a la misma fila dentro de un lote"""
+        encoder = FeatureEncoder(joblib.load('casas_columns.joblib'))
+        rows = [
+            {'alcaldia': 'Benito Juárez', 'metros_cuadrados': 150, 'recamaras': 3, 'banos': 2, 'estacionamientos': 1},
+            {'alcaldia': 'Tlalpan', 'metros_cuadrados': 320, 'recamaras': 4, 'banos': 3, 'estacionamientos': 2}
+        ]
+        alcaldia_idx = np.array([encoder.alcaldia_index[row['alcaldia']] for row in rows])
+
+        lote = encoder.encode(encoder.numeric(rows), alcaldia_idx)
+
+        for i, row in enumerate(rows):
+            np.testing.assert_array_equal(lote[i:i + 1], encoder.encode_one(encoder.numeric([row])[0], alcaldia_idx[i]))
+        assert lote[0, encoder.columns.index('dimensiones')] == 150
+        assert lote[1, encoder.columns.index('alcaldia_Tlalpan')] == 1
+        assert lote[1, encoder.alcaldia_columns].sum() == 1
+
+    def test_alias_metros_cuadrados(self):
+        """Los artefactos con la columna `metros_cuadrados` se codifican igual que con `dimensiones`"""
+        alcaldias = ['Coyoacán', 'Tlalpan']
+        columnas = ['metros_cuadrados', 'recamaras', 'banos', 'estacionamientos'] + [f'alcaldia_{a}' for a in alcaldias]
+
+        encoder = FeatureEncoder(columnas)
+
+        assert encoder.columns == FeatureEncoder.para_alcaldias(alcaldias).columns
+        assert encoder.columns[:4] == NUMERIC_FEATURES
+
+    def test_columna_alcaldia(self):
+        """Un DataFrame con la alcaldía en una sola columna se codifica en el bloque one-hot"""
+        encoder = FeatureEncoder.para_alcaldias(['Coyoacán', 'Tlalpan'])
+        df = pd.DataFrame({
+            'alcaldia': ['Tlalpan', 'Coyoacán'],
+            'metros_cuadrados': [100.0, 200.0],
+            'recamaras': [2, 3],
+            'banos': [1, 2],
+            'estacionamientos': [0, 1]
+        })
+
+        X = encoder.encode_frame(df)
+
+        np.testing.assert_array_equal(X, [[100, 2, 1, 0, 0, 1], [200, 3, 2, 1, 1, 0]])
+        with pytest.raises(ValueError):
+            encoder.encode_frame(df.assign(alcaldia=['Tlalpan', 'Polanco']))
+
+    def test_columnas_no_compatibles(self):
+        """Columnas desconocidas o faltantes levantan ValueError"""
+        with pytest.raises(ValueError):
+            FeatureEncoder(['dimensiones', 'recamaras', 'banos'])
+        with pytest.raises(ValueError):
+            FeatureEncoder(list(NUMERIC_FEATURES) + ['antiguedad'])
\ No newline at end of file
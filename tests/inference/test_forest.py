@@ -0,0 +1,76 @@
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+from sklearn.preprocessing import StandardScaler
+from infra.data.bundle import ruta_bundle
+from infra.data.casas_repo import CasasRepository
+from infra.inference.forest import FlattenedForest
+from infra.inference.encoder import NUMERIC_FEATURES
+
+
+@pytest.fixture(scope='module')
+def bosque():
+    """Bosque pequeño entrenado con los datos de casas (logaritmo del precio)"""
+    df = pd.read_csv('new_casas.csv')
+    columns = list(NUMERIC_FEATURES) + [c for c in df.columns if c.startswith('alcaldia_')]
+    X = df[columns]
+    scaler = StandardScaler().fit(X)
+    model = RandomForestRegressor(n_estimators=20, random_state=0).fit(scaler.transform(X), df['log_precio'])
+    return model, scaler, columns
+
+
+class TestFlattenedForest:
+    """Pruebas de equivalencia del bosque aplanado"""
+
+    def test_equivalente_a_sklearn(self, bosque):
+        """El recorrido vectorizado llega a las mismas hojas que scikit-learn"""
+        model, scaler, columns = bosque
+        forest = FlattenedForest.from_sklearn(model, scaler, columns)
+
+        assert forest.profundidad == max(e.tree_.max_depth for e in model.estimators_)
+        assert forest.verify(model, scaler, n=3000) < 1e-9
+
+    def test_fila_individual(self, bosque):
+        """La predicción de una fila coincide con la del lote"""
+        model, scaler, columns = bosque
+        forest = FlattenedForest.from_sklearn(model, scaler, columns)
+        X_num = np.array([[150.0, 3, 2, 1], [80.0, 2, 1, 0]])
+        lote = forest.predict_log_batch(X_num, np.array([4, 7]))
+
+        assert forest.predict_log(4, (150.0, 3, 2, 1)) == pytest.approx(lote[0])
+        assert forest.predict_log(7, (80.0, 2, 1, 0)) == pytest.approx(lote[1])
+
+    def test_modelo_no_soportado(self, bosque):
+        """Los modelos de boosting no se aplanan como un promedio de árboles"""
+        _, _, columns = bosque
+        with pytest.raises(TypeError):
+            FlattenedForest.from_sklearn(GradientBoostingRegressor(), None, columns)
+
+    def test_repositorio_y_bundle(self, bosque, tmp_path):
+        """El repositorio usa el bosque aplanado con joblib y con bundle"""
+        model, scaler, columns = bosque
+        for nombre, objeto in (('model', model), ('scaler', scaler), ('columns', columns)):
+            joblib.dump(objeto, tmp_path / f'casas_{nombre}.joblib')
+        repo = CasasRepository(str(tmp_path))
+        assert isinstance(repo.engine, FlattenedForest)
+
+        rows = [
+            {'alcaldia': alcaldia, 'metros_cuadrados': 120, 'recamaras': 3, 'banos': 2, 'estacionamientos': 1}
+            for alcaldia in repo.alcaldias
+        ]
+        X = pd.DataFrame(0.0, index=range(len(rows)), columns=columns)
+        X[['dimensiones', 'recamaras', 'banos', 'estacionamientos']] = [120, 3, 2, 1]
+        for i, alcaldia in enumerate(repo.alcaldias):
+            X.loc[i, f'alcaldia_{alcaldia}'] = 1.0
+        esperado = np.exp(model.predict(scaler.transform(X)))
+
+        precios, _ = repo.predict_batch(rows)
+        np.testing.assert_allclose(precios, esperado, rtol=1e-12)
+
+        repo.save_bundle(ruta_bundle(str(tmp_path / 'bundle'), 'casas'))
+        desde_bundle = CasasRepository(str(tmp_path / 'bundle'))
+        assert isinstance(desde_bundle.engine, FlattenedForest)
+        assert isinstance(desde_bundle.engine.threshold, np.memmap)
+        np.testing.assert_allclose(desde_bundle.predict_batch(rows)[0], esperado, rtol=1e-12)
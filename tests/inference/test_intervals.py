@@ -0,0 +1,85 @@
+import joblib
+import numpy as np
+import pytest
+from infra.data.casas_repo import CasasRepository
+from infra.data.model_store import directorio_modelo, publicar_version
+from infra.inference.intervals import TablaResiduos
+
+
+MODEL_INPUT = {
+    'alcaldia': 'Benito Juárez',
+    'metros_cuadrados': 150,
+    'recamaras': 3,
+    'banos': 2,
+    'estacionamientos': 1
+}
+
+
+def _residuos(n: int, escalas, seed: int):
+    rng = np.random.default_rng(seed)
+    alcaldia_idx = rng.integers(0, len(escalas), n)
+    return rng.normal(0, np.asarray(escalas)[alcaldia_idx]), alcaldia_idx
+
+
+class TestTablaResiduos:
+    """Pruebas de los intervalos de predicción a partir de residuos precalculados"""
+
+    def test_cobertura(self):
+        """En datos nuevos, el intervalo cubre al menos la proporción pedida"""
+        escalas = (0.1, 0.3, 0.6)
+        residuos, alcaldia_idx = _residuos(6000, escalas, seed=0)
+        tabla = TablaResiduos.calibrar(residuos, alcaldia_idx, len(escalas))
+
+        nuevos, nuevos_idx = _residuos(30000, escalas, seed=1)
+        for nivel in (0.5, 0.8, 0.9, 0.95):
+            q = np.array([tabla.cuantil(i, nivel) for i in nuevos_idx])
+            cobertura = np.mean(np.abs(nuevos) <= q)
+            assert cobertura >= nivel - 0.01
+
+        # Cada alcaldía tiene su propio ancho
+        anchos = [tabla.cuantil(i, 0.9) for i in range(len(escalas))]
+        assert anchos == sorted(anchos)
+
+    def test_alcaldia_sin_muestras_usa_global(self):
+        """Las alcaldías con pocos residuos usan los cuantiles de todas las alcaldías"""
+        residuos, alcaldia_idx = _residuos(500, (0.2, 0.2), seed=0)
+        tabla = TablaResiduos.calibrar(residuos, alcaldia_idx, 3)
+        global_ = TablaResiduos.calibrar(residuos, np.zeros(len(residuos), dtype=int), 1)
+
+        assert tabla.cuantil(2, 0.9) == global_.cuantil(0, 0.9)
+        assert np.all(np.diff(tabla.cuantiles, axis=1) >= 0)
+
+    def test_intervalo_contiene_el_precio(self):
+        """El intervalo es multiplicativo alrededor del precio y crece con el nivel"""
+        residuos, alcaldia_idx = _residuos(1000, (0.25,), seed=0)
+        tabla = TablaResiduos.calibrar(residuos, alcaldia_idx, 1)
+
+        bajo_80, alto_80 = tabla.intervalo(0, 1_000_000.0, 0.8)
+        bajo_95, alto_95 = tabla.intervalo(0, 1_000_000.0, 0.95)
+
+        assert bajo_95 < bajo_80 < 1_000_000.0 < alto_80 < alto_95
+        assert bajo_80 * alto_80 == pytest.approx(1_000_000.0 ** 2)
+
+    def test_repositorio_publicado(self, tmp_path):
+        """Un modelo publicado con su tabla de residuos responde intervalos desde el bundle"""
+        model = joblib.load('casas_model.joblib')
+        scaler = joblib.load('casas_scaler.joblib')
+        columns = joblib.load('casas_columns.joblib')
+        n_alcaldias = sum(1 for c in columns if c.startswith('alcaldia_'))
+        residuos, alcaldia_idx = _residuos(2000, (0.3,) * n_alcaldias, seed=0)
+        tabla = TablaResiduos.calibrar(residuos, alcaldia_idx, n_alcaldias)
+        publicar_version('casas', model, scaler, columns, version='v1', raiz=str(tmp_path), intervalos=tabla)
+
+        repo = CasasRepository(directorio_modelo('casas', str(tmp_path))[0])
+        precio = repo.predict(MODEL_INPUT)
+        bajo, alto = repo.intervalo('Benito Juárez', precio, 0.9)
+
+        assert bajo < precio < alto
+        assert repo.intervalo('Benito Juárez', precio, 0.9) == tabla.intervalo(
+            repo.alcaldia_index['Benito Juárez'], precio, 0.9)
+
+    def test_repositorio_sin_tabla(self):
+        """Los artefactos sin calibración no devuelven intervalo"""
+        repo = CasasRepository()
+
+        assert repo.intervalo('Benito Juárez', 1_000_000.0, 0.9) is None
\ No newline at end of file
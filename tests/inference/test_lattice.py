@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from infra.config import get_settings
+from infra.data.casas_repo import CasasRepository
+from infra.inference.lattice import PrediccionLattice
+
+
+@pytest.fixture(scope='module')
+def repo():
+    return CasasRepository()
+
+
+@pytest.fixture(scope='module')
+def ruta_lattice(repo, tmp_path_factory):
+    ruta = str(tmp_path_factory.mktemp('lattice') / 'casas')
+    PrediccionLattice.build(repo, ruta, n_validacion=2000)
+    return ruta
+
+
+class TestPrediccionLattice:
+    """Pruebas de la malla precalculada de predicciones"""
+
+    def test_error_reportado(self, ruta_lattice):
+        """Para el modelo lineal la interpolación en log precio es exacta"""
+        lattice = PrediccionLattice.load(ruta_lattice)
+
+        assert isinstance(lattice.valores, np.memmap)
+        assert lattice.error_maximo['relativo'] < 1e-9
+
+    def test_equivalente_al_modelo(self, repo, ruta_lattice):
+        """La búsqueda en la malla da el mismo precio que el modelo"""
+        lattice = PrediccionLattice.load(ruta_lattice)
+        for alcaldia_idx in range(len(repo.alcaldias)):
+            valores = (137.5, 3.0, 2.0, 1.0)
+            esperado = repo.engine.predict_log(alcaldia_idx, valores)
+            assert lattice.predict_log(alcaldia_idx, valores) == pytest.approx(esperado, abs=1e-9)
+
+    def test_fuera_del_dominio(self, ruta_lattice):
+        """Las propiedades fuera de la malla no se responden con ella"""
+        lattice = PrediccionLattice.load(ruta_lattice)
+
+        assert lattice.predict_log(0, (5.0, 3.0, 2.0, 1.0)) is None
+        assert lattice.predict_log(0, (100.0, 2.5, 2.0, 1.0)) is None
+        assert lattice.predict_log(0, (100.0, 3.0, 9.0, 1.0)) is None
+
+        X_num = np.array([[100.0, 3, 2, 1], [100000.0, 3, 2, 1]])
+        resultado = lattice.predict_log_batch(X_num, np.array([0, 0]))
+        assert np.isfinite(resultado[0]) and np.isnan(resultado[1])
+
+    def test_repositorio_usa_la_malla(self, ruta_lattice, monkeypatch):
+        """Con la malla activada el repositorio la usa y completa con el modelo lo que no cubre"""
+        settings = get_settings()
+        monkeypatch.setattr(settings, 'lattice_activo', True)
+        monkeypatch.setattr(settings, 'lattice_dir', str(ruta_lattice).rsplit('/', 1)[0])
+        repo = CasasRepository()
+        assert repo.lattice is not None
+
+        rows = [
+            {'alcaldia': repo.alcaldias[0], 'metros_cuadrados': 100, 'recamaras': 3, 'banos': 2, 'estacionamientos': 1},
+            {'alcaldia': repo.alcaldias[0], 'metros_cuadrados': 90000, 'recamaras': 3, 'banos': 2, 'estacionamientos': 1}
+        ]
+        precios, errores = repo.predict_batch(rows)
+        esperado = np.exp(repo._predict_log_model(np.array([[100.0, 3, 2, 1], [90000.0, 3, 2, 1]]), np.array([0, 0])))
+
+        assert errores == [None, None]
+        np.testing.assert_allclose(precios, esperado, rtol=1e-9)
@@ -0,0 +1,44 @@
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from infra.data.casas_repo import CasasRepository
+from infra.data.deptos_repo import DepartamentosRepository
+from infra.inference.linear import CompiledLinearPredictor
+
+
+class TestCompiledLinearPredictor:
+    """Pruebas de equivalencia numérica del predictor lineal compilado"""
+
+    @pytest.mark.parametrize("tipo", ['casas', 'departamentos'])
+    def test_equivalente_a_sklearn(self, tipo):
+        """El predictor compilado reproduce scaler.transform + model.predict"""
+        model = joblib.load(f'{tipo}_model.joblib')
+        scaler = joblib.load(f'{tipo}_scaler.joblib')
+        columns = joblib.load(f'{tipo}_columns.joblib')
+
+        engine = CompiledLinearPredictor.from_sklearn(model, scaler, columns)
+
+        assert engine.verify(model, scaler, n=1000) < 1e-9
+
+    @pytest.mark.parametrize("repo_class", [CasasRepository, DepartamentosRepository])
+    def test_repositorio_usa_el_predictor_compilado(self, repo_class):
+        """El repositorio da el mismo precio con el predictor compilado y con scikit-learn"""
+        repo = repo_class()
+        assert repo.engine is not None
+
+        for alcaldia in repo.alcaldias:
+            model_input = {
+                'alcaldia': alcaldia,
+                'metros_cuadrados': 120,
+                'recamaras': 3,
+                'banos': 2,
+                'estacionamientos': 1
+            }
+            esperado = float(np.exp(repo._predict_log_sklearn(model_input)))
+            assert repo.predict(model_input) == pytest.approx(esperado, rel=1e-12)
+
+    def test_modelo_no_lineal(self):
+        """Un modelo sin coeficientes no se puede compilar"""
+        with pytest.raises(TypeError):
+            CompiledLinearPredictor.from_sklearn(object(), None, ['dimensiones'])
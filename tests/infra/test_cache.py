@@ -0,0 +1,55 @@
+from unittest.mock import patch
+from infra.cache import PrediccionCache
+from infra.data.model_registry import ModelRegistry
+
+
+def _clave(tipo='casas', version='v1', metros_cuadrados=150):
+    return PrediccionCache.clave(tipo, version, {
+        'alcaldia': 'Tlalpan',
+        'metros_cuadrados': metros_cuadrados,
+        'recamaras': 3,
+        'banos': 2,
+        'estacionamientos': 1
+    })
+
+
+class TestPrediccionCache:
+    """Pruebas para la caché LRU + TTL de predicciones"""
+
+    def test_clave_normalizada(self):
+        """Entradas equivalentes comparten clave; otra versión del modelo no"""
+        assert _clave(metros_cuadrados=150) == _clave(metros_cuadrados=150.0)
+        assert _clave(version='v1') != _clave(version='v2')
+
+    def test_lru_desaloja_la_menos_usada(self):
+        cache = PrediccionCache(max_entradas=2, ttl_segundos=60)
+        cache.put(_clave(metros_cuadrados=1), 1.0)
+        cache.put(_clave(metros_cuadrados=2), 2.0)
+        cache.get(_clave(metros_cuadrados=1))
+        cache.put(_clave(metros_cuadrados=3), 3.0)
+
+        assert cache.get(_clave(metros_cuadrados=1)) == 1.0
+        assert cache.get(_clave(metros_cuadrados=2)) is None
+        assert len(cache) == 2
+
+    def test_ttl(self):
+        cache = PrediccionCache(max_entradas=10, ttl_segundos=5)
+        with patch("infra.cache.time.monotonic", return_value=100.0):
+            cache.put(_clave(), 1.0)
+        with patch("infra.cache.time.monotonic", return_value=104.0):
+            assert cache.get(_clave()) == 1.0
+        with patch("infra.cache.time.monotonic", return_value=106.0):
+            assert cache.get(_clave()) is None
+
+    def test_invalidacion_al_recargar_el_modelo(self):
+        """Al recargar un modelo se descartan sólo las entradas de su tipo"""
+        cache = PrediccionCache(max_entradas=10, ttl_segundos=60)
+        registry = ModelRegistry()
+        registry.subscribe(lambda tipo, repo: cache.invalidate(tipo))
+        cache.put(_clave(tipo='casas'), 1.0)
+        cache.put(_clave(tipo='departamentos'), 2.0)
+
+        registry.load('casas')
+
+        assert cache.get(_clave(tipo='casas')) is None
+        assert cache.get(_clave(tipo='departamentos')) == 2.0
@@ -0,0 +1,91 @@
+import re
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from app.main import app
+from domain.exceptions import AlcaldiaNoEncontrada
+from domain.models import CasaInputData, DepartamentoInputData, PrediccionLote, ResultadoLote
+from infra.config import get_settings
+from usecases import predict_casas, predict_departamentos
+
+
+FECHA = '2024-01-01T12:00:00.000001'
+
+
+def _como_fastapi(modelo) -> bytes:
+    """Bytes que FastAPI escribe en el camino normal para un modelo de respuesta"""
+    return JSONResponse(jsonable_encoder(modelo)).body
+
+
+def _sin_fecha(texto: str) -> str:
+    """Quita la fecha de predicción, que cambia entre una petición y otra"""
+    return re.sub(r'"fecha_prediccion":"[^"]*"', '"fecha_prediccion":""', texto)
+
+
+class TestCodificadorPredicciones:
+    """Pruebas del modo JSON rápido de las respuestas de predicción"""
+
+    @pytest.mark.parametrize("modulo, modelo", [
+        (predict_casas, CasaInputData),
+        (predict_departamentos, DepartamentoInputData)
+    ])
+    def test_prediccion_igual_a_pydantic(self, modulo, modelo):
+        """La predicción codificada es igual a `Prediccion` serializado, con y sin intervalo"""
+        entrada = modelo(alcaldia='Álvaro Obregón "Centro"', metros_cuadrados=150, recamaras=3, banos=2, estacionamientos=1)
+
+        for intervalo in (None, (1234567.891, 2345678.912)):
+            esperado = modulo._construir_prediccion(entrada, 1999999.987654, FECHA, intervalo, 0.9)
+            codificado = modulo.CODIFICADOR.prediccion(entrada, 1999999.987654, FECHA, intervalo, 0.9)
+
+            assert codificado == _como_fastapi(esperado)
+
+    def test_lote_igual_a_pydantic(self):
+        """El lote codificado incluye los errores por fila y los mismos conteos que `PrediccionLote`"""
+        entradas = [
+            CasaInputData(alcaldia='Tlalpan', metros_cuadrados=90.5, recamaras=2, banos=1, estacionamientos=0),
+            CasaInputData(alcaldia='Narnia', metros_cuadrados=90.5, recamaras=2, banos=1, estacionamientos=0)
+        ]
+        errores = [None, AlcaldiaNoEncontrada('Narnia', ['Tlalpan'])]
+        esperado = PrediccionLote(tipo_propiedad='casa', total=2, exitosas=1, resultados=[
+            ResultadoLote(indice=0, prediccion=predict_casas._construir_prediccion(entradas[0], 1500000.0, FECHA)),
+            ResultadoLote(indice=1, error=str(errores[1]))
+        ])
+
+        codificado = predict_casas.CODIFICADOR.lote(entradas, [1500000.0, float('nan')], errores, FECHA)
+
+        assert codificado == _como_fastapi(esperado)
+
+    @pytest.mark.parametrize("ruta, cuerpo", [
+        ('/casas/predict', {'alcaldia': 'Benito Juárez', 'metros_cuadrados': 150, 'recamaras': 3, 'banos': 2, 'estacionamientos': 1}),
+        ('/departamentos/predict/batch', [
+            {'alcaldia': 'Miguel Hidalgo', 'metros_cuadrados': 80, 'recamaras': 2, 'banos': 1, 'estacionamientos': 1},
+            {'alcaldia': 'Miguel Hidalgo', 'metros_cuadrados': 80, 'recamaras': 12, 'banos': 1, 'estacionamientos': 1}
+        ])
+    ])
+    def test_endpoints_con_modo_rapido(self, ruta, cuerpo):
+        """Con FENNEC_JSON_RAPIDO los endpoints responden exactamente el mismo texto"""
+        cliente = TestClient(app)
+        normal = cliente.post(ruta, json=cuerpo)
+        settings = get_settings()
+        settings.json_rapido = True
+        try:
+            rapido = cliente.post(ruta, json=cuerpo)
+        finally:
+            settings.json_rapido = False
+
+        assert normal.status_code == rapido.status_code == 200
+        assert rapido.headers['content-type'] == 'application/json'
+        assert _sin_fecha(rapido.text) == _sin_fecha(normal.text)
+        assert '"recamaras":' in rapido.text and '"recamaras":3,' not in rapido.text
+
+    def test_lote_invalido_responde_422(self):
+        """El validador precompilado reporta los errores como FastAPI, dentro de `body`"""
+        cliente = TestClient(app)
+
+        respuesta = cliente.post('/casas/predict/batch', json=[{'alcaldia': 'Tlalpan', 'metros_cuadrados': -1}])
+        invalido = cliente.post('/casas/predict/batch', content=b'[{')
+
+        assert respuesta.status_code == 422
+        assert respuesta.json()['detail'][0]['loc'] == ['body', 0, 'metros_cuadrados']
+        assert invalido.status_code == 422
\ No newline at end of file
@@ -0,0 +1,54 @@
+import json
+import logging
+from infra.data.casas_repo import CasasRepository
+from unittest.mock import patch
+from infra.logs import JsonFormatter, MuestreoFilter, configure_logging, shutdown_logging
+
+
+def _registro(nivel: int, **extra) -> logging.LogRecord:
+    record = logging.makeLogRecord({'name': 'infra.prueba', 'levelno': nivel, 'levelname': logging.getLevelName(nivel), 'msg': 'prediccion'})
+    record.__dict__.update(extra)
+    return record
+
+
+class TestLogs:
+    """Pruebas de los logs estructurados"""
+
+    def test_json_incluye_campos_extra(self):
+        """Los campos pasados con `extra` aparecen en la línea JSON"""
+        linea = JsonFormatter().format(_registro(logging.DEBUG, tipo='casas', precio=1.5))
+        registro = json.loads(linea)
+
+        assert registro['mensaje'] == 'prediccion'
+        assert registro['nivel'] == 'DEBUG'
+        assert registro['tipo'] == 'casas'
+        assert registro['precio'] == 1.5
+
+    def test_muestreo_solo_afecta_depuracion(self):
+        """Con tasa 0 se descartan los registros DEBUG pero no los INFO"""
+        filtro = MuestreoFilter(0.0)
+
+        assert not filtro.filter(_registro(logging.DEBUG))
+        assert filtro.filter(_registro(logging.INFO))
+        assert MuestreoFilter(1.0).filter(_registro(logging.DEBUG))
+
+    def test_predict_no_escribe_en_stdout(self, capsys):
+        """La predicción ya no imprime en la salida estándar"""
+        CasasRepository().predict({
+            'alcaldia': 'Benito Juárez',
+            'metros_cuadrados': 150,
+            'recamaras': 3,
+            'banos': 2,
+            'estacionamientos': 1
+        })
+
+        assert capsys.readouterr().out == ''
+
+    def test_reconfigurar_no_acumula_atexit(self):
+        """Reiniciar los logs alrededor de cada fork no registra otra función de salida"""
+        with patch('infra.logs.atexit.register') as mock_register:
+            for _ in range(3):
+                shutdown_logging()
+                configure_logging()
+
+        mock_register.assert_not_called()
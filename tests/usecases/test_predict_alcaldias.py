@@ -0,0 +1,37 @@
+import pytest
+from domain.exceptions import FeatureNoValida
+from domain.models import CaracteristicasInputData, CasaInputData, ComparativoAlcaldias
+from infra.data.model_registry import get_model_registry
+from usecases.predict_alcaldias import predict_alcaldias
+from usecases.predict_casas import predict_casa
+
+
+class TestPredictAlcaldiasUseCase:
+    """Pruebas para el caso de uso de comparación entre alcaldías"""
+
+    def test_coincide_con_prediccion_individual(self):
+        """El precio en cada alcaldía debe ser el mismo que el de la predicción individual"""
+        input_data = CaracteristicasInputData(metros_cuadrados=150, recamaras=3, banos=2, estacionamientos=1)
+
+        result = predict_alcaldias('casas', input_data)
+
+        assert isinstance(result, ComparativoAlcaldias)
+        assert sorted(p.alcaldia for p in result.precios) == sorted(get_model_registry().get('casas').alcaldias)
+        for precio in result.precios:
+            individual = predict_casa(CasaInputData(alcaldia=precio.alcaldia, **input_data.model_dump()))
+            assert precio.precio_estimado == pytest.approx(individual.precio_estimado)
+
+    def test_ordenado_por_precio(self):
+        """Los resultados se ordenan por precio, ascendente o descendente"""
+        input_data = CaracteristicasInputData(metros_cuadrados=80, recamaras=2, banos=1, estacionamientos=1)
+
+        ascendente = [p.precio_estimado for p in predict_alcaldias('departamentos', input_data).precios]
+        descendente = [p.precio_estimado for p in predict_alcaldias('departamentos', input_data, descendente=True).precios]
+
+        assert ascendente == sorted(ascendente)
+        assert descendente == sorted(ascendente, reverse=True)
+
+    def test_valor_fuera_de_rango(self):
+        """Un valor fuera de rango se reporta como error de dominio"""
+        with pytest.raises(FeatureNoValida):
+            predict_alcaldias('casas', CaracteristicasInputData(metros_cuadrados=150, recamaras=12, banos=2, estacionamientos=1))
\ No newline at end of file
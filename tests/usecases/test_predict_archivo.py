@@ -0,0 +1,141 @@
+import asyncio
+import io
+import json
+import pytest
+import pandas as pd
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from app.executor import PrediccionExecutor
+from app.main import app
+from app.routers import propiedad
+from domain.exceptions import ErrorPrediccion, ServicioSaturado
+from usecases.predict_archivo import predict_archivo, detectar_formato
+
+
+def _csv(filas: int) -> io.BytesIO:
+    lineas = ["id,alcaldia,metros_cuadrados,recamaras,banos,estacionamientos"]
+    lineas += [f"{i},Tlalpan,{100 + i},3,2,1" for i in range(filas)]
+    lineas += ["x,Alcaldía Inexistente,100,3,2,1", "y,Tlalpan,abc,3,2,1"]
+    return io.BytesIO(("\n".join(lineas) + "\n").encode('utf-8'))
+
+
+def _evaluar(*args, **kwargs) -> str:
+    """Consume el iterador asíncrono del caso de uso y junta la salida"""
+    async def correr():
+        return "".join([parte async for parte in await predict_archivo(*args, **kwargs)])
+    return asyncio.run(correr())
+
+
+class TestPredictArchivoUseCase:
+    """Pruebas para el caso de uso de evaluación de archivos por bloques"""
+
+    def test_csv_por_bloques(self):
+        """Todas las filas se evalúan sin importar el tamaño de bloque y el encabezado sale una vez"""
+        salida = _evaluar('casas', _csv(250), 'csv', 'csv', tamano_bloque=100)
+        lineas = salida.strip().split("\n")
+
+        assert lineas[0] == "id,alcaldia,metros_cuadrados,recamaras,banos,estacionamientos,precio_estimado,error"
+        assert len(lineas) == 1 + 250 + 2
+        assert "Alcaldía Inexistente" in lineas[-2]
+        assert "metros_cuadrados" in lineas[-1]
+
+    def test_ndjson(self):
+        """Los resultados en NDJSON traen precio o error por fila"""
+        entrada = io.BytesIO((
+            '{"alcaldia": "Coyoacán", "metros_cuadrados": 100, "recamaras": 3, "banos": 2, "estacionamientos": 1}\n'
+            '{"alcaldia": "Coyoacán", "metros_cuadrados": 100, "recamaras": 9, "banos": 2, "estacionamientos": 1}\n'
+        ).encode('utf-8'))
+
+        registros = [json.loads(linea) for linea in _evaluar(
+            'departamentos', entrada, 'ndjson', 'ndjson'
+        ).splitlines()]
+
+        assert registros[0]['precio_estimado'] > 0 and registros[0]['error'] is None
+        assert registros[1]['precio_estimado'] is None and 'recamaras' in registros[1]['error']
+
+    def test_segundo_bloque_sin_columnas(self):
+        """Un bloque posterior al que le falta una columna se emite con el error en cada fila"""
+        fila = '{"alcaldia": "Coyoacán", "metros_cuadrados": 100, "recamaras": 3, "banos": 2, "estacionamientos": 1}\n'
+        incompleta = '{"alcaldia": "Coyoacán", "metros_cuadrados": 100, "recamaras": 3, "banos": 2}\n'
+        entrada = io.BytesIO((fila * 2 + incompleta * 2 + fila).encode('utf-8'))
+
+        registros = [json.loads(linea) for linea in _evaluar(
+            'departamentos', entrada, 'ndjson', 'ndjson', tamano_bloque=2
+        ).splitlines()]
+
+        assert len(registros) == 5
+        assert all(r['error'] is None for r in registros[:2] + registros[4:])
+        assert all(r['precio_estimado'] is None and 'estacionamientos' in r['error'] for r in registros[2:4])
+        assert list(registros[2]) == list(registros[0])
+
+    def test_error_de_lectura_a_mitad_del_archivo(self):
+        """Si el resto del archivo no se puede leer, un último registro lo indica en lugar de cortar la respuesta"""
+        lineas = ["alcaldia,metros_cuadrados,recamaras,banos,estacionamientos"]
+        lineas += ["Tlalpan,100,3,2,1"] * 3 + ["Tlalpan,100,3,2,1,extra,extra"]
+        salida = _evaluar(
+            'casas', io.BytesIO(("\n".join(lineas) + "\n").encode('utf-8')), 'csv', 'csv', tamano_bloque=2
+        )
+        resultado = pd.read_csv(io.StringIO(salida))
+
+        assert len(resultado) == 2 + 1
+        assert resultado['error'].iloc[:2].isna().all()
+        assert "No se pudo leer el resto del archivo" in resultado['error'].iloc[-1]
+
+    def test_faltan_columnas(self):
+        """Un archivo sin las columnas requeridas falla antes de empezar a responder"""
+        with pytest.raises(ErrorPrediccion):
+            _evaluar('casas', io.BytesIO(b"a,b\n1,2\n"), 'csv', 'csv')
+
+    def test_bloques_pasan_por_ejecutar(self):
+        """Cada bloque se evalúa con `ejecutar`; si rechaza un bloque posterior sus filas llevan el error"""
+        llamadas = []
+
+        async def ejecutar(fn, *args):
+            llamadas.append(args[1])
+            if len(llamadas) == 2:
+                raise ServicioSaturado(8)
+            return fn(*args)
+
+        resultado = pd.read_csv(io.StringIO(_evaluar('casas', _csv(250), 'csv', 'csv', tamano_bloque=100,
+                                                     ejecutar=ejecutar)))
+
+        assert [len(bloque) for bloque in llamadas] == [100, 100, 52]
+        assert len(resultado) == 252
+        assert resultado['precio_estimado'].iloc[100:200].isna().all()
+        assert resultado['error'].iloc[100:200].str.contains('saturado', case=False).all()
+        assert resultado['error'].iloc[:100].isna().all()
+
+    def test_upload_saturado_responde_503(self):
+        """Con el pool de predicciones lleno la carga de un archivo se rechaza antes de responder"""
+        saturado = PrediccionExecutor('thread', workers=1, max_pendientes=0)
+        try:
+            with patch.object(propiedad, 'get_executor', return_value=saturado):
+                respuesta = TestClient(app).post('/casas/predict/upload',
+                                                 files={'archivo': ('casas.csv', _csv(10), 'text/csv')})
+        finally:
+            saturado.shutdown()
+
+        assert respuesta.status_code == 503
+        assert respuesta.headers['retry-after'] == '1'
+
+    def test_upload_cierra_su_copia_del_archivo(self):
+        """La respuesta transmite una copia propia del archivo y la cierra al terminar"""
+        copias = []
+        copiar_archivo = propiedad._copiar_archivo
+
+        def copiar(origen):
+            copias.append(copiar_archivo(origen))
+            return copias[-1]
+
+        with patch.object(propiedad, '_copiar_archivo', side_effect=copiar):
+            respuesta = TestClient(app).post('/departamentos/predict/upload?tamano_bloque=100',
+                                             files={'archivo': ('deptos.csv', _csv(250), 'text/csv')})
+
+        assert respuesta.status_code == 200
+        assert len(pd.read_csv(io.StringIO(respuesta.text))) == 252
+        assert len(copias) == 1 and copias[0].closed
+
+    def test_detectar_formato(self):
+        assert detectar_formato('datos.csv', None) == 'csv'
+        assert detectar_formato('datos.jsonl', None) == 'ndjson'
+        assert detectar_formato(None, 'application/x-ndjson') == 'ndjson'
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from app.main import app
+from domain.exceptions import AlcaldiaNoEncontrada, FeatureNoValida
+from domain.models import CasaInputData, CurvaInputData, CurvaPrecios, DepartamentoInputData
+from usecases.predict_casas import predict_casa
+from usecases.predict_curva import predict_curva
+from usecases.predict_departamentos import predict_departamento
+
+
+class TestPredictCurvaUseCase:
+    """Pruebas para el caso de uso de la curva de precio contra metros cuadrados"""
+
+    def test_curva_coincide_con_prediccion_individual(self):
+        """Cada punto de la curva debe dar el mismo precio que la predicción individual"""
+        input_data = CurvaInputData(
+            alcaldia="benito juarez", recamaras=3, banos=2, estacionamientos=1,
+            metros_min=60, metros_max=300, paso=20
+        )
+
+        result = predict_curva('casas', input_data)
+
+        assert isinstance(result, CurvaPrecios)
+        assert result.alcaldia == "Benito Juárez"
+        assert result.metros_cuadrados == [60 + 20 * i for i in range(13)]
+        assert len(result.series) == 1
+        for metros, precio in zip(result.metros_cuadrados, result.series[0].precios):
+            individual = predict_casa(CasaInputData(
+                alcaldia="Benito Juárez", metros_cuadrados=metros, recamaras=3, banos=2, estacionamientos=1
+            ))
+            assert precio == pytest.approx(individual.precio_estimado)
+
+    def test_barrido_de_recamaras_y_banos(self):
+        """Con valores a barrer se devuelve una serie por combinación de recámaras y baños"""
+        input_data = CurvaInputData(
+            alcaldia="Miguel Hidalgo", recamaras=2, banos=1, estacionamientos=1,
+            metros_min=50, metros_max=150, paso=25,
+            recamaras_valores=[3, 1, 2], banos_valores=[1, 2]
+        )
+
+        result = predict_curva('departamentos', input_data)
+
+        assert result.tipo_propiedad == "departamento"
+        assert [(s.recamaras, s.banos) for s in result.series] == [(1, 1), (1, 2), (2, 1), (2, 2), (3, 1), (3, 2)]
+        serie = result.series[3]
+        individual = predict_departamento(DepartamentoInputData(
+            alcaldia="Miguel Hidalgo", metros_cuadrados=100, recamaras=2, banos=2, estacionamientos=1
+        ))
+        assert serie.precios[2] == pytest.approx(individual.precio_estimado, abs=0.01)
+
+    def test_errores(self):
+        """Los rangos inválidos y las alcaldías desconocidas se reportan como errores de dominio"""
+        base = dict(alcaldia="Tlalpan", recamaras=3, banos=2, estacionamientos=1)
+
+        with pytest.raises(FeatureNoValida):
+            predict_curva('casas', CurvaInputData(**base, metros_min=300, metros_max=100))
+        with pytest.raises(FeatureNoValida):
+            predict_curva('casas', CurvaInputData(**base, metros_min=100, metros_max=300, recamaras_valores=[3, 12]))
+        with pytest.raises(FeatureNoValida):
+            predict_curva('casas', CurvaInputData(**base, metros_min=1, metros_max=100000, paso=1))
+        with pytest.raises(AlcaldiaNoEncontrada):
+            predict_curva('casas', CurvaInputData(**{**base, 'alcaldia': "Springfield"}, metros_min=100, metros_max=300))
+
+    def test_rango_enorme_se_rechaza_sin_reservar_memoria(self):
+        """El número de puntos se revisa antes de crear el arreglo de metros cuadrados"""
+        cuerpo = dict(alcaldia="Tlalpan", recamaras=3, banos=2, estacionamientos=1, metros_min=1, metros_max=1e8, paso=1)
+
+        with patch.object(np, 'arange', wraps=np.arange) as mock_arange:
+            respuesta = TestClient(app).post('/casas/predict/curva', json=cuerpo)
+            with pytest.raises(FeatureNoValida):
+                predict_curva('casas', CurvaInputData(**{**cuerpo, 'metros_max': float('inf')}))
+            with pytest.raises(FeatureNoValida):
+                # Cabe sin barrido, pero no con 4 combinaciones de recámaras y baños
+                predict_curva('casas', CurvaInputData(**{**cuerpo, 'metros_max': 10000},
+                                                      recamaras_valores=[2, 3], banos_valores=[1, 2]))
+
+        assert respuesta.status_code == 422
+        mock_arange.assert_not_called()
@@ -0,0 +1,59 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from domain.exceptions import FeatureNoValida
+from domain.models import CasaInputData, DepartamentoInputData, PrediccionLote
+from usecases.predict_casas import predict_casa, predict_casas_lote
+from usecases.predict_departamentos import predict_departamentos_lote
+
+
+class TestPredictLotesUseCase:
+    """Pruebas para los casos de uso de predicción por lotes"""
+
+    def test_lote_coincide_con_prediccion_individual(self):
+        """Cada fila del lote debe dar el mismo precio que la predicción individual"""
+        input_data = [
+            CasaInputData(alcaldia="Benito Juárez", metros_cuadrados=150, recamaras=3, banos=2, estacionamientos=1),
+            CasaInputData(alcaldia="Tlalpan", metros_cuadrados=320, recamaras=4, banos=3, estacionamientos=2),
+            CasaInputData(alcaldia="Coyoacán", metros_cuadrados=90, recamaras=2, banos=1, estacionamientos=0)
+        ]
+
+        result = predict_casas_lote(input_data)
+
+        assert isinstance(result, PrediccionLote)
+        assert result.total == 3
+        assert result.exitosas == 3
+        for item, resultado in zip(input_data, result.resultados):
+            assert resultado.error is None
+            assert resultado.prediccion.precio_estimado == pytest.approx(predict_casa(item).precio_estimado)
+
+    def test_errores_por_fila(self):
+        """Una fila inválida recibe su propio error sin afectar al resto"""
+        input_data = [
+            DepartamentoInputData(alcaldia="Miguel Hidalgo", metros_cuadrados=80, recamaras=2, banos=1, estacionamientos=1),
+            DepartamentoInputData(alcaldia="Alcaldía Inexistente", metros_cuadrados=80, recamaras=2, banos=1, estacionamientos=1),
+            DepartamentoInputData(alcaldia="Miguel Hidalgo", metros_cuadrados=80, recamaras=12, banos=1, estacionamientos=1)
+        ]
+
+        result = predict_departamentos_lote(input_data)
+
+        assert result.exitosas == 1
+        assert result.resultados[0].prediccion is not None
+        assert "Alcaldía Inexistente" in result.resultados[1].error
+        assert "recamaras" in result.resultados[2].error
+        assert [r.indice for r in result.resultados] == [0, 1, 2]
+
+    def test_valor_fuera_de_rango_igual_en_todos_los_caminos(self):
+        """Un valor fuera de rango da el mismo error en la predicción individual, en el lote y en la API (422)"""
+        entrada = CasaInputData(alcaldia="Tlalpan", metros_cuadrados=150, recamaras=12, banos=2, estacionamientos=1)
+
+        with pytest.raises(FeatureNoValida) as error:
+            predict_casa(entrada)
+        assert error.value.feature == 'recamaras'
+        assert error.value.valor == 12
+        assert "valor '12'" in str(error.value)
+        assert predict_casas_lote([entrada]).resultados[0].error == str(error.value)
+
+        respuesta = TestClient(app).post('/casas/predict', json=entrada.model_dump())
+        assert respuesta.status_code == 422
+        assert respuesta.json()['detail'] == str(error.value)
\ No newline at end of file
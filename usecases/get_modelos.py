@@ -0,0 +1,24 @@
+from typing import List
+from domain.models import ModeloInfo, ShadowInfo
+from infra.data.model_registry import get_model_registry
+from infra.data.shadow import shadow_info
+
+
+def get_modelos_info() -> List[ModeloInfo]:
+    """
+    Caso de uso para obtener la información de los modelos cargados
+    
+    Returns:
+        Versión del artefacto y tiempo de carga de cada modelo
+    """
+    return get_model_registry().info()
+
+
+def get_shadow_info() -> List[ShadowInfo]:
+    """
+    Caso de uso para obtener las estadísticas de los modelos candidatos en modo sombra
+    
+    Returns:
+        Muestras evaluadas, descartadas y diferencias contra el modelo primario de cada candidato
+    """
+    return shadow_info()
\ No newline at end of file
@@ -1,12 +1,15 @@
+from typing import List, Optional
 from domain.models import (
     PrecioM2Response, 
     EstadisticasPrecios, 
     TotalResponse, 
     PreciosAlcaldiaResponse,
-    PrecioM2AlcaldiaResponse
+    PrecioM2AlcaldiaResponse,
+    ResumenEstadisticas,
+    StatsDebugInfo
 )
-from domain.exceptions import ErrorEstadisticas
-from infra.data.stats_repo import StatsRepository
+from domain.exceptions import CampoNoValido, ErrorEstadisticas
+from infra.data.stats_materializadas import get_stats_materializadas
 
 
 def get_precio_m2_casas() -> PrecioM2Response:
@@ -20,9 +23,7 @@ def get_precio_m2_casas() -> PrecioM2Response:
         ErrorEstadisticas: Si hay un error al calcular las estadísticas
     """
     try:
-        repo = StatsRepository()
-        precio_m2 = repo.get_precio_m2_casas()
-        return precio_m2
+        return get_stats_materializadas().get('precio_m2_casas')
     except Exception as e:
         raise ErrorEstadisticas(str(e))
 
@@ -38,9 +39,7 @@ def get_precio_m2_departamentos() -> PrecioM2Response:
         ErrorEstadisticas: Si hay un error al calcular las estadísticas
     """
     try:
-        repo = StatsRepository()
-        precio_m2 = repo.get_precio_m2_departamentos()
-        return precio_m2
+        return get_stats_materializadas().get('precio_m2_departamentos')
     except Exception as e:
         raise ErrorEstadisticas(str(e))
 
@@ -56,9 +55,7 @@ def get_stats_casas() -> EstadisticasPrecios:
         ErrorEstadisticas: Si hay un error al calcular las estadísticas
     """
     try:
-        repo = StatsRepository()
-        stats = repo.get_stats_casas()
-        return stats
+        return get_stats_materializadas().get('stats_casas')
     except Exception as e:
         raise ErrorEstadisticas(str(e))
 
@@ -74,9 +71,7 @@ def get_stats_departamentos() -> EstadisticasPrecios:
         ErrorEstadisticas: Si hay un error al calcular las estadísticas
     """
     try:
-        repo = StatsRepository()
-        stats = repo.get_stats_departamentos()
-        return stats
+        return get_stats_materializadas().get('stats_departamentos')
     except Exception as e:
         raise ErrorEstadisticas(str(e))
 
@@ -92,9 +87,7 @@ def get_total_casas() -> TotalResponse:
         ErrorEstadisticas: Si hay un error al calcular las estadísticas
     """
     try:
-        repo = StatsRepository()
-        total = repo.get_total_casas()
-        return total
+        return get_stats_materializadas().get('total_casas')
     except Exception as e:
         raise ErrorEstadisticas(str(e))
 
@@ -110,9 +103,7 @@ def get_total_departamentos() -> TotalResponse:
         ErrorEstadisticas: Si hay un error al calcular las estadísticas
     """
     try:
-        repo = StatsRepository()
-        total = repo.get_total_departamentos()
-        return total
+        return get_stats_materializadas().get('total_departamentos')
     except Exception as e:
         raise ErrorEstadisticas(str(e))
 
@@ -128,9 +119,7 @@ def get_total_propiedades() -> TotalResponse:
         ErrorEstadisticas: Si hay un error al calcular las estadísticas
     """
     try:
-        repo = StatsRepository()
-        total = repo.get_total_propiedades()
-        return total
+        return get_stats_materializadas().get('total_propiedades')
     except Exception as e:
         raise ErrorEstadisticas(str(e))
 
@@ -146,9 +135,7 @@ def get_precios_por_alcaldia_casas() -> PreciosAlcaldiaResponse:
         ErrorEstadisticas: Si hay un error al calcular las estadísticas
     """
     try:
-        repo = StatsRepository()
-        precios = repo.get_precio_promedio_por_alcaldia_casas()
-        return PreciosAlcaldiaResponse(precios=precios)
+        return get_stats_materializadas().get('precios_por_alcaldia_casas')
     except Exception as e:
         raise ErrorEstadisticas(str(e))
 
@@ -164,9 +151,7 @@ def get_precios_por_alcaldia_departamentos() -> PreciosAlcaldiaResponse:
         ErrorEstadisticas: Si hay un error al calcular las estadísticas
     """
     try:
-        repo = StatsRepository()
-        precios = repo.get_precio_promedio_por_alcaldia_departamentos()
-        return PreciosAlcaldiaResponse(precios=precios)
+        return get_stats_materializadas().get('precios_por_alcaldia_departamentos')
     except Exception as e:
         raise ErrorEstadisticas(str(e))
 
@@ -182,9 +167,7 @@ def get_precios_por_alcaldia_total() -> PreciosAlcaldiaResponse:
         ErrorEstadisticas: Si hay un error al calcular las estadísticas
     """
     try:
-        repo = StatsRepository()
-        precios = repo.get_precio_promedio_por_alcaldia_total()
-        return PreciosAlcaldiaResponse(precios=precios)
+        return get_stats_materializadas().get('precios_por_alcaldia_total')
     except Exception as e:
         raise ErrorEstadisticas(str(e))
 
@@ -200,9 +183,7 @@ def get_precio_m2_por_alcaldia_casas() -> PrecioM2AlcaldiaResponse:
         ErrorEstadisticas: Si hay un error al calcular las estadísticas
     """
     try:
-        repo = StatsRepository()
-        precios = repo.get_precio_m2_por_alcaldia_casas()
-        return PrecioM2AlcaldiaResponse(precios=precios)
+        return get_stats_materializadas().get('precio_m2_por_alcaldia_casas')
     except Exception as e:
         raise ErrorEstadisticas(str(e))
 
@@ -218,9 +199,7 @@ def get_precio_m2_por_alcaldia_departamentos() -> PrecioM2AlcaldiaResponse:
         ErrorEstadisticas: Si hay un error al calcular las estadísticas
     """
     try:
-        repo = StatsRepository()
-        precios = repo.get_precio_m2_por_alcaldia_departamentos()
-        return PrecioM2AlcaldiaResponse(precios=precios)
+        return get_stats_materializadas().get('precio_m2_por_alcaldia_departamentos')
     except Exception as e:
         raise ErrorEstadisticas(str(e))
 
@@ -236,8 +215,54 @@ def get_precio_m2_por_alcaldia_total() -> PrecioM2AlcaldiaResponse:
         ErrorEstadisticas: Si hay un error al calcular las estadísticas
     """
     try:
-        repo = StatsRepository()
-        precios = repo.get_precio_m2_por_alcaldia_total()
-        return PrecioM2AlcaldiaResponse(precios=precios)
+        return get_stats_materializadas().get('precio_m2_por_alcaldia_total')
     except Exception as e:
-        raise ErrorEstadisticas(str(e)) 
\ No newline at end of file
+        raise ErrorEstadisticas(str(e))
+
+
+def get_stats_resumen(campos: Optional[List[str]] = None) -> ResumenEstadisticas:
+    """
+    Caso de uso para obtener en una sola respuesta las estadísticas de casas, departamentos y todas las propiedades
+    
+    Args:
+        campos: Secciones (`casas`), campos (`precio_m2`) o campos de una sección (`casas.precio_m2`); todos si se omite
+    
+    Returns:
+        Resumen con los campos seleccionados
+        
+    Raises:
+        CampoNoValido: Si se pide un campo que no existe
+        ErrorEstadisticas: Si hay un error al calcular las estadísticas
+    """
+    try:
+        return get_stats_materializadas().resumen(campos)
+    except CampoNoValido:
+        raise
+    except Exception as e:
+        raise ErrorEstadisticas(str(e))
+
+
+def get_stats_debug() -> StatsDebugInfo:
+    """
+    Caso de uso para consultar los snapshots cargados y los tiempos de materialización
+    
+    Returns:
+        Snapshots cargados y la última materialización de cada grupo de estadísticas
+    """
+    return get_stats_materializadas().info()
+
+
+def recalcular_stats() -> StatsDebugInfo:
+    """
+    Caso de uso para recargar los datos que cambiaron y volver a materializar todas las estadísticas
+    
+    Returns:
+        Snapshots cargados y la nueva materialización de cada grupo de estadísticas
+        
+    Raises:
+        ErrorEstadisticas: Si hay un error al recalcular las estadísticas
+    """
+    try:
+        return get_stats_materializadas().recalcular()
+    except Exception as e:
+        raise ErrorEstadisticas(str(e))
\ No newline at end of file
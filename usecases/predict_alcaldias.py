@@ -0,0 +1,52 @@
+import numpy as np
+
+from domain.models import CaracteristicasInputData, ComparativoAlcaldias, PrecioAlcaldia
+from domain.exceptions import ModeloNoDisponible, FeatureNoValida, ErrorPrediccion
+from infra.data.model_registry import get_model_registry
+from usecases.predict_curva import TIPOS_PROPIEDAD
+
+
+def predict_alcaldias(tipo: str, input_data: CaracteristicasInputData, descendente: bool = False) -> ComparativoAlcaldias:
+    """
+    Caso de uso para estimar el precio de una misma propiedad en todas las alcaldías
+
+    Args:
+        tipo: Tipo de propiedad ('casas' o 'departamentos')
+        input_data: Características de la propiedad
+        descendente: Ordenar de la alcaldía más cara a la más barata
+
+    Returns:
+        El precio en cada alcaldía que conoce el modelo, ordenado por precio
+
+    Raises:
+        FeatureNoValida: Si algún valor está fuera de rango
+        ModeloNoDisponible: Si no se puede cargar el modelo
+        ErrorPrediccion: Si hay un error en el proceso de predicción
+    """
+    try:
+        # 1. Evaluar la propiedad en todas las alcaldías en una sola llamada al modelo
+        repo = get_model_registry().get(tipo)
+        precios = repo.predict_alcaldias(input_data.model_dump())
+
+        # 2. Ordenar por precio
+        orden = np.argsort(-precios if descendente else precios, kind='stable')
+
+        # 3. Construir y retornar la respuesta
+        return ComparativoAlcaldias(
+            tipo_propiedad=TIPOS_PROPIEDAD[tipo],
+            caracteristicas={
+                'metros_cuadrados': float(input_data.metros_cuadrados),
+                'recamaras': int(input_data.recamaras),
+                'banos': int(input_data.banos),
+                'estacionamientos': int(input_data.estacionamientos)
+            },
+            precios=[
+                PrecioAlcaldia(alcaldia=repo.alcaldias[i], precio_estimado=round(float(precios[i]), 2))
+                for i in orden
+            ]
+        )
+
+    except (FeatureNoValida, ModeloNoDisponible):
+        raise
+    except Exception as e:
+        raise ErrorPrediccion(str(e))
\ No newline at end of file
@@ -0,0 +1,191 @@
+import asyncio
+import io
+import json
+import numpy as np
+import pandas as pd
+from typing import Any, AsyncIterator, Awaitable, BinaryIO, Callable, Iterator, List, Optional
+
+from domain.exceptions import ModeloNoDisponible, ErrorPrediccion, ServicioSaturado
+from infra.data.model_registry import get_model_registry
+
+
+# Columnas obligatorias en los archivos de entrada
+COLUMNAS_REQUERIDAS = ('alcaldia', 'metros_cuadrados', 'recamaras', 'banos', 'estacionamientos')
+
+# Formatos soportados y su tipo de contenido
+FORMATOS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson'
+}
+
+
+def detectar_formato(nombre: Optional[str], content_type: Optional[str]) -> str:
+    """
+    Detecta el formato de un archivo por su extensión o su tipo de contenido
+
+    Raises:
+        ErrorPrediccion: Si el formato no es CSV ni NDJSON
+    """
+    nombre = (nombre or '').lower()
+    content_type = (content_type or '').lower()
+    if nombre.endswith(('.ndjson', '.jsonl')) or 'ndjson' in content_type or 'jsonl' in content_type:
+        return 'ndjson'
+    if nombre.endswith('.csv') or 'csv' in content_type:
+        return 'csv'
+    raise ErrorPrediccion(f"No se pudo detectar el formato del archivo: {nombre or content_type}")
+
+
+def _leer_bloques(archivo: BinaryIO, formato: str, tamano_bloque: int) -> Iterator[pd.DataFrame]:
+    """Lee el archivo en bloques de tamaño fijo sin cargarlo completo en memoria"""
+    texto = io.TextIOWrapper(archivo, encoding='utf-8', newline='')
+    if formato == 'csv':
+        lector = pd.read_csv(texto, chunksize=tamano_bloque, dtype={'alcaldia': str})
+    else:
+        lector = pd.read_json(texto, lines=True, chunksize=tamano_bloque, dtype=False)
+    with lector:
+        yield from lector
+
+
+def _validar_columnas(bloque: pd.DataFrame) -> None:
+    """Verifica que el archivo tenga todas las columnas requeridas"""
+    faltantes = [col for col in COLUMNAS_REQUERIDAS if col not in bloque.columns]
+    if faltantes:
+        raise ErrorPrediccion(f"Faltan columnas en el archivo: {', '.join(faltantes)}")
+
+
+def _predecir_bloque(repo, bloque: pd.DataFrame) -> pd.DataFrame:
+    """Evalúa un bloque en una sola llamada al modelo y agrega precio y error por fila"""
+    X_num = np.column_stack([
+        pd.to_numeric(bloque[col], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+        for col in COLUMNAS_REQUERIDAS[1:]
+    ])
+    alcaldias = bloque['alcaldia'].fillna('').astype(str).tolist()
+    precios, errores = repo.predict_matrix(X_num, alcaldias)
+
+    resultado = bloque.copy()
+    resultado['precio_estimado'] = np.round(precios, 2)
+    resultado['error'] = [None if error is None else str(error) for error in errores]
+    return resultado
+
+
+def _bloque_con_error(bloque: pd.DataFrame, columnas: List[str], mensaje: str) -> pd.DataFrame:
+    """Filas de un bloque que no se pudo evaluar, con el motivo en la columna de error"""
+    resultado = bloque.reindex(columns=columnas)
+    resultado['precio_estimado'] = np.nan
+    resultado['error'] = mensaje
+    return resultado
+
+
+def _serializar_bloque(bloque: pd.DataFrame, formato: str, encabezado: bool) -> str:
+    """Convierte un bloque de resultados al formato de salida"""
+    if formato == 'csv':
+        return bloque.to_csv(index=False, header=encabezado)
+    registros = bloque.replace({np.nan: None}).to_dict(orient='records')
+    return ''.join(json.dumps(registro, ensure_ascii=False, default=str) + '\n' for registro in registros)
+
+
+def evaluar_bloque(tipo: str, bloque: pd.DataFrame, columnas: List[str], formato_salida: str,
+                   encabezado: bool) -> str:
+    """
+    Evalúa un bloque en una sola llamada al modelo y lo serializa
+
+    Una vez enviada la respuesta ya no se puede reportar un error HTTP: las
+    filas de un bloque que falla se emiten con el error en lugar del precio.
+    Se ejecuta en el pool de predicciones, así que sólo recibe datos que se
+    pueden enviar a otro proceso.
+    """
+    try:
+        _validar_columnas(bloque)
+        resultado = _predecir_bloque(get_model_registry().get(tipo), bloque).reindex(columns=columnas)
+    except Exception as e:
+        resultado = _bloque_con_error(bloque, columnas, str(e))
+    return _serializar_bloque(resultado, formato_salida, encabezado)
+
+
+async def _en_hilo(fn: Callable, *args: Any) -> Any:
+    return await asyncio.to_thread(fn, *args)
+
+
+async def predict_archivo(tipo: str, archivo: BinaryIO, formato: str, formato_salida: str,
+                          tamano_bloque: int = 5000,
+                          ejecutar: Optional[Callable[..., Awaitable[Any]]] = None) -> AsyncIterator[str]:
+    """
+    Caso de uso para evaluar un archivo CSV o NDJSON de propiedades por bloques
+    
+    Cada bloque se evalúa con una sola llamada al modelo y se emite en cuanto
+    está listo, así que la memoria usada depende del tamaño del bloque y no
+    del tamaño del archivo. La lectura del archivo se hace en un hilo aparte
+    y cada bloque se evalúa con `ejecutar` (el pool acotado de predicciones),
+    sin bloquear el event loop. El archivo se cierra al terminar de consumir
+    el iterador. Los errores de los bloques posteriores al primero se
+    reportan en la columna de error de sus filas (o en un último registro si
+    el resto del archivo no se puede leer), nunca cortando la respuesta.
+    
+    Args:
+        tipo: Tipo de propiedad ('casas' o 'departamentos')
+        archivo: Archivo binario con las propiedades a evaluar; pasa a ser del iterador
+        formato: Formato del archivo de entrada ('csv' o 'ndjson')
+        formato_salida: Formato de los resultados ('csv' o 'ndjson')
+        tamano_bloque: Número de filas por bloque
+        ejecutar: Función asíncrona `ejecutar(fn, *args)` que evalúa cada bloque
+            (por omisión, en un hilo)
+        
+    Returns:
+        Iterador asíncrono con los resultados serializados de cada bloque
+    
+    Raises:
+        ModeloNoDisponible: Si no se puede cargar el modelo
+        ServicioSaturado: Si el pool de predicciones no acepta el primer bloque
+        ErrorPrediccion: Si el archivo no se puede leer o le faltan columnas
+    """
+    if formato not in FORMATOS or formato_salida not in FORMATOS:
+        archivo.close()
+        raise ErrorPrediccion(f"Formato no soportado: {formato} -> {formato_salida}")
+    ejecutar = ejecutar or _en_hilo
+
+    try:
+        await asyncio.to_thread(get_model_registry().get, tipo)
+
+        # Leer el primer bloque antes de empezar a responder para reportar errores de formato
+        bloques = _leer_bloques(archivo, formato, tamano_bloque)
+        primero = await asyncio.to_thread(next, bloques, None)
+        if primero is None:
+            raise ErrorPrediccion("El archivo está vacío")
+        _validar_columnas(primero)
+
+        # Todos los bloques se emiten con las columnas del primero
+        columnas = list(dict.fromkeys([*primero.columns, 'precio_estimado', 'error']))
+
+        # El primer bloque también se evalúa antes de responder: con el pool saturado la petición recibe 503
+        resultado_primero = await ejecutar(evaluar_bloque, tipo, primero, columnas, formato_salida, True)
+    except (ModeloNoDisponible, ErrorPrediccion, ServicioSaturado):
+        archivo.close()
+        raise
+    except Exception as e:
+        archivo.close()
+        raise ErrorPrediccion(f"No se pudo leer el archivo: {str(e)}")
+
+    async def generar() -> AsyncIterator[str]:
+        try:
+            yield resultado_primero
+            while True:
+                try:
+                    bloque = await asyncio.to_thread(next, bloques, None)
+                except Exception as e:
+                    # El resto del archivo no se puede leer: un último registro indica dónde se detuvo
+                    fila = pd.DataFrame({'error': [f"No se pudo leer el resto del archivo: {str(e)}"]})
+                    yield _serializar_bloque(fila.reindex(columns=columnas), formato_salida, encabezado=False)
+                    break
+                if bloque is None:
+                    break
+                try:
+                    yield await ejecutar(evaluar_bloque, tipo, bloque, columnas, formato_salida, False)
+                except ServicioSaturado as e:
+                    # La respuesta ya empezó: las filas del bloque rechazado llevan el error
+                    yield _serializar_bloque(_bloque_con_error(bloque, columnas, str(e)), formato_salida,
+                                             encabezado=False)
+        finally:
+            # Cerrar el archivo también invalida el lector de pandas que lo envuelve
+            archivo.close()
+
+    return generar()
\ No newline at end of file
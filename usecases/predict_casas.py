@@ -1,58 +1,101 @@
-import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 
-from domain.models import Prediccion, CasaInputData
-from domain.exceptions import AlcaldiaNoEncontrada, ModeloNoDisponible, ErrorPrediccion
+from domain.models import Prediccion, CasaInputData, PrediccionLote
+from usecases import predict_propiedad
 
-from infra.data.casas_repo import CasasRepository
 
+# Codificador de las respuestas en modo JSON rápido (mismos campos y redondeo que `Prediccion`)
+CODIFICADOR = predict_propiedad.CODIFICADORES['casas']
 
-def predict_casa(input_data: CasaInputData) -> Prediccion:
+
+def _model_input(input_data: CasaInputData) -> Dict[str, Any]:
+    """Prepara los datos de entrada en el formato que espera el repositorio"""
+    return predict_propiedad._model_input(input_data)
+
+
+def _construir_prediccion(input_data: CasaInputData, precio_estimado: float,
+                          fecha_prediccion: Optional[str] = None,
+                          intervalo: Optional[Tuple[float, float]] = None,
+                          nivel: Optional[float] = None) -> Prediccion:
+    """Construye la respuesta de predicción de una casa"""
+    return predict_propiedad._construir_prediccion('casas', input_data, precio_estimado, fecha_prediccion,
+                                                   intervalo, nivel)
+
+
+def predict_casa(input_data: CasaInputData, nivel: float = 0.9) -> Prediccion:
     """
     Caso de uso para predecir el precio de una casa
     
     Args:
         input_data: Datos de entrada para la predicción
+        nivel: Nivel de confianza del intervalo de precio
         
     Returns:
-        Predicción con el precio estimado
+        Predicción con el precio estimado y, si el modelo lo permite, su intervalo
     
     Raises:
         AlcaldiaNoEncontrada: Si no se encuentra información para la alcaldía
+        FeatureNoValida: Si algún valor está fuera de rango
         ModeloNoDisponible: Si no se puede cargar el modelo
         ErrorPrediccion: Si hay un error en el proceso de predicción
     """
-    try:
-        # 1. Preparar datos para el modelo
-        model_input = {
-            'alcaldia': input_data.alcaldia,
-            'metros_cuadrados': input_data.metros_cuadrados,
-            'recamaras': input_data.recamaras,
-            'banos': input_data.banos,
-            'estacionamientos': input_data.estacionamientos
-        }
+    return predict_propiedad.predict_propiedad('casas', input_data, nivel)
+
+
+def predict_casa_json(input_data: CasaInputData, nivel: float = 0.9) -> bytes:
+    """Igual que `predict_casa`, pero devuelve la respuesta ya codificada en JSON"""
+    return predict_propiedad.predict_propiedad_json('casas', input_data, nivel)
+
+
+def predict_casas_lote(input_data: List[CasaInputData]) -> PrediccionLote:
+    """
+    Caso de uso para predecir el precio de un lote de casas
+    
+    Todas las filas válidas se evalúan en una sola llamada al modelo; las
+    filas inválidas reciben su propio error sin afectar al resto del lote.
+    
+    Args:
+        input_data: Lista de datos de entrada para la predicción
         
-        # 2. Cargar repositorio y hacer predicción
-        repo = CasasRepository()
-        precio_estimado = repo.predict(model_input)
+    Returns:
+        Predicción o error de cada fila, en el mismo orden de entrada
+    
+    Raises:
+        ModeloNoDisponible: Si no se puede cargar el modelo
+        ErrorPrediccion: Si hay un error en el proceso de predicción
+    """
+    return predict_propiedad.predict_propiedades_lote('casas', input_data)
+
+
+def predict_casas_lote_json(input_data: List[CasaInputData]) -> bytes:
+    """Igual que `predict_casas_lote`, pero devuelve la respuesta ya codificada en JSON"""
+    return predict_propiedad.predict_propiedades_lote_json('casas', input_data)
+
+
+async def predict_casa_coalescida(input_data: CasaInputData, coalescer, nivel: float = 0.9) -> Prediccion:
+    """
+    Caso de uso para predecir el precio de una casa a través de un coalescer
+    
+    La predicción se encola junto con otras peticiones concurrentes y se
+    evalúa en un solo lote; la respuesta es la misma que la de `predict_casa`.
+    
+    Args:
+        input_data: Datos de entrada para la predicción
+        coalescer: Objeto con un método asíncrono `predict(model_input) -> float`
+        nivel: Nivel de confianza del intervalo de precio
         
-        # 3. Construir y retornar la respuesta
-        return Prediccion(
-            tipo_propiedad="casa",
-            precio_estimado=round(precio_estimado, 2),
-            alcaldia=input_data.alcaldia,
-            caracteristicas={
-                'metros_cuadrados': float(input_data.metros_cuadrados),
-                'recamaras': int(input_data.recamaras),
-                'banos': int(input_data.banos),
-                'estacionamientos': int(input_data.estacionamientos)
-            },
-            fecha_prediccion=datetime.datetime.now().isoformat()
-        )
-    
-    except (AlcaldiaNoEncontrada, ModeloNoDisponible):
-        # Dejar que estas excepciones se propaguen tal cual
-        raise
-    except Exception as e:
-        # Otras excepciones se convierten en ErrorPrediccion
-        raise ErrorPrediccion(str(e)) 
\ No newline at end of file
+    Returns:
+        Predicción con el precio estimado y, si el modelo lo permite, su intervalo
+    
+    Raises:
+        AlcaldiaNoEncontrada: Si no se encuentra información para la alcaldía
+        FeatureNoValida: Si algún valor está fuera de rango
+        ModeloNoDisponible: Si no se puede cargar el modelo
+        ErrorPrediccion: Si hay un error en el proceso de predicción
+    """
+    return await predict_propiedad.predict_propiedad_coalescida('casas', input_data, coalescer, nivel)
+
+
+async def predict_casa_coalescida_json(input_data: CasaInputData, coalescer, nivel: float = 0.9) -> bytes:
+    """Igual que `predict_casa_coalescida`, pero devuelve la respuesta ya codificada en JSON"""
+    return await predict_propiedad.predict_propiedad_coalescida_json('casas', input_data, coalescer, nivel)
\ No newline at end of file
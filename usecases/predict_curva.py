@@ -0,0 +1,89 @@
+import numpy as np
+
+from domain.models import CurvaInputData, CurvaPrecios, SerieCurva
+from domain.exceptions import AlcaldiaNoEncontrada, ModeloNoDisponible, FeatureNoValida, ErrorPrediccion
+from infra.data.model_registry import get_model_registry
+
+
+# Número máximo de puntos (metros cuadrados × combinaciones de recámaras y baños) por curva
+MAX_PUNTOS_CURVA = 20000
+
+# Nombre de la propiedad en singular, como en las predicciones individuales
+TIPOS_PROPIEDAD = {
+    'casas': 'casa',
+    'departamentos': 'departamento'
+}
+
+
+def _metros(input_data: CurvaInputData, combinaciones: int) -> np.ndarray:
+    """
+    Metros cuadrados de la curva, de metros_min a metros_max (inclusive) cada `paso`
+
+    El número de puntos se revisa antes de crear el arreglo, así que un rango
+    enorme se rechaza sin reservar memoria.
+
+    Args:
+        input_data: Propiedad base y rango de metros cuadrados
+        combinaciones: Número de combinaciones de recámaras y baños que se evalúan en cada punto
+
+    Raises:
+        FeatureNoValida: Si el rango está invertido o la curva tendría demasiados puntos
+    """
+    if input_data.metros_max < input_data.metros_min:
+        raise FeatureNoValida('metros_max', input_data.metros_max)
+    # El pequeño margen evita perder el último punto por errores de redondeo
+    puntos = np.floor((input_data.metros_max - input_data.metros_min) / input_data.paso + 1e-9) + 1
+    if not np.isfinite(puntos) or puntos * combinaciones > MAX_PUNTOS_CURVA:
+        raise FeatureNoValida('paso', input_data.paso)
+    return input_data.metros_min + input_data.paso * np.arange(int(puntos))
+
+
+def predict_curva(tipo: str, input_data: CurvaInputData) -> CurvaPrecios:
+    """
+    Caso de uso para calcular la curva de precio contra metros cuadrados de una propiedad
+
+    La matriz de diseño de toda la curva (y del barrido opcional de recámaras
+    y baños) se arma de una vez y se evalúa en una sola llamada al modelo.
+
+    Args:
+        tipo: Tipo de propiedad ('casas' o 'departamentos')
+        input_data: Propiedad base, rango de metros cuadrados y valores a barrer
+
+    Returns:
+        Los metros cuadrados de la curva y una serie de precios por combinación de recámaras y baños
+
+    Raises:
+        AlcaldiaNoEncontrada: Si no se encuentra información para la alcaldía
+        FeatureNoValida: Si el rango o algún valor no es válido, o la curva tiene demasiados puntos
+        ModeloNoDisponible: Si no se puede cargar el modelo
+        ErrorPrediccion: Si hay un error en el proceso de predicción
+    """
+    try:
+        # 1. Valores a barrer (sin repetidos, en orden)
+        recamaras = sorted(set(input_data.recamaras_valores or [input_data.recamaras]))
+        banos = sorted(set(input_data.banos_valores or [input_data.banos]))
+        metros = _metros(input_data, len(recamaras) * len(banos))
+
+        # 2. Evaluar toda la curva en una sola llamada al modelo
+        repo = get_model_registry().get(tipo)
+        alcaldia = repo.resolve_alcaldia(input_data.alcaldia)
+        precios = repo.predict_curva(alcaldia, metros, recamaras, banos, input_data.estacionamientos)
+
+        # 3. Construir y retornar la respuesta
+        precios = np.round(precios, 2)
+        combinaciones = [(r, b) for r in recamaras for b in banos]
+        return CurvaPrecios(
+            tipo_propiedad=TIPOS_PROPIEDAD[tipo],
+            alcaldia=alcaldia,
+            estacionamientos=input_data.estacionamientos,
+            metros_cuadrados=metros.tolist(),
+            series=[
+                SerieCurva(recamaras=r, banos=b, precios=fila.tolist())
+                for (r, b), fila in zip(combinaciones, precios)
+            ]
+        )
+
+    except (AlcaldiaNoEncontrada, FeatureNoValida, ModeloNoDisponible):
+        raise
+    except Exception as e:
+        raise ErrorPrediccion(str(e))
\ No newline at end of file
@@ -1,57 +1,101 @@
-import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 
-from domain.models import Prediccion, DepartamentoInputData
-from domain.exceptions import AlcaldiaNoEncontrada, ModeloNoDisponible, ErrorPrediccion
-from infra.data import DepartamentosRepository
+from domain.models import Prediccion, DepartamentoInputData, PrediccionLote
+from usecases import predict_propiedad
 
 
-def predict_departamento(input_data: DepartamentoInputData) -> Prediccion:
+# Codificador de las respuestas en modo JSON rápido (mismos campos y redondeo que `Prediccion`)
+CODIFICADOR = predict_propiedad.CODIFICADORES['departamentos']
+
+
+def _model_input(input_data: DepartamentoInputData) -> Dict[str, Any]:
+    """Prepara los datos de entrada en el formato que espera el repositorio"""
+    return predict_propiedad._model_input(input_data)
+
+
+def _construir_prediccion(input_data: DepartamentoInputData, precio_estimado: float,
+                          fecha_prediccion: Optional[str] = None,
+                          intervalo: Optional[Tuple[float, float]] = None,
+                          nivel: Optional[float] = None) -> Prediccion:
+    """Construye la respuesta de predicción de un departamento"""
+    return predict_propiedad._construir_prediccion('departamentos', input_data, precio_estimado, fecha_prediccion,
+                                                   intervalo, nivel)
+
+
+def predict_departamento(input_data: DepartamentoInputData, nivel: float = 0.9) -> Prediccion:
     """
     Caso de uso para predecir el precio de un departamento
     
     Args:
         input_data: Datos de entrada para la predicción
+        nivel: Nivel de confianza del intervalo de precio
         
     Returns:
-        Predicción con el precio estimado
+        Predicción con el precio estimado y, si el modelo lo permite, su intervalo
     
     Raises:
         AlcaldiaNoEncontrada: Si no se encuentra información para la alcaldía
+        FeatureNoValida: Si algún valor está fuera de rango
         ModeloNoDisponible: Si no se puede cargar el modelo
         ErrorPrediccion: Si hay un error en el proceso de predicción
     """
-    try:
-        # 1. Preparar datos para el modelo
-        model_input = {
-            'alcaldia': input_data.alcaldia,
-            'metros_cuadrados': input_data.metros_cuadrados,
-            'recamaras': input_data.recamaras,
-            'banos': input_data.banos,
-            'estacionamientos': input_data.estacionamientos
-        }
+    return predict_propiedad.predict_propiedad('departamentos', input_data, nivel)
+
+
+def predict_departamento_json(input_data: DepartamentoInputData, nivel: float = 0.9) -> bytes:
+    """Igual que `predict_departamento`, pero devuelve la respuesta ya codificada en JSON"""
+    return predict_propiedad.predict_propiedad_json('departamentos', input_data, nivel)
+
+
+def predict_departamentos_lote(input_data: List[DepartamentoInputData]) -> PrediccionLote:
+    """
+    Caso de uso para predecir el precio de un lote de departamentos
+    
+    Todas las filas válidas se evalúan en una sola llamada al modelo; las
+    filas inválidas reciben su propio error sin afectar al resto del lote.
+    
+    Args:
+        input_data: Lista de datos de entrada para la predicción
         
-        # 2. Cargar repositorio y hacer predicción
-        repo = DepartamentosRepository()
-        precio_estimado = repo.predict(model_input)
+    Returns:
+        Predicción o error de cada fila, en el mismo orden de entrada
+    
+    Raises:
+        ModeloNoDisponible: Si no se puede cargar el modelo
+        ErrorPrediccion: Si hay un error en el proceso de predicción
+    """
+    return predict_propiedad.predict_propiedades_lote('departamentos', input_data)
+
+
+def predict_departamentos_lote_json(input_data: List[DepartamentoInputData]) -> bytes:
+    """Igual que `predict_departamentos_lote`, pero devuelve la respuesta ya codificada en JSON"""
+    return predict_propiedad.predict_propiedades_lote_json('departamentos', input_data)
+
+
+async def predict_departamento_coalescida(input_data: DepartamentoInputData, coalescer, nivel: float = 0.9) -> Prediccion:
+    """
+    Caso de uso para predecir el precio de un departamento a través de un coalescer
+    
+    La predicción se encola junto con otras peticiones concurrentes y se
+    evalúa en un solo lote; la respuesta es la misma que la de `predict_departamento`.
+    
+    Args:
+        input_data: Datos de entrada para la predicción
+        coalescer: Objeto con un método asíncrono `predict(model_input) -> float`
+        nivel: Nivel de confianza del intervalo de precio
         
-        # 3. Construir y retornar la respuesta
-        return Prediccion(
-            tipo_propiedad="departamento",
-            precio_estimado=precio_estimado,
-            alcaldia=input_data.alcaldia,
-            caracteristicas={
-                'metros_cuadrados': input_data.metros_cuadrados,
-                'recamaras': input_data.recamaras,
-                'banos': input_data.banos,
-                'estacionamientos': input_data.estacionamientos
-            },
-            fecha_prediccion=datetime.datetime.now().isoformat()
-        )
-    
-    except (AlcaldiaNoEncontrada, ModeloNoDisponible):
-        # Dejar que estas excepciones se propaguen tal cual
-        raise
-    except Exception as e:
-        # Otras excepciones se convierten en ErrorPrediccion
-        raise ErrorPrediccion(str(e)) 
\ No newline at end of file
+    Returns:
+        Predicción con el precio estimado y, si el modelo lo permite, su intervalo
+    
+    Raises:
+        AlcaldiaNoEncontrada: Si no se encuentra información para la alcaldía
+        FeatureNoValida: Si algún valor está fuera de rango
+        ModeloNoDisponible: Si no se puede cargar el modelo
+        ErrorPrediccion: Si hay un error en el proceso de predicción
+    """
+    return await predict_propiedad.predict_propiedad_coalescida('departamentos', input_data, coalescer, nivel)
+
+
+async def predict_departamento_coalescida_json(input_data: DepartamentoInputData, coalescer, nivel: float = 0.9) -> bytes:
+    """Igual que `predict_departamento_coalescida`, pero devuelve la respuesta ya codificada en JSON"""
+    return await predict_propiedad.predict_propiedad_coalescida_json('departamentos', input_data, coalescer, nivel)
\ No newline at end of file
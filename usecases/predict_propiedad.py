@@ -0,0 +1,275 @@
+import datetime
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+from domain.models import Prediccion, CasaInputData, DepartamentoInputData, PrediccionLote, ResultadoLote
+from domain.exceptions import AlcaldiaNoEncontrada, FeatureNoValida, ModeloNoDisponible, ErrorPrediccion, ServicioSaturado
+
+from infra.cache import get_prediccion_cache
+from infra.data.model_registry import get_model_registry
+from infra.data.shadow import get_shadow_scorer
+from infra.json_rapido import CodificadorPredicciones
+from usecases.predict_curva import TIPOS_PROPIEDAD
+
+
+# Decimales a los que se redondean los precios de cada tipo de propiedad (None para no redondear)
+DECIMALES = {
+    'casas': 2,
+    'departamentos': None
+}
+
+# Codificadores de las respuestas en modo JSON rápido (mismos campos y redondeo que `Prediccion`)
+CODIFICADORES = {
+    tipo: CodificadorPredicciones(TIPOS_PROPIEDAD[tipo], decimales=DECIMALES[tipo])
+    for tipo in TIPOS_PROPIEDAD
+}
+
+InputData = Union[CasaInputData, DepartamentoInputData]
+
+
+def _redondear(tipo: str, precio: float) -> float:
+    decimales = DECIMALES[tipo]
+    return precio if decimales is None else round(precio, decimales)
+
+
+def _model_input(input_data: InputData) -> Dict[str, Any]:
+    """Prepara los datos de entrada en el formato que espera el repositorio"""
+    return {
+        'alcaldia': input_data.alcaldia,
+        'metros_cuadrados': input_data.metros_cuadrados,
+        'recamaras': input_data.recamaras,
+        'banos': input_data.banos,
+        'estacionamientos': input_data.estacionamientos
+    }
+
+
+def _construir_prediccion(tipo: str, input_data: InputData, precio_estimado: float,
+                          fecha_prediccion: Optional[str] = None,
+                          intervalo: Optional[Tuple[float, float]] = None,
+                          nivel: Optional[float] = None) -> Prediccion:
+    """Construye la respuesta de predicción de una propiedad"""
+    return Prediccion(
+        tipo_propiedad=TIPOS_PROPIEDAD[tipo],
+        precio_estimado=_redondear(tipo, precio_estimado),
+        alcaldia=input_data.alcaldia,
+        caracteristicas={
+            'metros_cuadrados': float(input_data.metros_cuadrados),
+            'recamaras': int(input_data.recamaras),
+            'banos': int(input_data.banos),
+            'estacionamientos': int(input_data.estacionamientos)
+        },
+        fecha_prediccion=fecha_prediccion or datetime.datetime.now().isoformat(),
+        precio_minimo=_redondear(tipo, intervalo[0]) if intervalo else None,
+        precio_maximo=_redondear(tipo, intervalo[1]) if intervalo else None,
+        nivel_confianza=nivel if intervalo else None
+    )
+
+
+def _precio(tipo: str, input_data: InputData, nivel: float) -> Tuple[float, Optional[Tuple[float, float]]]:
+    """Precio estimado de una propiedad y su intervalo (None si el modelo no tiene tabla de residuos)"""
+    # 1. Preparar datos para el modelo
+    model_input = _model_input(input_data)
+    
+    # 2. Obtener el modelo compartido y hacer predicción (o reutilizar una ya calculada)
+    repo = get_model_registry().get(tipo)
+    # La caché se indexa por el nombre canónico de la alcaldía
+    model_input['alcaldia'] = repo.resolve_alcaldia(model_input['alcaldia'])
+    cache = get_prediccion_cache()
+    clave = cache.clave(tipo, repo.version, model_input)
+    precio_estimado = cache.get(clave)
+    if precio_estimado is None:
+        precio_estimado = repo.predict(model_input)
+        cache.put(clave, precio_estimado)
+    
+    # Repetir una muestra con el modelo candidato, si lo hay (sólo se encola, no se espera)
+    shadow = get_shadow_scorer(tipo)
+    if shadow is not None:
+        shadow.enviar(model_input, precio_estimado)
+    
+    # 3. Intervalo de precio: una búsqueda en la tabla de residuos, sin evaluar el modelo otra vez
+    return precio_estimado, repo.intervalo(model_input['alcaldia'], precio_estimado, nivel)
+
+
+def predict_propiedad(tipo: str, input_data: InputData, nivel: float = 0.9) -> Prediccion:
+    """
+    Caso de uso para predecir el precio de una propiedad
+    
+    Args:
+        tipo: Tipo de propiedad ('casas' o 'departamentos')
+        input_data: Datos de entrada para la predicción
+        nivel: Nivel de confianza del intervalo de precio
+    
+    Returns:
+        Predicción con el precio estimado y, si el modelo lo permite, su intervalo
+    
+    Raises:
+        AlcaldiaNoEncontrada: Si no se encuentra información para la alcaldía
+        FeatureNoValida: Si algún valor está fuera de rango
+        ModeloNoDisponible: Si no se puede cargar el modelo
+        ErrorPrediccion: Si hay un error en el proceso de predicción
+    """
+    try:
+        precio_estimado, intervalo = _precio(tipo, input_data, nivel)
+        
+        # 4. Construir y retornar la respuesta
+        return _construir_prediccion(tipo, input_data, precio_estimado, intervalo=intervalo, nivel=nivel)
+    
+    except (AlcaldiaNoEncontrada, FeatureNoValida, ModeloNoDisponible):
+        # Dejar que estas excepciones se propaguen tal cual
+        raise
+    except Exception as e:
+        # Otras excepciones se convierten en ErrorPrediccion
+        raise ErrorPrediccion(str(e))
+
+
+def predict_propiedad_json(tipo: str, input_data: InputData, nivel: float = 0.9) -> bytes:
+    """
+    Igual que `predict_propiedad`, pero devuelve la respuesta ya codificada en JSON
+    
+    No construye el modelo `Prediccion`: los bytes se escriben con fragmentos precodificados.
+    """
+    try:
+        precio_estimado, intervalo = _precio(tipo, input_data, nivel)
+        fecha_prediccion = datetime.datetime.now().isoformat()
+        return CODIFICADORES[tipo].prediccion(input_data, precio_estimado, fecha_prediccion, intervalo, nivel)
+    
+    except (AlcaldiaNoEncontrada, FeatureNoValida, ModeloNoDisponible):
+        raise
+    except Exception as e:
+        raise ErrorPrediccion(str(e))
+
+
+def _precios_lote(tipo: str, input_data: List[InputData]):
+    """Precios de un lote de propiedades (NaN en las filas con error) y el error de cada fila"""
+    # 1. Preparar datos para el modelo
+    model_inputs = [_model_input(item) for item in input_data]
+    
+    # 2. Obtener el modelo compartido y evaluar todo el lote
+    return get_model_registry().get(tipo).predict_batch(model_inputs)
+
+
+def predict_propiedades_lote(tipo: str, input_data: List[InputData]) -> PrediccionLote:
+    """
+    Caso de uso para predecir el precio de un lote de propiedades
+    
+    Todas las filas válidas se evalúan en una sola llamada al modelo; las
+    filas inválidas reciben su propio error sin afectar al resto del lote.
+    
+    Args:
+        tipo: Tipo de propiedad ('casas' o 'departamentos')
+        input_data: Lista de datos de entrada para la predicción
+    
+    Returns:
+        Predicción o error de cada fila, en el mismo orden de entrada
+    
+    Raises:
+        ModeloNoDisponible: Si no se puede cargar el modelo
+        ErrorPrediccion: Si hay un error en el proceso de predicción
+    """
+    try:
+        precios, errores = _precios_lote(tipo, input_data)
+        
+        # 3. Construir y retornar la respuesta
+        fecha_prediccion = datetime.datetime.now().isoformat()
+        resultados = []
+        for indice, (item, precio, error) in enumerate(zip(input_data, precios, errores)):
+            if error is not None:
+                resultados.append(ResultadoLote(indice=indice, error=str(error)))
+                continue
+            resultados.append(ResultadoLote(
+                indice=indice,
+                prediccion=_construir_prediccion(tipo, item, float(precio), fecha_prediccion)
+            ))
+        
+        return PrediccionLote(
+            tipo_propiedad=TIPOS_PROPIEDAD[tipo],
+            total=len(resultados),
+            exitosas=sum(1 for r in resultados if r.error is None),
+            resultados=resultados
+        )
+    
+    except ModeloNoDisponible:
+        raise
+    except Exception as e:
+        raise ErrorPrediccion(str(e))
+
+
+def predict_propiedades_lote_json(tipo: str, input_data: List[InputData]) -> bytes:
+    """
+    Igual que `predict_propiedades_lote`, pero devuelve la respuesta ya codificada en JSON
+    
+    No construye un `ResultadoLote` por fila: los bytes se escriben con fragmentos precodificados.
+    """
+    try:
+        precios, errores = _precios_lote(tipo, input_data)
+        return CODIFICADORES[tipo].lote(input_data, precios, errores, datetime.datetime.now().isoformat())
+    
+    except ModeloNoDisponible:
+        raise
+    except Exception as e:
+        raise ErrorPrediccion(str(e))
+
+
+async def _precio_coalescida(tipo: str, input_data: InputData, coalescer,
+                             nivel: float) -> Tuple[float, Optional[Tuple[float, float]]]:
+    """Igual que `_precio`, pero evalúa el modelo a través del coalescer"""
+    model_input = _model_input(input_data)
+    repo = get_model_registry().get(tipo)
+    # La caché se indexa por el nombre canónico de la alcaldía
+    model_input['alcaldia'] = repo.resolve_alcaldia(model_input['alcaldia'])
+    cache = get_prediccion_cache()
+    clave = cache.clave(tipo, repo.version, model_input)
+    precio_estimado = cache.get(clave)
+    if precio_estimado is None:
+        precio_estimado = await coalescer.predict(model_input)
+        cache.put(clave, precio_estimado)
+    shadow = get_shadow_scorer(tipo)
+    if shadow is not None:
+        shadow.enviar(model_input, precio_estimado)
+    return precio_estimado, repo.intervalo(model_input['alcaldia'], precio_estimado, nivel)
+
+
+async def predict_propiedad_coalescida(tipo: str, input_data: InputData, coalescer,
+                                       nivel: float = 0.9) -> Prediccion:
+    """
+    Caso de uso para predecir el precio de una propiedad a través de un coalescer
+    
+    La predicción se encola junto con otras peticiones concurrentes y se
+    evalúa en un solo lote; la respuesta es la misma que la de `predict_propiedad`.
+    
+    Args:
+        tipo: Tipo de propiedad ('casas' o 'departamentos')
+        input_data: Datos de entrada para la predicción
+        coalescer: Objeto con un método asíncrono `predict(model_input) -> float`
+        nivel: Nivel de confianza del intervalo de precio
+    
+    Returns:
+        Predicción con el precio estimado y, si el modelo lo permite, su intervalo
+    
+    Raises:
+        AlcaldiaNoEncontrada: Si no se encuentra información para la alcaldía
+        FeatureNoValida: Si algún valor está fuera de rango
+        ModeloNoDisponible: Si no se puede cargar el modelo
+        ErrorPrediccion: Si hay un error en el proceso de predicción
+    """
+    try:
+        precio_estimado, intervalo = await _precio_coalescida(tipo, input_data, coalescer, nivel)
+        return _construir_prediccion(tipo, input_data, precio_estimado, intervalo=intervalo, nivel=nivel)
+    
+    except (AlcaldiaNoEncontrada, FeatureNoValida, ModeloNoDisponible, ServicioSaturado):
+        raise
+    except Exception as e:
+        raise ErrorPrediccion(str(e))
+
+
+async def predict_propiedad_coalescida_json(tipo: str, input_data: InputData, coalescer,
+                                            nivel: float = 0.9) -> bytes:
+    """Igual que `predict_propiedad_coalescida`, pero devuelve la respuesta ya codificada en JSON"""
+    try:
+        precio_estimado, intervalo = await _precio_coalescida(tipo, input_data, coalescer, nivel)
+        fecha_prediccion = datetime.datetime.now().isoformat()
+        return CODIFICADORES[tipo].prediccion(input_data, precio_estimado, fecha_prediccion, intervalo, nivel)
+    
+    except (AlcaldiaNoEncontrada, FeatureNoValida, ModeloNoDisponible, ServicioSaturado):
+        raise
+    except Exception as e:
+        raise ErrorPrediccion(str(e))
\ No newline at end of file